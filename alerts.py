@@ -0,0 +1,204 @@
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+from sinks import JsonLinesSink as JsonLinesFileSink, build_sink, specs_from_environment
+
+# Line-move alerts over successive scrape_odds() snapshots. AlertEngine keeps a
+# 64-bit hash of each game's watched columns and, per game, the value every rule
+# last alerted on (its anchor). Each update() hashes the new snapshot in one
+# vectorized pass, picks out the games whose hash changed, and evaluates every
+# rule over just those rows as NumPy arrays; unchanged games cost one dict
+# lookup and no history is kept beyond the current anchors. Moves are measured
+# from the anchor rather than the previous snapshot, so a line drifting 5 cents
+# at a time still alerts once it is more than 10 cents away from where it last
+# alerted.
+#
+#   engine = AlertEngine([MoneylineMoveRule(cents=10), LineMoveRule("total_current_line", step=0.5)],
+#                        sinks=[StdoutSink(), WebhookSink("http://127.0.0.1:8000/alerts")])
+#   engine.update(scrape_odds())     # first snapshot only sets the baseline
+#   engine.update(scrape_odds())     # -> alerts for whatever moved since
+#
+# Sinks (ODDS_ALERTS, comma-separated, or sinks=):
+#   stdout                      one line per alert
+#   jsonl:.cache/alerts.jsonl   every alert as a JSON line
+#   webhook:http://host/path    each cycle's alerts POSTed as {"alerts": [...]}
+#
+# Each update() logs its alert count at INFO on this module's logger.
+
+logger = logging.getLogger(__name__)
+
+def american_cents(odds):
+    # American odds on a continuous scale (-110 -> -10, +105 -> 5), so the distance
+    # between two prices is the move in cents across the +/-100 gap
+    return np.where(odds >= 0, odds - 100, odds + 100)
+
+class MoneylineMoveRule:
+    # Either side's price moves more than `cents` from its anchor
+    unit = "cents"
+
+    def __init__(self, cents=10, columns=("ml_current_away", "ml_current_home"), name="moneyline_move"):
+        self.cents = cents
+        self.columns = list(columns)
+        self.name = name
+
+    def evaluate(self, before, after):
+        moves = np.abs(american_cents(after) - american_cents(before))
+        magnitude = np.fmax.reduce(moves, axis=1)
+        with np.errstate(invalid="ignore"):
+            return magnitude > self.cents, magnitude
+
+class LineMoveRule:
+    # A spread or total moves past a multiple of `step` (8.5 -> 9, 8 -> 7.5 with step=0.5)
+    unit = "runs"
+
+    def __init__(self, column="total_current_line", step=0.5, name=None):
+        self.step = step
+        self.columns = [column]
+        self.name = name or f"{column}_move"
+
+    def evaluate(self, before, after):
+        before, after = before[:, 0], after[:, 0]
+        crossed = np.floor(after / self.step) != np.floor(before / self.step)
+        return crossed & ~np.isnan(before) & ~np.isnan(after), np.abs(after - before)
+
+def default_rules():
+    return [MoneylineMoveRule(cents=10), LineMoveRule("total_current_line", step=0.5, name="total_move")]
+
+def format_value(value):
+    if np.isnan(value):
+        return "n/a"
+    return f"{value:+.0f}" if value == int(value) and abs(value) >= 100 else f"{value:g}"
+
+class StdoutSink:
+    def emit(self, alerts):
+        for alert in alerts:
+            print(f"ALERT {alert['message']}")
+
+class JsonLinesSink(JsonLinesFileSink):
+    # One line per alert; a cycle's alerts are written together
+    def __init__(self, path=".cache/alerts.jsonl"):
+        super().__init__(path)
+
+    def emit(self, alerts):
+        self.write(alerts)
+
+class WebhookSink:
+    # One POST per cycle; a failed delivery is reported and dropped
+    def __init__(self, url, timeout=5, session=None):
+        self.url = url
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def emit(self, alerts):
+        try:
+            response = self.session.post(self.url, json={"alerts": alerts}, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"Error delivering {len(alerts)} alerts to {self.url}: {e}")
+
+SINKS = {
+    "stdout": lambda arg: StdoutSink(),
+    "jsonl": lambda arg: JsonLinesSink(arg or ".cache/alerts.jsonl"),
+    "webhook": lambda arg: WebhookSink(arg),
+}
+
+def sink_from_spec(spec):
+    return build_sink(spec, SINKS, "alert sink")
+
+def sinks_from_environment():
+    return [sink_from_spec(spec) for spec in specs_from_environment("ODDS_ALERTS")]
+
+class AlertEngine:
+    def __init__(self, rules=None, sinks=None, clock=time.time):
+        self.rules = list(rules) if rules is not None else default_rules()
+        self.sinks = list(sinks) if sinks is not None else sinks_from_environment() or [StdoutSink()]
+        self.clock = clock
+        self.columns = list(dict.fromkeys(column for rule in self.rules for column in rule.columns))
+        self.positions = [[self.columns.index(column) for column in rule.columns] for rule in self.rules]
+        self.hashes = {}
+        self.anchors = {}
+        self.totals = {"cycles": 0, "changed": 0, "alerts": 0}
+
+    def changed_positions(self, game_ids, hashes):
+        known = self.hashes
+        return np.flatnonzero(np.fromiter(
+            (known.get(game_id) != value for game_id, value in zip(game_ids, hashes)),
+            dtype=bool, count=len(game_ids),
+        ))
+
+    def update(self, frame, prune=True):
+        # Alerts fired by this snapshot (already handed to the sinks). prune=False keeps
+        # the state of games missing from the frame, for partial scrapes.
+        if frame.empty:
+            return []
+        game_ids = frame["game_id"].tolist()
+        watched = frame[self.columns]
+        hashes = pd.util.hash_pandas_object(watched, index=False).to_numpy().tolist()
+        changed = self.changed_positions(game_ids, hashes)
+
+        alerts = []
+        if len(changed):
+            after = watched.iloc[changed].to_numpy(dtype="float64", na_value=np.nan)
+            blank = np.full(len(self.columns), np.nan)
+            before = np.array([self.anchors.get(game_ids[i], blank) for i in changed]).reshape(after.shape)
+            fired_at = self.clock()
+            for rule, positions in zip(self.rules, self.positions):
+                fired, magnitude = rule.evaluate(before[:, positions], after[:, positions])
+                rows = np.flatnonzero(fired)
+                if len(rows):
+                    alerts += self.build_alerts(frame, rule, changed[rows], before[rows][:, positions],
+                                                after[rows][:, positions], magnitude[rows], fired_at)
+                    # Fired rules move their anchors to the new values
+                    before[np.ix_(rows, positions)] = after[np.ix_(rows, positions)]
+            # Newly posted lines become anchors; pulled lines keep the last one
+            anchors = np.where(np.isnan(before), after, before)
+            for row, i in enumerate(changed):
+                game_id = game_ids[i]
+                self.hashes[game_id] = hashes[i]
+                self.anchors[game_id] = anchors[row]
+
+        if prune and len(self.hashes) > len(game_ids):
+            current = set(game_ids)
+            for game_id in [game_id for game_id in self.hashes if game_id not in current]:
+                del self.hashes[game_id]
+                self.anchors.pop(game_id, None)
+
+        self.totals["cycles"] += 1
+        self.totals["changed"] += len(changed)
+        self.totals["alerts"] += len(alerts)
+        if alerts:
+            for sink in self.sinks:
+                try:
+                    sink.emit(alerts)
+                except Exception as e:
+                    print(f"Error writing alerts: {e}")
+        logger.info(f"Alerts: {len(alerts)} fired from {len(changed)} changed of {len(game_ids)} games")
+        return alerts
+
+    def build_alerts(self, frame, rule, rows, before, after, magnitude, fired_at):
+        teams = frame.iloc[rows]
+        alerts = []
+        for j, (game_id, date, away, home) in enumerate(zip(
+            teams["game_id"].tolist(), teams["date"].tolist(),
+            teams["away_team_short"].tolist(), teams["home_team_short"].tolist(),
+        )):
+            changes = {column: [before[j, k], after[j, k]] for k, column in enumerate(rule.columns)}
+            moved = ", ".join(f"{column} {format_value(old)} -> {format_value(new)}"
+                              for column, (old, new) in changes.items())
+            alerts.append({
+                "rule": rule.name,
+                "game_id": game_id,
+                "date": date,
+                "matchup": f"{away} @ {home}",
+                "magnitude": float(magnitude[j]),
+                "unit": rule.unit,
+                "changes": {column: [None if np.isnan(v) else float(v) for v in values]
+                            for column, values in changes.items()},
+                "fired_at": fired_at,
+                "message": f"{away} @ {home} {rule.name} {magnitude[j]:g} {rule.unit}: {moved}",
+            })
+        return alerts
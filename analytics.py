@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+# Market analytics over scrape_odds() output and line_store tick history. Every
+# function works on whole columns with NumPy: American odds become decimal odds
+# and implied probabilities, each two-way market gets its hold and no-vig fair
+# probabilities/prices, and open-to-current (or tick-to-tick) moves are measured
+# in probability points along with run-line and total key-number crossings.
+#
+#   game_analytics(scrape_odds())                  one row per game
+#   line_analytics(scrape_odds(sportsbooks="all")) one row per (game, book, market)
+#   tick_analytics(LineStore().movement(...))      one row per tick
+#
+# Missing odds stay NaN throughout; nothing here loops over rows in Python.
+
+# Away run line values a move can cross; MLB games are most often decided by 1 or 2 runs
+RUN_LINE_KEY_NUMBERS = (-2.0, -1.0, 1.0, 2.0)
+# Most common combined final scores
+TOTAL_KEY_NUMBERS = (7.0, 8.0, 9.0, 10.0)
+
+GROUP_COLUMNS = ["game_id", "sportsbook", "market"]
+
+def as_float(values):
+    # float64 array with NaN for missing values, from Int64/float Series or any array-like
+    if isinstance(values, (pd.Series, pd.Index)):
+        return values.to_numpy(dtype="float64", na_value=np.nan)
+    return np.asarray(values, dtype="float64")
+
+def american_to_decimal(odds):
+    odds = as_float(odds)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        decimal = np.where(odds > 0, 1 + odds / 100, 1 + 100 / -odds)
+    return np.where((odds == 0) | (np.abs(odds) < 100), np.nan, decimal)
+
+def implied_probability(odds):
+    odds = as_float(odds)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probability = np.where(odds > 0, 100 / (odds + 100), -odds / (100 - odds))
+    return np.where((odds == 0) | (np.abs(odds) < 100), np.nan, probability)
+
+def decimal_to_american(decimal):
+    decimal = as_float(decimal)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(decimal >= 2, (decimal - 1) * 100, -100 / (decimal - 1))
+
+def probability_to_american(probability):
+    probability = as_float(probability)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(probability >= 0.5, -100 * probability / (1 - probability),
+                        100 * (1 - probability) / probability)
+
+def two_way(odds_a, odds_b):
+    # Implied probabilities, hold and no-vig fair probabilities/prices of a two-way market.
+    # Hold is the book's theoretical margin, 1 - 1 / (p_a + p_b); fair probabilities
+    # remove it proportionally (p / (p_a + p_b)).
+    prob_a, prob_b = implied_probability(odds_a), implied_probability(odds_b)
+    overround = prob_a + prob_b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fair_a, fair_b = prob_a / overround, prob_b / overround
+        hold = 1 - 1 / overround
+    return {
+        "prob_a": prob_a,
+        "prob_b": prob_b,
+        "hold": hold,
+        "fair_prob_a": fair_a,
+        "fair_prob_b": fair_b,
+        "fair_odds_a": probability_to_american(fair_a),
+        "fair_odds_b": probability_to_american(fair_b),
+    }
+
+def key_crossings(before, after, keys):
+    # How many key numbers lie strictly between two lines; 0 where either is missing
+    before, after = as_float(before), as_float(after)
+    keys = np.sort(np.asarray(keys, dtype="float64"))
+    low, high = np.fmin(before, after), np.fmax(before, after)
+    crossed = np.searchsorted(keys, high, side="left") - np.searchsorted(keys, low, side="right")
+    return np.where(np.isnan(before) | np.isnan(after), 0, np.maximum(crossed, 0))
+
+def side_columns(out, prefix, names, metrics):
+    a, b = names
+    out[f"{prefix}{a}_prob"] = metrics["prob_a"]
+    out[f"{prefix}{b}_prob"] = metrics["prob_b"]
+    out[f"{prefix}hold"] = metrics["hold"]
+    out[f"{prefix}{a}_fair_prob"] = metrics["fair_prob_a"]
+    out[f"{prefix}{b}_fair_prob"] = metrics["fair_prob_b"]
+    out[f"{prefix}{a}_fair_odds"] = metrics["fair_odds_a"]
+    out[f"{prefix}{b}_fair_odds"] = metrics["fair_odds_b"]
+
+# Wide scrape_odds() frame: market prefix -> ((side a, side b), odds column pattern)
+GAME_MARKETS = {
+    "ml": (("away", "home"), "ml_{state}_{side}"),
+    "rl": (("away", "home"), "rl_{state}_{side}_odds"),
+    "total": (("over", "under"), "total_{state}_{side}_odds"),
+}
+
+def game_analytics(games, run_line_keys=RUN_LINE_KEY_NUMBERS, total_keys=TOTAL_KEY_NUMBERS):
+    # Per-game probabilities, hold and fair prices at open and current, plus the moves between them
+    out = {"game_id": games["game_id"]}
+    fair = {}
+    for market, ((a, b), pattern) in GAME_MARKETS.items():
+        for state in ("opening", "current"):
+            metrics = two_way(games[pattern.format(state=state, side=a)], games[pattern.format(state=state, side=b)])
+            side_columns(out, f"{market}_{state}_", (a, b), metrics)
+            fair[market, state] = metrics["fair_prob_a"]
+        # Move in probability points of the away (or over) side, no-vig on both ends
+        out[f"{market}_{a}_move_pts"] = (fair[market, "current"] - fair[market, "opening"]) * 100
+    out["rl_spread_move"] = as_float(games["rl_current_away_spread"]) - as_float(games["rl_opening_away_spread"])
+    out["rl_key_crossings"] = key_crossings(games["rl_opening_away_spread"], games["rl_current_away_spread"], run_line_keys)
+    out["total_line_move"] = as_float(games["total_current_line"]) - as_float(games["total_opening_line"])
+    out["total_key_crossings"] = key_crossings(games["total_opening_line"], games["total_current_line"], total_keys)
+    return pd.DataFrame(out, index=games.index)
+
+def market_pairs(frame, prefix=""):
+    # Per-row two-way metrics for a long frame whose market column says which odds pair applies
+    is_total = (frame["market"] == "total").to_numpy()
+    sides = two_way(
+        np.where(is_total, as_float(frame[f"{prefix}over_odds"]), as_float(frame[f"{prefix}away_odds"])),
+        np.where(is_total, as_float(frame[f"{prefix}under_odds"]), as_float(frame[f"{prefix}home_odds"])),
+    )
+    line = np.where(is_total, as_float(frame[f"{prefix}total"]), as_float(frame[f"{prefix}away_spread"]))
+    return is_total, sides, line
+
+def long_columns(out, prefix, is_total, sides):
+    # Splits pair metrics back into away/home and over/under columns (NaN where they do not apply)
+    for a, b, mask in (("away", "home", ~is_total), ("over", "under", is_total)):
+        masked = {key: value if key == "hold" else np.where(mask, value, np.nan) for key, value in sides.items()}
+        side_columns(out, prefix, (a, b), masked)
+
+def line_analytics(lines, run_line_keys=RUN_LINE_KEY_NUMBERS, total_keys=TOTAL_KEY_NUMBERS):
+    # Same metrics for the long scrape_odds(sportsbooks=...) frame, one row per (game, book, market)
+    out = {column: lines[column] for column in GROUP_COLUMNS}
+    is_total, opening, opening_line = market_pairs(lines, "opening_")
+    _, current, current_line = market_pairs(lines, "current_")
+    long_columns(out, "opening_", is_total, opening)
+    long_columns(out, "current_", is_total, current)
+    out["move_pts"] = (current["fair_prob_a"] - opening["fair_prob_a"]) * 100
+    out["line_move"] = current_line - opening_line
+    out["key_crossings"] = np.where(
+        is_total,
+        key_crossings(opening_line, current_line, total_keys),
+        key_crossings(opening_line, current_line, run_line_keys),
+    )
+    return pd.DataFrame(out, index=lines.index)
+
+def tick_analytics(ticks, run_line_keys=RUN_LINE_KEY_NUMBERS, total_keys=TOTAL_KEY_NUMBERS):
+    # Per-tick metrics for LineStore.movement() output. Moves are measured from the first
+    # tick of each (game, book, market) series and key crossings from the previous tick;
+    # ticks must be ordered by odds_date within each series, as movement() returns them.
+    out = {column: ticks[column] for column in GROUP_COLUMNS + ["odds_date"]}
+    is_total, sides, line = market_pairs(ticks)
+    long_columns(out, "", is_total, sides)
+    series = ticks.groupby(GROUP_COLUMNS, sort=False, observed=True)
+    codes = series.ngroup().to_numpy()
+    fair = pd.Series(sides["fair_prob_a"]).groupby(codes, sort=False)
+    line = pd.Series(line)
+    by_line = line.groupby(codes, sort=False)
+    out["move_pts"] = (sides["fair_prob_a"] - fair.transform("first").to_numpy()) * 100
+    out["line_move"] = line.to_numpy() - by_line.transform("first").to_numpy()
+    previous_line = by_line.shift().to_numpy()
+    out["key_crossings"] = np.where(
+        is_total,
+        key_crossings(previous_line, line, total_keys),
+        key_crossings(previous_line, line, run_line_keys),
+    )
+    out["tick"] = series.cumcount().to_numpy()
+    return pd.DataFrame(out, index=ticks.index)
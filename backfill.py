@@ -0,0 +1,244 @@
+import argparse
+import glob
+import logging
+import os
+import sqlite3
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from game_frame import CATEGORY, GAME_SCHEMA, LINE_SCHEMA, GameFrameBuilder
+from scrape_odds import IncrementalState, RateLimiter, book_line_rows, iter_game_rows, select_sportsbooks, selected_views
+
+# Historical backfill: scrapes every date in a range with the same pipeline as
+# scrape_odds() (dates and line history concurrently, every main-page and
+# line-history request under one shared rate limit) and writes the games in batches to a store partitioned by season and
+# date. Finished (date, game_id) pairs are checkpointed in SQLite only after
+# the batch holding them is on disk, so an interrupted or failed run picks up
+# where it stopped: finished dates are not fetched at all, finished games on a
+# partly done date are skipped before their line history is requested, and
+# games whose line history failed are retried.
+#
+#   python backfill.py 2025-03-27 2025-09-28 --root data/backfill --workers 8 --rps 5
+#   load_backfill("data/backfill", "2025-06-01", "2025-06-30")
+#
+# Layout: root/season=YYYY/date=YYYY-MM-DD/part-<ns>.parquet plus root/checkpoint.sqlite.
+# Parquet needs pyarrow or fastparquet; without either, parts are written as pickles.
+
+BACKFILL_ROOT = os.environ.get("ODDS_BACKFILL_ROOT", ".cache/backfill")
+
+def parquet_engine():
+    for module in ("pyarrow", "fastparquet"):
+        try:
+            __import__(module)
+            return module
+        except ImportError:
+            pass
+    return None
+
+PARQUET_ENGINE = parquet_engine()
+
+def date_range(start, end):
+    # Inclusive list of YYYY-MM-DD strings
+    day, last = date.fromisoformat(start), date.fromisoformat(end)
+    dates = []
+    while day <= last:
+        dates.append(day.isoformat())
+        day += timedelta(days=1)
+    return dates
+
+class PartitionedStore:
+    def __init__(self, root=BACKFILL_ROOT, format=None):
+        self.root = root
+        self.format = format or ("parquet" if PARQUET_ENGINE else "pickle")
+        if self.format == "parquet" and PARQUET_ENGINE is None:
+            raise ImportError("Parquet output needs pyarrow or fastparquet")
+
+    def partition(self, date_str):
+        return os.path.join(self.root, f"season={date_str[:4]}", f"date={date_str}")
+
+    def write(self, frame):
+        # One new part per date in the frame; written under a temp name and renamed into place
+        for date_str, part in frame.groupby("date", observed=True, sort=True):
+            directory = self.partition(str(date_str))
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{time.time_ns()}.{self.format}")
+            tmp_path = os.path.join(directory, f".{os.path.basename(path)}")
+            part = part.reset_index(drop=True)
+            if self.format == "parquet":
+                part.to_parquet(tmp_path, engine=PARQUET_ENGINE, index=False)
+            else:
+                part.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+
+    def parts(self, start=None, end=None):
+        paths = []
+        for directory in sorted(glob.glob(os.path.join(self.root, "season=*", "date=*"))):
+            date_str = directory.rsplit("date=", 1)[1]
+            if (start is None or date_str >= start) and (end is None or date_str <= end):
+                paths += sorted(glob.glob(os.path.join(directory, "part-*")))
+        return paths
+
+    def read(self, start=None, end=None):
+        frames = [pd.read_parquet(path) if path.endswith(".parquet") else pd.read_pickle(path)
+                  for path in self.parts(start, end)]
+        if not frames:
+            return pd.DataFrame()
+        frame = pd.concat(frames, ignore_index=True)
+        # A part written just before a crash can be rewritten on resume; the newest copy wins
+        keys = ["game_id", "sportsbook", "market"] if "sportsbook" in frame.columns else ["game_id"]
+        frame = frame.drop_duplicates(keys, keep="last").reset_index(drop=True)
+        schema = LINE_SCHEMA if "sportsbook" in frame.columns else GAME_SCHEMA
+        for name, kind in schema:
+            if kind == CATEGORY and name in frame.columns:
+                frame[name] = frame[name].astype("category")
+        return frame
+
+class Checkpoint(IncrementalState):
+    # Finished (date, game_id) pairs and fully written dates. Plugged into the scrape as its
+    # IncrementalState: finished games are dropped before their line history is fetched and
+    # line-history failures are noted so their games stay unfinished.
+    def __init__(self, path):
+        super().__init__()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS games (date TEXT NOT NULL, game_id INTEGER NOT NULL, "
+                           "PRIMARY KEY (date, game_id))")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS dates (date TEXT PRIMARY KEY)")
+        self._conn.commit()
+        self.finished = {}
+        for date_str, game_id in self._conn.execute("SELECT date, game_id FROM games"):
+            self.finished.setdefault(date_str, set()).add(game_id)
+        self.finished_dates = {date_str for (date_str,) in self._conn.execute("SELECT date FROM dates")}
+        self.start_run()
+
+    def start_run(self):
+        super().start_run()
+        self.loaded = set()
+        self.game_dates = {}
+        self.failed = set()
+
+    def pending_games(self, date_str, game_rows):
+        self.loaded.add(date_str)
+        done = self.finished.get(date_str, ())
+        pending = []
+        for game in game_rows:
+            game_id = (game.get('gameView') or {}).get('gameId')
+            if game_id in done:
+                self.skipped += 1
+                continue
+            self.game_dates[game_id] = date_str
+            pending.append(game)
+        return pending
+
+    def lookup(self, game_id, fingerprint):
+        return None
+
+    def remember(self, game_id, fingerprint, odds):
+        # Odds are written to the store, not kept here
+        self.refetched += 1
+        if odds is None:
+            self.failed.add(game_id)
+
+    def game_failed(self, game_id):
+        with self.lock:
+            return game_id in self.failed
+
+    def date_complete(self, date_str):
+        # Main page read and none of the date's games failed; empty or unreachable dates are retried
+        with self.lock:
+            return date_str in self.loaded and not any(
+                self.game_dates.get(game_id) == date_str for game_id in self.failed
+            )
+
+    def commit(self, games, dates):
+        with self.lock:
+            with self._conn:
+                self._conn.executemany("INSERT OR IGNORE INTO games (date, game_id) VALUES (?, ?)", games)
+                self._conn.executemany("INSERT OR IGNORE INTO dates (date) VALUES (?)", [(d,) for d in dates])
+            for date_str, game_id in games:
+                self.finished.setdefault(date_str, set()).add(game_id)
+            self.finished_dates.update(dates)
+
+    def finish_run(self, prune=True):
+        print(f"Backfill checkpoint: {self.skipped} games already done, {self.refetched} fetched, "
+              f"{len(self.failed)} failed (retried next run)")
+
+    def close(self):
+        with self.lock:
+            self._conn.close()
+
+def backfill(start, end, root=BACKFILL_ROOT, max_workers=8, requests_per_second=5.0, batch_size=500,
+             sportsbooks=None, cache=None, line_store=None, transport=None, format=None):
+    # Scrapes start..end (inclusive, YYYY-MM-DD) into a PartitionedStore under root and returns it.
+    # Rows are the wide FanDuel frame, or with sportsbooks the long game_frame.LINE_COLUMNS frame;
+    # batch_size games are buffered per write. Safe to rerun: finished work is skipped.
+    selected = select_sportsbooks(sportsbooks)
+    schema = GAME_SCHEMA if selected is None else LINE_SCHEMA
+    store = PartitionedStore(root, format)
+    checkpoint = Checkpoint(os.path.join(root, "checkpoint.sqlite"))
+    dates = [date_str for date_str in date_range(start, end) if date_str not in checkpoint.finished_dates]
+    print(f"Backfill {start}..{end}: {len(dates)} dates to scrape into {root}")
+    started = time.monotonic()
+    batch = {"builder": GameFrameBuilder(schema), "games": [], "dates": []}
+    written = [0]
+
+    def flush():
+        if batch["builder"].n_rows:
+            store.write(batch["builder"].to_frame())
+        checkpoint.commit(batch["games"], batch["dates"])
+        written[0] += len(batch["games"])
+        batch.update(builder=GameFrameBuilder(schema), games=[], dates=[])
+
+    try:
+        if dates:
+            # Explicit limiter so requests_per_second also holds with max_workers=1
+            limiter = RateLimiter(requests_per_second)
+            for date_str, index, row, views in iter_game_rows(dates, None, max_workers, requests_per_second, cache,
+                                                              checkpoint, line_store, selected, transport,
+                                                              None, limiter):
+                if index is None:
+                    if checkpoint.date_complete(date_str):
+                        batch["dates"].append(date_str)
+                    continue
+                game_id = row[1]
+                if game_id is None or checkpoint.game_failed(game_id):
+                    continue
+                if selected is None:
+                    batch["builder"].append(row)
+                else:
+                    batch["builder"].extend(book_line_rows(date_str, game_id, selected_views(views, selected)))
+                batch["games"].append((date_str, game_id))
+                if len(batch["games"]) >= batch_size:
+                    flush()
+    finally:
+        # Whatever finished before an interruption is still written and checkpointed
+        flush()
+        checkpoint.close()
+        print(f"Backfill wrote {written[0]} games in {time.monotonic() - started:.1f}s")
+    return store
+
+def load_backfill(root=BACKFILL_ROOT, start=None, end=None):
+    return PartitionedStore(root, "parquet" if PARQUET_ENGINE else "pickle").read(start, end)
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill historical MLB odds into a partitioned store")
+    parser.add_argument("start", help="first date, YYYY-MM-DD")
+    parser.add_argument("end", help="last date, YYYY-MM-DD (inclusive)")
+    parser.add_argument("--root", default=BACKFILL_ROOT)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=5.0, help="requests per second across all workers")
+    parser.add_argument("--batch", type=int, default=500, help="games per write")
+    parser.add_argument("--books", nargs="+", help="sportsbooks for the long frame, or 'all'")
+    parser.add_argument("--format", choices=["parquet", "pickle"])
+    parser.add_argument("-v", "--verbose", action="store_true", help="log per-scrape summaries to stderr")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+    books = args.books[0] if args.books == ["all"] else args.books
+    backfill(args.start, args.end, args.root, args.workers, args.rps, args.batch, books, format=args.format)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from alerts import AlertEngine, default_rules
+
+# AlertEngine.update() cycle time on a large board as the number of changed
+# games grows, against the same rules and anchors evaluated over every game on
+# every cycle (no hashed change detection).
+#   python benchmarks/bench_alerts.py --games 20000 --cycles 50
+
+def board(n_games, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": pd.Categorical(["2025-06-01"] * n_games),
+        "game_id": pd.array(np.arange(n_games) + 1, dtype="Int64"),
+        "away_team_short": "AAA",
+        "home_team_short": "BBB",
+        "ml_current_away": pd.array(rng.choice([-150, -120, -110, 100, 115, 140], n_games), dtype="Int64"),
+        "ml_current_home": pd.array(rng.choice([-160, -130, -105, 105, 120, 135], n_games), dtype="Int64"),
+        "total_current_line": rng.choice([7.5, 8.0, 8.5, 9.0], n_games),
+    })
+
+def move(frame, n_changed, rng):
+    frame = frame.copy()
+    rows = rng.choice(len(frame), n_changed, replace=False)
+    column = frame.columns.get_loc("ml_current_away")
+    frame.iloc[rows, column] = (frame["ml_current_away"].iloc[rows].to_numpy() - rng.choice([5, 15], n_changed))
+    return frame
+
+class FullEngine(AlertEngine):
+    # Treats every game as changed, the cost of comparing whole frames each cycle
+    def changed_positions(self, game_ids, hashes):
+        return np.arange(len(game_ids))
+
+def cycle_ms(engine, frames):
+    engine.update(frames[0])
+    start = time.perf_counter()
+    for frame in frames[1:]:
+        engine.update(frame)
+    return (time.perf_counter() - start) * 1000 / (len(frames) - 1)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=20_000)
+    parser.add_argument("--cycles", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    base = board(args.games)
+    print(f"{args.games:,} games, {args.cycles} cycles per row")
+    print(f"{'changed':>8}{'update ms':>11}{'every game ms':>15}{'alerts':>8}")
+    for n_changed in (0, 10, 100, 1000, args.games // 2):
+        frames = [base]
+        for _ in range(args.cycles):
+            frames.append(move(frames[-1], n_changed, rng))
+        engine = AlertEngine(default_rules(), sinks=[])
+        update_ms = cycle_ms(engine, frames)
+        full_ms = cycle_ms(FullEngine(default_rules(), sinks=[]), frames)
+        print(f"{n_changed:>8,}{update_ms:>11.2f}{full_ms:>15.2f}{engine.totals['alerts']:>8,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import analytics
+
+# tick_analytics() over a synthetic multi-season tick history (LineStore.movement()
+# layout) against a per-row Python loop computing the same fair-probability move.
+#   python benchmarks/bench_analytics.py --ticks 5000000
+
+MARKETS = np.array(["moneyline", "spread", "total"])
+BOOKS = np.array(["fanduel", "draftkings", "betmgm", "caesars", "bet365", "betrivers"])
+
+def synthetic_ticks(n_ticks, ticks_per_series=40, seed=0):
+    rng = np.random.default_rng(seed)
+    series = np.arange(n_ticks) // ticks_per_series
+    market = MARKETS[series % 3]
+    is_total = market == "total"
+    is_spread = market == "spread"
+
+    def odds():
+        values = rng.choice([-180, -150, -130, -115, -110, -105, 100, 105, 110, 120, 140, 165], n_ticks)
+        return pd.array(values, dtype="Int64")
+
+    def blank(values, mask):
+        values = values.copy()
+        values[mask] = pd.NA
+        return values
+
+    total = np.where(is_total, rng.choice([7.0, 7.5, 8.0, 8.5, 9.0, 9.5], n_ticks), np.nan)
+    spread = np.where(is_spread, rng.choice([-1.5, 1.5, -2.5], n_ticks), np.nan)
+    return pd.DataFrame({
+        "game_id": series // 18,
+        "game_date": "2025-06-01",
+        "sportsbook": pd.Categorical(BOOKS[(series // 3) % 6]),
+        "market": pd.Categorical(market),
+        "odds_date": pd.Timestamp("2025-06-01", tz="UTC") + pd.to_timedelta(np.arange(n_ticks) % ticks_per_series, unit="min"),
+        "away_odds": blank(odds(), is_total),
+        "home_odds": blank(odds(), is_total),
+        "away_spread": spread,
+        "home_spread": -spread,
+        "total": total,
+        "over_odds": blank(odds(), ~is_total),
+        "under_odds": blank(odds(), ~is_total),
+    })
+
+def loop_moves(ticks):
+    # What the analysis looked like before: one Python iteration per tick
+    def probability(odds):
+        return 100 / (odds + 100) if odds > 0 else -odds / (100 - odds)
+
+    first = {}
+    moves = []
+    for row in ticks.itertuples(index=False):
+        if row.market == "total":
+            a, b = row.over_odds, row.under_odds
+        else:
+            a, b = row.away_odds, row.home_odds
+        if pd.isna(a) or pd.isna(b):
+            moves.append(np.nan)
+            continue
+        pa, pb = probability(a), probability(b)
+        fair = pa / (pa + pb)
+        key = (row.game_id, row.sportsbook, row.market)
+        moves.append((fair - first.setdefault(key, fair)) * 100)
+    return moves
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=5_000_000)
+    parser.add_argument("--loop-ticks", type=int, default=200_000, help="ticks for the per-row baseline")
+    args = parser.parse_args()
+
+    ticks = synthetic_ticks(args.ticks)
+    start = time.perf_counter()
+    result = analytics.tick_analytics(ticks)
+    vectorized = time.perf_counter() - start
+
+    sample = ticks.iloc[:args.loop_ticks]
+    start = time.perf_counter()
+    moves = loop_moves(sample)
+    loop = (time.perf_counter() - start) * args.ticks / len(sample)
+    np.testing.assert_allclose(result["move_pts"].to_numpy()[:len(sample)], moves, equal_nan=True)
+
+    print(f"{args.ticks:,} ticks ({args.ticks // 40:,} series)")
+    print(f"  per-row loop   {loop:8.2f} s   (extrapolated from {len(sample):,} ticks)")
+    print(f"  tick_analytics {vectorized:8.2f} s   ({args.ticks / vectorized / 1e6:.1f}M ticks/s, "
+          f"{len(result.columns)} columns, {loop / vectorized:.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import contextlib
+import functools
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from farm import run_farm
+from replay import Recording, ReplayAdapter, replay_session, synthesize
+from scrape_odds import scrape_odds
+from transport import Transport, new_session
+
+# farm.run_farm() over synthetic replay recordings of several dates, against one
+# process scraping the same dates with threads. Checks the merged frame matches
+# the single-process one, and that the shared rate limit holds farm-wide: every
+# process logs when each request starts, and across all of them the requests
+# must not come faster than --rps.
+#   python benchmarks/bench_farm.py --dates 8 --games 15 --latency 0.02
+
+class LoggedReplayAdapter(ReplayAdapter):
+    # Appends each request's start time to log_path; appends of one short line don't interleave between processes
+    def __init__(self, recording, latency, log_path):
+        super().__init__(recording, latency)
+        self.log_path = log_path
+
+    def send(self, request, **kwargs):
+        with open(self.log_path, "a") as f:
+            f.write(f"{time.time():.6f}\n")
+        return super().send(request, **kwargs)
+
+def replay_transport(directory, latency):
+    return Transport(replay_session(directory, latency))
+
+def logged_transport(directory, latency, log_path):
+    session = new_session()
+    adapter = LoggedReplayAdapter(Recording(directory), latency, log_path)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return Transport(session)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dates", type=int, default=8)
+    parser.add_argument("--games", type=int, default=15)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per replayed response")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=100.0, help="farm-wide limit for the rate check")
+    args = parser.parse_args()
+
+    dates = [str(day.date()) for day in pd.date_range("2025-06-01", periods=args.dates)]
+    requests = args.dates * (1 + args.games)
+    with tempfile.TemporaryDirectory() as directory:
+        for date_str in dates:
+            synthesize(directory, date_str, args.games)
+        factory = functools.partial(replay_transport, directory, args.latency)
+        print(f"{args.dates} dates x {args.games} games, {requests} requests, {args.latency * 1000:.0f} ms latency, "
+              f"{os.cpu_count()} CPUs")
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            single = scrape_odds(args.threads, requests_per_second=0, dates=dates, transport=factory())
+        print(f"{'1 process':>12}{time.perf_counter() - start:8.2f} s")
+        for processes in sorted({1, 2, 4, os.cpu_count() or 1}):
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                merged = run_farm(["mlb"], dates, processes, args.threads, 0, None, transport_factory=factory)
+            elapsed = time.perf_counter() - start
+            pd.testing.assert_frame_equal(merged.drop(columns="league"), single, check_categorical=False)
+            print(f"{f'farm x{processes}':>12}{elapsed:8.2f} s  (same {merged.shape} frame)")
+        processes = min(4, args.dates)
+        log_path = os.path.join(directory, "requests.log")
+        logged = functools.partial(logged_transport, directory, args.latency, log_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_farm(["mlb"], dates, processes, args.threads, args.rps, None, transport_factory=logged)
+        with open(log_path) as f:
+            starts = sorted(float(line) for line in f)
+        assert len(starts) == requests, f"expected {requests} requests, logged {len(starts)}"
+        achieved = (len(starts) - 1) / (starts[-1] - starts[0])
+        print(f"rate limit: farm x{processes} at {args.rps:g} rps made {len(starts)} requests at {achieved:.1f} rps")
+        # A little slack for the gap between the limiter's slot and the adapter seeing the request
+        assert achieved <= args.rps * 1.05, f"{achieved:.1f} rps exceeds the {args.rps:g} rps limit"
+
+if __name__ == "__main__":
+    main()
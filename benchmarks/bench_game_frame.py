@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import fixtures
+from game_frame import GAME_COLUMNS, build_game_frame
+from scrape_odds import fanduel_line_odds
+
+# Output frame construction for a synthetic season (2,430 games by default):
+# per-game dicts + pd.DataFrame inference against the typed columnar builder.
+#   python benchmarks/bench_game_frame.py --games 2430
+
+def season_rows(n_games, n_ticks=2):
+    rows = []
+    per_day = 15
+    odds_cache = {}
+    for index in range(n_games):
+        day, slot = divmod(index, per_day)
+        date_str = (pd.Timestamp("2025-03-27") + pd.Timedelta(days=day)).strftime("%Y-%m-%d")
+        game_view = fixtures.game_view(date_str, slot, fixtures.random.Random(index))
+        if slot not in odds_cache:
+            data = fixtures.line_history_data(slot, n_ticks=n_ticks, books=["fanduel"])
+            odds_cache[slot] = fanduel_line_odds(data["props"]["pageProps"]["lineHistoryModel"]["oddsViews"])
+        odds = odds_cache[slot]
+        away, home = game_view["awayTeam"], game_view["homeTeam"]
+        ml_o, ml_c = odds["ml_opening"], odds["ml_current"]
+        sp_o, sp_c = odds["spread_opening"], odds["spread_current"]
+        to_o, to_c = odds["total_opening"], odds["total_current"]
+        rows.append((
+            date_str, game_view["gameId"], game_view["startDate"], game_view["venueName"],
+            game_view["city"], game_view["state"],
+            away["fullName"], away["shortName"], away["nickname"], away["name"],
+            home["fullName"], home["shortName"], home["nickname"], home["name"],
+            game_view["gameStatusText"], game_view["status"],
+            game_view["awayTeamScore"], game_view["homeTeamScore"],
+            game_view["consensus"], odds["last_line_update"],
+            ml_o.get("awayOdds"), ml_o.get("homeOdds"), ml_o.get("oddsDate"),
+            ml_c.get("awayOdds"), ml_c.get("homeOdds"), ml_c.get("oddsDate"),
+            sp_o.get("awaySpread"), sp_o.get("awayOdds"), sp_o.get("homeSpread"), sp_o.get("homeOdds"), sp_o.get("oddsDate"),
+            sp_c.get("awaySpread"), sp_c.get("awayOdds"), sp_c.get("homeSpread"), sp_c.get("homeOdds"), sp_c.get("oddsDate"),
+            to_o.get("total"), to_o.get("overOdds"), to_o.get("underOdds"), to_o.get("oddsDate"),
+            to_c.get("total"), to_c.get("overOdds"), to_c.get("underOdds"), to_c.get("oddsDate"),
+        ))
+    return rows
+
+def dict_frame(rows):
+    return pd.DataFrame([dict(zip(GAME_COLUMNS, row)) for row in rows])
+
+def measure(func, rows, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        df = func(rows)
+    elapsed = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    func(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=2430)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = season_rows(args.games)
+    print(f"{len(rows)} games")
+    for label, func in [("dicts + DataFrame", dict_frame), ("typed builder", build_game_frame)]:
+        df, elapsed, peak = measure(func, rows, args.repeat)
+        size = df.memory_usage(deep=True).sum()
+        print(f"  {label:<18} build {elapsed * 1000:8.1f} ms   peak {peak / 2**20:6.1f} MB   frame {size / 2**20:6.2f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import scrape_odds
+from stub_server import StubServer
+
+# Sequential vs concurrent line-history fetching against a local stub server.
+#   python benchmarks/bench_line_history_fetch.py --games 15 --latency 0.15 --workers 8
+
+def timed_scrape(**kwargs):
+    start = time.perf_counter()
+    df = scrape_odds.scrape_odds(**kwargs)
+    return df, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=15, help="games per date")
+    parser.add_argument("--latency", type=float, default=0.15, help="stub server latency in seconds")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=10.0, help="global requests per second in concurrent mode")
+    args = parser.parse_args()
+
+    with StubServer(games_per_date=args.games, latency=args.latency) as server:
+        scrape_odds.BASE_URL = server.base_url
+        sequential, sequential_secs = timed_scrape()
+        concurrent, concurrent_secs = timed_scrape(max_workers=args.workers, requests_per_second=args.rps)
+
+    pd.testing.assert_frame_equal(sequential, concurrent)
+    print(f"games: {len(sequential)}  latency: {args.latency:.2f}s  workers: {args.workers}  rps: {args.rps}")
+    print(f"sequential: {sequential_secs:7.2f}s")
+    print(f"concurrent: {concurrent_secs:7.2f}s  ({sequential_secs / concurrent_secs:.1f}x faster, identical frame)")
+
+if __name__ == "__main__":
+    main()
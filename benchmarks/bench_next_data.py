@@ -0,0 +1,82 @@
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import next_data
+import fixtures
+
+# __NEXT_DATA__ extraction: the old regex over response.text + full json.loads
+# against the byte-level extractor, with and without subtree-only parsing.
+# extract_subtree is a full parse plus a member lookup when orjson is installed;
+# --stdlib measures the json-module path, which parses only the member's value.
+#   python benchmarks/bench_next_data.py                      # generated fixture pages
+#   python benchmarks/bench_next_data.py --stdlib
+#   python benchmarks/bench_next_data.py --pages 'saved/*.html'
+
+PATTERN = r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>'
+
+def regex_full(content, key):
+    text = content.decode('utf-8')
+    match = re.search(PATTERN, text, re.DOTALL)
+    return json.loads(match.group(1))
+
+def bytes_full(content, key):
+    return next_data.extract(content)
+
+def bytes_subtree(content, key):
+    return next_data.extract_subtree(content, key)
+
+METHODS = [("regex + json.loads", regex_full), ("bytes + full parse", bytes_full), ("bytes + subtree", bytes_subtree)]
+
+def load_pages(pattern):
+    if pattern:
+        pages = {}
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "rb") as f:
+                pages[os.path.basename(path)] = f.read()
+        return pages
+    return {
+        "main (15 games)": fixtures.main_page("2025-07-01", 15),
+        "line-history (6 books)": fixtures.line_history_page(2025070101),
+    }
+
+def page_key(content):
+    return "lineHistoryModel" if b'"lineHistoryModel":' in content else "oddsTables"
+
+def measure(func, content, key, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(content, key)
+    elapsed = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    func(content, key)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", help="glob of saved HTML pages; defaults to generated fixtures")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--stdlib", action="store_true", help="measure without orjson")
+    args = parser.parse_args()
+    if args.stdlib:
+        next_data.orjson = None
+
+    print(f"json backend for full parse: {'orjson' if next_data.orjson else 'json'}")
+    for name, content in load_pages(args.pages).items():
+        key = page_key(content)
+        print(f"\n{name}: {len(content) / 1024:.0f} KB, key {key}")
+        for label, func in METHODS:
+            elapsed, peak = measure(func, content, key, args.repeat)
+            print(f"  {label:<20} {elapsed * 1000:8.2f} ms   peak {peak / 1024:8.0f} KB")
+
+if __name__ == "__main__":
+    main()
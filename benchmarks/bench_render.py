@@ -0,0 +1,107 @@
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import render
+from bench_game_frame import season_rows
+from game_frame import build_game_frame
+
+# Card rendering: the previous per-row loop (iterrows + per-cell formatters, one
+# markdown string per game) against render.render_cards() on the same frame.
+#   python benchmarks/bench_render.py --games 30 1000
+
+et = render.et
+
+def legacy_format_odds(val):
+    if val is None or pd.isna(val):
+        return "-"
+    val = int(val) if float(val).is_integer() else val
+    return f"+{val}" if val > 0 else f"{val}"
+
+def legacy_format_line(val):
+    if val is None or pd.isna(val):
+        return "-"
+    val = float(val)
+    return str(int(val)) if val.is_integer() else str(val)
+
+def legacy_format_run_line(spread, odds):
+    if spread is None or pd.isna(spread) or odds is None or pd.isna(odds):
+        return "-"
+    return f"{legacy_format_line(spread)} ({legacy_format_odds(odds)})"
+
+def legacy_format_total_line(overunder, line, odds):
+    if line is None or pd.isna(line) or odds is None or pd.isna(odds):
+        return "-"
+    return f"{overunder} {legacy_format_line(line)} ({legacy_format_odds(odds)})"
+
+def legacy_format_time_footer(dt_str):
+    if not dt_str or pd.isna(dt_str):
+        return "-"
+    dt = pd.to_datetime(dt_str).tz_convert('US/Eastern')
+    now = datetime.now(et)
+    if dt.date() == now.date():
+        prefix = "Today"
+    elif dt.date() == now.date() - timedelta(days=1):
+        prefix = "Yesterday"
+    else:
+        prefix = dt.strftime("%A")
+    return f"{prefix} {dt.strftime('%-I:%M%p EST')}"
+
+def legacy_is_time_status(status_text):
+    return bool(re.match(r"^\d{1,2}:\d{2}(\s*[AP]M)?(\s*ET|EST)?$", status_text.strip(), re.IGNORECASE))
+
+def legacy_render(games):
+    games = games.copy()
+    games['start_time_et'] = games['start_date'].apply(lambda v: pd.to_datetime(v).tz_convert('US/Eastern').strftime("%-I:%M %p EST"))
+    games = games.sort_values('start_date')
+    cards = []
+    for _, row in games.iterrows():
+        status_text = str(row.get('game_status_text', "")).strip()
+        has_started = not legacy_is_time_status(status_text)
+        badge = "notstarted" if legacy_is_time_status(status_text) else ("final" if status_text.lower() == "final" else "progress")
+        cards.append("".join([
+            str(row['away_team_full']), str(row['home_team_full']), badge,
+            status_text if has_started and status_text else row['start_time_et'],
+            str(row['venue']), str(row['venue_city']), str(row['venue_state']),
+            legacy_format_odds(row['ml_opening_away']), legacy_format_odds(row['ml_current_away']),
+            legacy_format_odds(row['ml_opening_home']), legacy_format_odds(row['ml_current_home']),
+            legacy_format_run_line(row['rl_opening_away_spread'], row['rl_opening_away_odds']),
+            legacy_format_run_line(row['rl_current_away_spread'], row['rl_current_away_odds']),
+            legacy_format_run_line(row['rl_opening_home_spread'], row['rl_opening_home_odds']),
+            legacy_format_run_line(row['rl_current_home_spread'], row['rl_current_home_odds']),
+            legacy_format_total_line("Over", row['total_opening_line'], row['total_opening_over_odds']),
+            legacy_format_total_line("Over", row['total_current_line'], row['total_current_over_odds']),
+            legacy_format_total_line("Under", row['total_opening_line'], row['total_opening_under_odds']),
+            legacy_format_total_line("Under", row['total_current_line'], row['total_current_under_odds']),
+            legacy_format_time_footer(row['ml_opening_time']), legacy_format_time_footer(row['last_line_update']),
+        ]))
+    return cards
+
+def measure(func, games, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(games)
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, nargs="+", default=[30, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for n_games in args.games:
+        games = build_game_frame(season_rows(n_games))
+        legacy = measure(legacy_render, games, args.repeat)
+        vectorized = measure(render.render_cards, games, args.repeat)
+        print(f"{n_games:5d} games   per-row loop {legacy * 1000:8.1f} ms   vectorized {vectorized * 1000:8.1f} ms"
+              f"   ({legacy / vectorized:.1f}x)")
+
+if __name__ == "__main__":
+    main()
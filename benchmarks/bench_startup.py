@@ -0,0 +1,63 @@
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_server import StubServer
+
+# Startup and cold-run latency of the scrape_odds module and CLI, each in a fresh
+# interpreter: `python -X importtime` cumulative import time (and whether pandas,
+# numpy or pytz got loaded), interpreter start plus import, and a full
+# `python -m scrape_odds` run against the local stub server.
+#   python benchmarks/bench_startup.py --games 15 --runs 7
+
+HEAVY_MODULES = ["pandas", "numpy", "pytz"]
+
+def median_ms(command, env, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr[-2000:])
+    return statistics.median(times) * 1000, result
+
+def import_profile(module, env):
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, env=env, capture_output=True, text=True).stderr
+    cumulative = {}
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)$", line)
+        if match:
+            cumulative.setdefault(match.group(3), int(match.group(1)) / 1000)
+    return cumulative
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    with StubServer(games_per_date=args.games, latency=0.0) as server:
+        env = dict(os.environ, ODDS_BASE_URL=server.base_url)
+        imports = import_profile("scrape_odds", env)
+        loaded = [module for module in HEAVY_MODULES if module in imports]
+        print(f"import scrape_odds       {imports['scrape_odds']:7.0f} ms  (-X importtime; loads {', '.join(loaded) or 'none of ' + '/'.join(HEAVY_MODULES)})")
+        start_ms, _ = median_ms([sys.executable, "-c", "import scrape_odds"], env, args.runs)
+        print(f"interpreter + import     {start_ms:7.0f} ms")
+        for output_format in ("jsonl", "csv"):
+            command = [sys.executable, "-m", "scrape_odds", "--dates", "2025-06-01",
+                       "--format", output_format, "--rps", "1000"]
+            cold_ms, result = median_ms(command, env, args.runs)
+            print(f"python -m scrape_odds    {cold_ms:7.0f} ms  ({output_format}, {args.games} games, "
+                  f"{len(result.stdout.splitlines())} lines)")
+
+if __name__ == "__main__":
+    main()
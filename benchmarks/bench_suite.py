@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import next_data
+import render
+import scrape_odds
+from replay import Recording, replay_session, synthesize
+from transport import Transport
+
+# Offline end-to-end benchmarks over replayed pages: scrape time, parse time per
+# page, peak traced memory and card render time, for synthetic slates of 1 to
+# 1,000 games and optionally a recorded set of real pages. Results can be saved
+# and compared against an earlier run to catch regressions.
+#   python benchmarks/bench_suite.py --sizes 1 15 100 1000 --json bench.json
+#   python benchmarks/bench_suite.py --recordings benchmarks/recordings --baseline bench.json
+
+SLATE_DATE = "2025-06-01"
+
+# Lower is better for every metric; a regression is a value above baseline * (1 + tolerance)
+METRICS = ["scrape_s", "main_parse_ms", "line_parse_ms", "peak_mb", "render_ms"]
+
+def scrape(directory, dates, latency, workers):
+    transport = Transport(replay_session(directory, latency))
+    return scrape_odds.scrape_odds(dates=dates, max_workers=workers, requests_per_second=1_000_000,
+                                   transport=transport)
+
+def parse_times(recording):
+    # Mean milliseconds per page to go from response bytes to parsed odds
+    main_pages, line_pages = [], []
+    for key in recording.index:
+        _, _, body = recording.get(key)
+        (line_pages if "/line-history/" in key else main_pages).append(body)
+    results = {}
+    for name, pages, parse in [
+        ("main_parse_ms", main_pages, lambda body: next_data.extract_subtree(body, "oddsTables")),
+        ("line_parse_ms", line_pages, scrape_odds.load_line_history),
+    ]:
+        start = time.perf_counter()
+        for body in pages:
+            parse(body)
+        results[name] = (time.perf_counter() - start) * 1000 / max(len(pages), 1)
+    return results
+
+def measure(label, directory, dates, latency, workers, repeat):
+    recording = Recording(directory)
+    scrape(directory, dates, latency, workers)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        df = scrape(directory, dates, latency, workers)
+    scrape_s = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    scrape(directory, dates, latency, workers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render.render_cards(df)
+    render_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    return dict(label=label, games=len(df), scrape_s=scrape_s, peak_mb=peak / 2**20,
+                render_ms=render_ms, **parse_times(recording))
+
+def compare(results, baseline, tolerance):
+    previous = {row["label"]: row for row in baseline}
+    regressions = []
+    for row in results:
+        before = previous.get(row["label"])
+        if before is None:
+            continue
+        for metric in METRICS:
+            if metric in before and before[metric] > 0 and row[metric] > before[metric] * (1 + tolerance):
+                regressions.append(f"{row['label']}: {metric} {before[metric]:.3f} -> {row[metric]:.3f} "
+                                   f"(+{row[metric] / before[metric] - 1:.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 15, 100, 1000], help="synthetic slate sizes")
+    parser.add_argument("--recordings", help="directory written by `replay.py record`")
+    parser.add_argument("--latency", type=float, default=0.0, help="artificial seconds per replayed request")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write results here")
+    parser.add_argument("--baseline", help="earlier --json output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for n_games in args.sizes:
+            directory = os.path.join(scratch, f"slate-{n_games}")
+            synthesize(directory, SLATE_DATE, n_games)
+            results.append(measure(f"synthetic-{n_games}", directory, [SLATE_DATE],
+                                   args.latency, args.workers, args.repeat))
+    if args.recordings:
+        dates = Recording(args.recordings).dates()
+        results.append(measure("recorded", args.recordings, dates, args.latency, args.workers, args.repeat))
+
+    print(f"{'slate':<16}{'games':>6}{'scrape s':>10}{'main ms/pg':>12}{'line ms/pg':>12}{'peak MB':>9}{'render ms':>11}")
+    for row in results:
+        print(f"{row['label']:<16}{row['games']:>6}{row['scrape_s']:>10.3f}{row['main_parse_ms']:>12.2f}"
+              f"{row['line_parse_ms']:>12.2f}{row['peak_mb']:>9.1f}{row['render_ms']:>11.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_odds
+from stub_server import StubServer
+from transport import Transport, new_session
+
+# Bytes on the wire with and without compression, and games lost to transient
+# 503s with and without retries, against the local stub server.
+#   python benchmarks/bench_transport.py --games 15 --failures 1
+
+def run(server, transport, workers):
+    start = time.perf_counter()
+    df = scrape_odds.scrape_odds(max_workers=workers, requests_per_second=50, transport=transport)
+    elapsed = time.perf_counter() - start
+    with_odds = int(df["ml_current_home"].notna().sum()) if len(df) else 0
+    return len(df), with_odds, elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=15, help="games per date")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--failures", type=int, default=1, help="503s served before each URL succeeds")
+    args = parser.parse_args()
+
+    print("compression")
+    for label, encoding in [("identity", "identity"), ("gzip", None)]:
+        with StubServer(games_per_date=args.games, latency=args.latency) as server:
+            scrape_odds.BASE_URL = server.base_url
+            session = new_session()
+            if encoding:
+                session.headers["Accept-Encoding"] = encoding
+            transport = Transport(session)
+            games, _, elapsed = run(server, transport, args.workers)
+            stats = transport.stats
+        print(f"  {label:<9} {games} games  {stats['wire_bytes'] / 2**20:7.2f} MB on the wire  "
+              f"{stats['body_bytes'] / 2**20:7.2f} MB decoded  {elapsed:5.2f}s")
+
+    print(f"transient failures ({args.failures} x 503 per URL)")
+    for label, retries in [("no retries", 0), ("retries", 3)]:
+        with StubServer(games_per_date=args.games, latency=args.latency, failures=args.failures) as server:
+            scrape_odds.BASE_URL = server.base_url
+            transport = Transport(max_retries=retries, backoff=0.05)
+            games, with_odds, elapsed = run(server, transport, args.workers)
+            stats = transport.stats
+        print(f"  {label:<10} {games:3d} games, {with_odds:3d} with odds  "
+              f"{stats['requests']} requests, {stats['retries']} retries  {elapsed:5.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+# Synthetic sportsbookreview pages shaped like the real __NEXT_DATA__ payloads.
+# Only the fields scrape_odds reads are realistic; the padding stands in for the
+# navigation, article and ad subtrees that make the real pages several hundred KB.
+
+TEAMS = [
+    ("Arizona Diamondbacks", "ARI", "Diamondbacks", "Arizona"),
+    ("Athletics Athletics", "ATH", "Athletics Athletics", "Athletics"),
+    ("Atlanta Braves", "ATL", "Braves", "Atlanta"),
+    ("Baltimore Orioles", "BAL", "Orioles", "Baltimore"),
+    ("Boston Red Sox", "BOS", "Red Sox", "Boston"),
+    ("Chicago Cubs", "CHC", "Cubs", "Chicago"),
+    ("Chicago White Sox", "CWS", "White Sox", "Chicago"),
+    ("Cincinnati Reds", "CIN", "Reds", "Cincinnati"),
+    ("Cleveland Guardians", "CLE", "Guardians", "Cleveland"),
+    ("Colorado Rockies", "COL", "Rockies", "Colorado"),
+    ("Detroit Tigers", "DET", "Tigers", "Detroit"),
+    ("Houston Astros", "HOU", "Astros", "Houston"),
+    ("Kansas City Royals", "KC", "Royals", "Kansas City"),
+    ("Los Angeles Angels", "LAA", "Angels", "Los Angeles"),
+    ("Los Angeles Dodgers", "LAD", "Dodgers", "Los Angeles"),
+    ("Miami Marlins", "MIA", "Marlins", "Miami"),
+    ("Milwaukee Brewers", "MIL", "Brewers", "Milwaukee"),
+    ("Minnesota Twins", "MIN", "Twins", "Minnesota"),
+    ("New York Mets", "NYM", "Mets", "New York"),
+    ("New York Yankees", "NYY", "Yankees", "New York"),
+    ("Philadelphia Phillies", "PHI", "Phillies", "Philadelphia"),
+    ("Pittsburgh Pirates", "PIT", "Pirates", "Pittsburgh"),
+    ("San Diego Padres", "SD", "Padres", "San Diego"),
+    ("San Francisco Giants", "SF", "Giants", "San Francisco"),
+    ("Seattle Mariners", "SEA", "Mariners", "Seattle"),
+    ("St. Louis Cardinals", "STL", "Cardinals", "St. Louis"),
+    ("Tampa Bay Rays", "TB", "Rays", "Tampa Bay"),
+    ("Texas Rangers", "TEX", "Rangers", "Texas"),
+    ("Toronto Blue Jays", "TOR", "Blue Jays", "Toronto"),
+    ("Washington Nationals", "WSH", "Nationals", "Washington"),
+]
+
+SPORTSBOOKS = ["fanduel", "draftkings", "betmgm", "caesars", "bet365", "betrivers"]
+
+def team(index):
+    full, short, nickname, name = TEAMS[index % len(TEAMS)]
+    return {"fullName": full, "shortName": short, "nickname": nickname, "name": name}
+
+def game_id_for(date_str, index):
+    return int(date_str.replace("-", "")) * 100 + index
+
+def padding(rng, n_items):
+    return [
+        {
+            "id": rng.randrange(10 ** 9),
+            "title": "Article " + "x" * rng.randrange(40, 120),
+            "tags": ["mlb", "odds", "picks"],
+            "body": {"html": "<p>" + "lorem ipsum " * rng.randrange(20, 60) + "</p>"},
+        }
+        for _ in range(n_items)
+    ]
+
+def wrap_page(next_data, padding_bytes=150_000):
+    payload = json.dumps(next_data, separators=(",", ":"))
+    filler = "<div class=\"filler\">" + ("<span>sportsbookreview</span>" * (padding_bytes // 64)) + "</div>"
+    return (
+        "<!DOCTYPE html><html><head><title>MLB Odds</title>"
+        "<script src=\"/_next/static/chunks/main.js\"></script></head><body>"
+        + filler
+        + "<script id=\"__NEXT_DATA__\" type=\"application/json\">" + payload + "</script>"
+        + filler
+        + "</body></html>"
+    ).encode("utf-8")
+
+def game_view(date_str, index, rng, status=None):
+    start = datetime.strptime(date_str, "%Y-%m-%d") + timedelta(hours=17, minutes=5 * index)
+    if status is None:
+        status = rng.choice(["Final", "Top 5th", start.strftime("%H:%M ET")])
+    started = not status.endswith("ET")
+    return {
+        "gameId": game_id_for(date_str, index),
+        "startDate": start.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+        "venueName": f"Ballpark {index}",
+        "city": "City",
+        "state": "ST",
+        "gameStatusText": status,
+        "status": 3 if status == "Final" else (2 if started else 1),
+        "awayTeamScore": rng.randrange(10) if started else None,
+        "homeTeamScore": rng.randrange(10) if started else None,
+        "awayTeam": team(2 * index),
+        "homeTeam": team(2 * index + 1),
+        "consensus": {
+            "homeMoneyLinePickPercent": rng.randrange(100),
+            "awayMoneyLinePickPercent": rng.randrange(100),
+            "overPickPercent": rng.randrange(100),
+            "underPickPercent": rng.randrange(100),
+        },
+    }
+
+def main_page_data(date_str, n_games, seed=0, statuses=None):
+    rng = random.Random(f"{seed}-{date_str}")
+    rows = []
+    for index in range(n_games):
+        status = statuses[index] if statuses else None
+        rows.append({
+            "gameView": game_view(date_str, index, rng, status),
+            "oddsViews": [{"sportsbook": book, "currentLine": {"homeOdds": -110, "awayOdds": -110}} for book in SPORTSBOOKS],
+        })
+    return {
+        "props": {"pageProps": {
+            "oddsTables": [{"league": "mlb", "oddsTableModel": {"gameRows": rows}}],
+            "articles": padding(rng, 200),
+        }},
+        "page": "/betting-odds/[league]",
+        "buildId": "fixture",
+    }
+
+def history(rng, start, n_ticks, make_tick):
+    ticks = []
+    for i in range(n_ticks):
+        tick = make_tick(rng)
+        tick["oddsDate"] = (start + timedelta(minutes=17 * i)).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        ticks.append(tick)
+    return ticks
+
+def odds_view(book, start, rng, n_ticks):
+    return {
+        "sportsbook": book,
+        "moneyLineHistory": history(rng, start, n_ticks, lambda r: {
+            "awayOdds": r.choice([-150, -130, -115, 105, 120, 140]),
+            "homeOdds": r.choice([-160, -135, -110, 100, 125, 145]),
+        }),
+        "spreadHistory": history(rng, start, n_ticks, lambda r: {
+            "awaySpread": 1.5, "awayOdds": r.choice([-180, -160, 130]),
+            "homeSpread": -1.5, "homeOdds": r.choice([150, 135, -150]),
+        }),
+        "totalHistory": history(rng, start, n_ticks, lambda r: {
+            "total": r.choice([7.5, 8.0, 8.5, 9.0, 9.5]),
+            "overOdds": r.choice([-115, -110, -105, 100]),
+            "underOdds": r.choice([-115, -110, -105, 100]),
+        }),
+    }
+
+def line_history_data(game_id, seed=0, n_ticks=40, books=SPORTSBOOKS, layout="top"):
+    # layout: "top" (lineHistoryModel.oddsViews), "nested" (lineHistoryModel.lineHistory.oddsViews)
+    # or "deep", which only the fallback search in scrape_odds can find
+    rng = random.Random(f"{seed}-{game_id}")
+    start = datetime(2025, 1, 1) + timedelta(days=rng.randrange(300))
+    views = [odds_view(book, start, rng, n_ticks) for book in books]
+    if layout == "nested":
+        model = {"lineHistory": {"oddsViews": views}}
+    elif layout == "deep":
+        model = {"gameDetail": {"markets": [{"lines": {"oddsViews": views}}]}}
+    else:
+        model = {"oddsViews": views}
+    return {
+        "props": {"pageProps": {
+            "lineHistoryModel": model,
+            "articles": padding(rng, 150),
+        }},
+        "page": "/betting-odds/[league]/line-history/[gameId]",
+        "buildId": "fixture",
+    }
+
+def main_page(date_str, n_games, seed=0, statuses=None):
+    return wrap_page(main_page_data(date_str, n_games, seed, statuses))
+
+def line_history_page(game_id, seed=0, n_ticks=40, books=SPORTSBOOKS, layout="top"):
+    return wrap_page(line_history_data(game_id, seed, n_ticks, books, layout))
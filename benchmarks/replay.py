@@ -0,0 +1,172 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import fixtures
+from transport import Transport, new_session
+
+# Recorded sportsbookreview responses, replayed offline through the same
+# requests.Session that scrape_odds() uses. A recording directory holds
+# index.json (request path -> status, headers, body file) and one gzipped body
+# per page. The host is not part of the key, so a recording replays under any
+# BASE_URL.
+#
+#   python benchmarks/replay.py record benchmarks/recordings                  # live site, today + tomorrow
+#   python benchmarks/replay.py record benchmarks/recordings --date 2025-06-01
+#   python benchmarks/replay.py synthesize /tmp/slate --date 2025-06-01 --games 1000
+#
+#   scrape_odds(transport=Transport(replay_session("benchmarks/recordings", latency=0.1)))
+
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+def url_key(url):
+    parts = urlsplit(url)
+    return parts.path + ("?" + parts.query if parts.query else "")
+
+class Recording:
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except FileNotFoundError:
+            self.index = {}
+
+    def add(self, url, status, headers, body):
+        key = url_key(url)
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + ".html.gz"
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, name), "wb") as f:
+            f.write(gzip.compress(body, compresslevel=6))
+        kept = {header: headers[header] for header in KEPT_HEADERS if header in headers}
+        with self._lock:
+            self.index[key] = {"status": status, "headers": kept, "file": name}
+
+    def get(self, url):
+        # (status, headers, body) for a recorded URL; None if it was never recorded
+        with self._lock:
+            entry = self.index.get(url_key(url))
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+            return entry["status"], entry["headers"], gzip.decompress(f.read())
+
+    def dates(self):
+        return sorted(
+            key.split("date=", 1)[1] for key in self.index
+            if "date=" in key and "/line-history/" not in key
+        )
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            with open(self.index_path, "w") as f:
+                json.dump(self.index, f, indent=1, sort_keys=True)
+
+class RecordingAdapter(HTTPAdapter):
+    # Passes requests through and keeps every 200 response
+    def __init__(self, recording, **kwargs):
+        super().__init__(**kwargs)
+        self.recording = recording
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            self.recording.add(request.url, 200, response.headers, response.content)
+        return response
+
+class ReplayAdapter(HTTPAdapter):
+    # Answers from a Recording after `latency` seconds; unrecorded URLs get a 404
+    def __init__(self, recording, latency=0.0):
+        super().__init__()
+        self.recording = recording
+        self.latency = latency
+        self.served = 0
+
+    def send(self, request, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        recorded = self.recording.get(request.url)
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.encoding = "utf-8"
+        if recorded is None:
+            response.status_code = 404
+            response._content = b""
+            response.headers = CaseInsensitiveDict()
+        else:
+            status, headers, body = recorded
+            response.status_code = status
+            response._content = body
+            response.headers = CaseInsensitiveDict(headers)
+            self.served += 1
+        return response
+
+def replay_session(directory, latency=0.0):
+    session = new_session()
+    adapter = ReplayAdapter(Recording(directory), latency)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def record(directory, dates=None, max_workers=4, requests_per_second=2.0):
+    import scrape_odds
+    recording = Recording(directory)
+    session = new_session()
+    adapter = RecordingAdapter(recording)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    df = scrape_odds.scrape_odds(max_workers=max_workers, requests_per_second=requests_per_second,
+                                 dates=dates, transport=Transport(session))
+    recording.save()
+    return recording, df
+
+def synthesize(directory, date_str, n_games, seed=0):
+    # Synthetic recording of one date with n_games games, built from benchmarks/fixtures.py
+    recording = Recording(directory)
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+    recording.add(f"/betting-odds/mlb-baseball/?date={date_str}", 200, headers,
+                  fixtures.main_page(date_str, n_games, seed))
+    for index in range(n_games):
+        game_id = fixtures.game_id_for(date_str, index)
+        recording.add(f"/betting-odds/mlb-baseball/line-history/{game_id}/", 200, headers,
+                      fixtures.line_history_page(game_id, seed))
+    recording.save()
+    return recording
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or synthesize sportsbookreview fixtures")
+    parser.add_argument("command", choices=["record", "synthesize"])
+    parser.add_argument("directory")
+    parser.add_argument("--date", action="append", help="YYYY-MM-DD; repeatable (default today and tomorrow)")
+    parser.add_argument("--games", type=int, default=15, help="games per date when synthesizing")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        recording, df = record(args.directory, args.date, args.workers, args.rps)
+        print(f"Recorded {len(recording.index)} pages ({len(df)} games) into {args.directory}")
+    else:
+        for date_str in args.date or ["2025-06-01"]:
+            recording = synthesize(args.directory, date_str, args.games)
+        print(f"Wrote {len(recording.index)} synthetic pages into {args.directory}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import gzip
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import fixtures
+
+# Local stand-in for sportsbookreview.com. Pages are generated once per URL and
+# served after a fixed artificial latency so fetch strategies can be compared offline.
+# Pages are gzipped for clients that accept it; failures=N answers the first N
+# requests for every URL with 503 + Retry-After to exercise retries.
+
+LINE_HISTORY_PATH = re.compile(r"^/betting-odds/mlb-baseball/line-history/(\d+)/?$")
+MAIN_PATH = re.compile(r"^/betting-odds/mlb-baseball/?$")
+
+class StubServer:
+    def __init__(self, games_per_date=15, latency=0.15, port=0, failures=0, retry_after=0):
+        self.games_per_date = games_per_date
+        self.latency = latency
+        self.failures = failures
+        self.retry_after = retry_after
+        self.requests = 0
+        self.bytes_sent = 0
+        self._attempts = {}
+        self._pages = {}
+        self._gzipped = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page(self, path, query):
+        key = (path, query.get("date", [""])[0])
+        with self._lock:
+            self.requests += 1
+            if key in self._pages:
+                return self._pages[key]
+        match = LINE_HISTORY_PATH.match(path)
+        if match:
+            body = fixtures.line_history_page(int(match.group(1)))
+        elif MAIN_PATH.match(path) and key[1]:
+            body = fixtures.main_page(key[1], self.games_per_date)
+        else:
+            body = None
+        with self._lock:
+            self._pages[key] = body
+        return body
+
+    def set_page(self, path, body, date=""):
+        # Replaces what path (with ?date=date for main pages) serves, as if the site changed between scrapes
+        with self._lock:
+            self._pages[(path, date)] = body
+            self._gzipped.clear()
+
+    def gzipped(self, key, body):
+        with self._lock:
+            if key not in self._gzipped:
+                self._gzipped[key] = gzip.compress(body, compresslevel=6)
+            return self._gzipped[key]
+
+    def should_fail(self, path):
+        with self._lock:
+            attempts = self._attempts.get(path, 0)
+            self._attempts[path] = attempts + 1
+            return attempts < self.failures
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                body = server.page(url.path, parse_qs(url.query))
+                time.sleep(server.latency)
+                if server.should_fail(self.path):
+                    self.send_response(503)
+                    self.send_header("Retry-After", str(server.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = server.gzipped(self.path, body)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.bytes_sent += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,129 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from leagues import DEFAULT_LEAGUE, get_league
+from page_cache import PageCache
+from scrape_odds import default_dates, scrape_odds
+from transport import Transport
+
+# Multi-process scraping for many slates at once. The coordinator splits the
+# work into (league, date) units and runs them on a process pool, so page
+# parsing is spread over cores instead of one GIL. All processes share:
+#   - one rate limit: SharedRateLimiter keeps the next free request slot in
+#     shared memory; every main-page and line-history request, and every
+#     retry of one, takes a slot, so the farm stays under requests_per_second
+#   - one response cache: every process opens the same PageCache SQLite file
+# Each unit's frame comes back to the coordinator, which merges them in
+# (league, date) order into one frame with a leading league column.
+#
+#   python farm.py --leagues mlb --dates 2025-06-01 2025-06-02 --processes 4 --rps 10 -o odds.pkl
+#   run_farm(["mlb"], dates, processes=4, requests_per_second=10)
+
+class SharedRateLimiter:
+    # scrape_odds.RateLimiter across processes: request starts at least 1/requests_per_second
+    # apart farm-wide. Create it in the coordinator and hand it to workers at pool start-up.
+    def __init__(self, requests_per_second, context=None):
+        context = context or multiprocessing.get_context()
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = context.Value("d", 0.0, lock=False)
+        self._lock = context.Lock()
+
+    def wait(self, delay=0.0):
+        if not self.min_interval:
+            if delay:
+                time.sleep(delay)
+            return
+        with self._lock:
+            now = time.time()
+            slot = max(now + delay, self._next_slot.value)
+            self._next_slot.value = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+# Per-process state, set once by init_worker
+_worker = {}
+
+def init_worker(limiter, cache_path, transport_factory):
+    _worker["limiter"] = limiter
+    _worker["cache"] = PageCache(cache_path) if cache_path else None
+    _worker["transport"] = transport_factory() if transport_factory is not None else Transport()
+
+def scrape_unit(league, date_str, threads, sportsbooks):
+    frame = scrape_odds(threads, cache=_worker["cache"], sportsbooks=sportsbooks, dates=[date_str],
+                        transport=_worker["transport"], league=league, limiter=_worker["limiter"])
+    return league, date_str, frame, os.getpid()
+
+def merge_frames(frames):
+    # frames: [(league, frame)] in output order. Categorical columns are rebuilt over the
+    # merged values, since each unit's frame has its own categories.
+    import pandas as pd
+    parts = [frame.assign(league=league)[["league"] + list(frame.columns)] for league, frame in frames if len(frame)]
+    if not parts:
+        return pd.DataFrame()
+    categories = {column for _, frame in frames for column in frame.columns
+                  if isinstance(frame[column].dtype, pd.CategoricalDtype)}
+    merged = pd.concat(parts, ignore_index=True)
+    for column in sorted(categories | {"league"}):
+        merged[column] = merged[column].astype("category")
+    return merged
+
+def run_farm(leagues=None, dates=None, processes=None, threads_per_process=4, requests_per_second=10.0,
+             cache_path=".cache/pages.sqlite", sportsbooks=None, transport_factory=None):
+    # One merged frame for every (league, date) unit. transport_factory, if given, is a
+    # picklable callable that builds each process's Transport (e.g. a replay session).
+    leagues = [get_league(league).key for league in (leagues or [DEFAULT_LEAGUE])]
+    dates = list(dates) if dates is not None else default_dates()
+    units = [(league, date_str) for league in leagues for date_str in dates]
+    processes = min(processes or os.cpu_count() or 1, len(units))
+    context = multiprocessing.get_context()
+    limiter = SharedRateLimiter(requests_per_second, context)
+    started = time.monotonic()
+    results = {}
+    with ProcessPoolExecutor(processes, mp_context=context, initializer=init_worker,
+                             initargs=(limiter, cache_path, transport_factory)) as pool:
+        futures = {pool.submit(scrape_unit, league, date_str, threads_per_process, sportsbooks): (league, date_str)
+                   for league, date_str in units}
+        for future in as_completed(futures):
+            league, date_str = futures[future]
+            try:
+                _, _, frame, pid = future.result()
+            except Exception as e:
+                print(f"Error scraping {league} {date_str}: {e}")
+                continue
+            results[league, date_str] = frame
+            print(f"Farm: {league} {date_str} done in process {pid} ({len(frame)} rows)")
+    merged = merge_frames([(league, results[league, date_str]) for league, date_str in units
+                           if (league, date_str) in results])
+    print(f"Farm: {len(results)} of {len(units)} units, {len(merged)} rows from {processes} processes "
+          f"in {time.monotonic() - started:.1f}s")
+    return merged
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape many (league, date) slates on a process pool")
+    parser.add_argument("--leagues", nargs="+", default=[DEFAULT_LEAGUE])
+    parser.add_argument("--dates", nargs="+", help="YYYY-MM-DD (default today and tomorrow)")
+    parser.add_argument("--processes", type=int, help="default one per CPU")
+    parser.add_argument("--threads", type=int, default=4, help="line-history threads per process")
+    parser.add_argument("--rps", type=float, default=10.0, help="requests per second across the whole farm")
+    parser.add_argument("--cache", default=".cache/pages.sqlite", help="shared page cache ('' to disable)")
+    parser.add_argument("--books", nargs="+", help="sportsbooks for the long frame, or 'all'")
+    parser.add_argument("-o", "--output", required=True, help=".pkl, .csv or .parquet")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log per-scrape summaries to stderr")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+    books = args.books[0] if args.books == ["all"] else args.books
+    frame = run_farm(args.leagues, args.dates, args.processes, args.threads, args.rps, args.cache or None, books)
+    if args.output.endswith(".parquet"):
+        frame.to_parquet(args.output, index=False)
+    elif args.output.endswith(".csv"):
+        frame.to_csv(args.output, index=False)
+    else:
+        frame.to_pickle(args.output)
+    print(f"Wrote {len(frame)} rows to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import re
+
+# Typed output schema for scrape_odds(). Rows arrive as tuples in GAME_COLUMNS
+# order and are appended straight into per-column lists; dtypes are applied
+# once per column in to_frame() instead of being inferred from per-game dicts.
+# numpy and pandas are imported inside the converters, so code that only needs
+# the schema or plain records (iter_games(), the CLI) never loads them.
+
+ODDS = "odds"          # American odds -> nullable Int64
+LINE = "line"          # spreads and totals -> float64
+TIME = "time"          # ISO timestamps -> datetime64[UTC]
+CATEGORY = "category"  # low-cardinality strings -> categorical
+STRING = "string"      # free text kept as plain object strings
+ID = "id"              # integer identifiers and scores -> nullable Int64
+NESTED = "nested"      # consensus dict, flattened into consensus_* columns
+
+GAME_SCHEMA = [
+    ("date", CATEGORY),
+    ("game_id", ID),
+    ("start_date", TIME),
+    ("venue", CATEGORY),
+    ("venue_city", CATEGORY),
+    ("venue_state", CATEGORY),
+    ("away_team_full", CATEGORY),
+    ("away_team_short", CATEGORY),
+    ("away_team_nickname", CATEGORY),
+    ("away_team_name", CATEGORY),
+    ("home_team_full", CATEGORY),
+    ("home_team_short", CATEGORY),
+    ("home_team_nickname", CATEGORY),
+    ("home_team_name", CATEGORY),
+    ("game_status_text", STRING),
+    ("game_status_code", CATEGORY),
+    ("score_away", ID),
+    ("score_home", ID),
+    ("consensus", NESTED),
+    ("last_line_update", TIME),
+    # Moneyline
+    ("ml_opening_away", ODDS),
+    ("ml_opening_home", ODDS),
+    ("ml_opening_time", TIME),
+    ("ml_current_away", ODDS),
+    ("ml_current_home", ODDS),
+    ("ml_current_time", TIME),
+    # Run Line
+    ("rl_opening_away_spread", LINE),
+    ("rl_opening_away_odds", ODDS),
+    ("rl_opening_home_spread", LINE),
+    ("rl_opening_home_odds", ODDS),
+    ("rl_opening_time", TIME),
+    ("rl_current_away_spread", LINE),
+    ("rl_current_away_odds", ODDS),
+    ("rl_current_home_spread", LINE),
+    ("rl_current_home_odds", ODDS),
+    ("rl_current_time", TIME),
+    # Total
+    ("total_opening_line", LINE),
+    ("total_opening_over_odds", ODDS),
+    ("total_opening_under_odds", ODDS),
+    ("total_opening_time", TIME),
+    ("total_current_line", LINE),
+    ("total_current_over_odds", ODDS),
+    ("total_current_under_odds", ODDS),
+    ("total_current_time", TIME),
+]
+
+GAME_COLUMNS = [name for name, _ in GAME_SCHEMA]
+
+# Market name -> (history key on a sportsbook's oddsView, tick fields used by that market)
+MARKETS = {
+    "moneyline": ("moneyLineHistory", ["awayOdds", "homeOdds"]),
+    "spread": ("spreadHistory", ["awaySpread", "awayOdds", "homeSpread", "homeOdds"]),
+    "total": ("totalHistory", ["total", "overOdds", "underOdds"]),
+}
+
+# Tick field -> (column suffix, kind)
+TICK_FIELDS = {
+    "awayOdds": ("away_odds", ODDS),
+    "homeOdds": ("home_odds", ODDS),
+    "awaySpread": ("away_spread", LINE),
+    "homeSpread": ("home_spread", LINE),
+    "total": ("total", LINE),
+    "overOdds": ("over_odds", ODDS),
+    "underOdds": ("under_odds", ODDS),
+}
+
+# Long format, one row per (game_id, sportsbook, market); fields a market does not use stay null
+LINE_SCHEMA = [
+    ("date", CATEGORY),
+    ("game_id", ID),
+    ("sportsbook", CATEGORY),
+    ("market", CATEGORY),
+    ("opening_time", TIME),
+    ("current_time", TIME),
+] + [
+    (f"{phase}_{column}", kind) for phase in ("opening", "current") for column, kind in TICK_FIELDS.values()
+]
+
+LINE_COLUMNS = [name for name, _ in LINE_SCHEMA]
+
+def consensus_column(key):
+    # homeMoneyLinePickPercent -> consensus_home_money_line_pick_percent
+    return "consensus_" + re.sub(r"(?<!^)(?=[A-Z])", "_", key).lower()
+
+def to_int_array(values):
+    import pandas as pd
+    try:
+        return pd.array(values, dtype="Int64")
+    except (TypeError, ValueError):
+        numeric = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        try:
+            return numeric.astype("Int64").array
+        except (TypeError, ValueError):
+            return numeric.astype("Float64").array
+
+def to_float_array(values):
+    import numpy as np
+    import pandas as pd
+    try:
+        return np.array(values, dtype="float64")
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").astype("float64").to_numpy()
+
+def to_time_array(values):
+    import pandas as pd
+    return pd.to_datetime(pd.Series(values, dtype=object), utc=True, errors="coerce", format="ISO8601").array
+
+def to_consensus_array(values):
+    # Pick percentages are numeric; anything else is kept as-is rather than coerced to NaN
+    import numpy as np
+    import pandas as pd
+    numeric = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+    if numeric.notna().sum() == sum(v is not None for v in values):
+        return numeric.astype("float64").to_numpy()
+    return np.array(values, dtype=object)
+
+def to_category_array(values):
+    # Missing values stay missing (NaN), and a column of numbers such as
+    # game_status_code stays numeric instead of becoming string categories
+    # (the scraper's '' default for an absent field counts as missing there)
+    import pandas as pd
+    present = [v for v in values if v is not None and v != ""]
+    if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return to_int_array([None if v == "" else v for v in values])
+    return pd.Categorical([None if v is None else str(v) for v in values])
+
+def to_string_array(values):
+    import numpy as np
+    return np.array(["" if v is None else str(v) for v in values], dtype=object)
+
+CONVERTERS = {
+    ODDS: to_int_array,
+    ID: to_int_array,
+    LINE: to_float_array,
+    TIME: to_time_array,
+    CATEGORY: to_category_array,
+    STRING: to_string_array,
+}
+
+def flatten_consensus(values):
+    dicts = [value or {} for value in values]
+    keys = sorted({key for value in dicts for key in value})
+    return {consensus_column(key): to_consensus_array([value.get(key) for value in dicts]) for key in keys}
+
+def row_record(row, columns=GAME_COLUMNS):
+    # Plain dict view of one row, for consumers that do not want a DataFrame
+    return dict(zip(columns, row))
+
+class GameFrameBuilder:
+    def __init__(self, schema=GAME_SCHEMA):
+        self.schema = schema
+        self.columns = [[] for _ in schema]
+        self.n_rows = 0
+
+    def append(self, row):
+        for column, value in zip(self.columns, row):
+            column.append(value)
+        self.n_rows += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def to_frame(self):
+        import pandas as pd
+        data = {}
+        for (name, kind), values in zip(self.schema, self.columns):
+            if kind == NESTED:
+                data.update(flatten_consensus(values))
+                continue
+            data[name] = CONVERTERS[kind](values)
+        return pd.DataFrame(data, index=pd.RangeIndex(self.n_rows))
+
+def build_game_frame(rows, schema=GAME_SCHEMA):
+    builder = GameFrameBuilder(schema)
+    builder.extend(rows)
+    return builder.to_frame()
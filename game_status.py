@@ -0,0 +1,22 @@
+import re
+from functools import lru_cache
+
+# Game status classes from the main page's gameStatusText, shared by the card
+# renderer and the poll scheduler. Standard library only, so the scheduler
+# does not pull in the rendering stack.
+
+# Matches times like '18:10 ET', '7:05 PM EST', '12:30 PM', etc.
+TIME_STATUS = re.compile(r"^\d{1,2}:\d{2}(\s*[AP]M)?(\s*(ET|EST))?$", re.IGNORECASE)
+
+NOT_STARTED, IN_PROGRESS, FINAL = "notstarted", "progress", "final"
+
+# A slate has a few dozen distinct status texts
+STATUS_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=STATUS_CACHE_SIZE)
+def classify_status(status_text):
+    # (stripped status, status class): a clock time means not started, "Final" final, anything else live
+    status = str(status_text).strip()
+    if TIME_STATUS.match(status):
+        return status, NOT_STARTED
+    return status, FINAL if status.lower() == "final" else IN_PROGRESS
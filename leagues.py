@@ -0,0 +1,32 @@
+from collections import namedtuple
+
+# Page layout of each league on sportsbookreview. Every league uses the same two
+# page types under its own path: a main odds page per date, and a line-history
+# page per game. Only MLB is exercised by the rest of this repo; the others
+# follow the site's URL scheme.
+
+League = namedtuple("League", ["key", "path", "name"])
+
+LEAGUES = {
+    "mlb": League("mlb", "mlb-baseball", "MLB"),
+    "nfl": League("nfl", "nfl-football", "NFL"),
+    "nba": League("nba", "nba-basketball", "NBA"),
+    "nhl": League("nhl", "nhl-hockey", "NHL"),
+}
+
+DEFAULT_LEAGUE = "mlb"
+
+def get_league(league=None):
+    # League for a key (any case) or a League itself; None is the default league
+    if isinstance(league, League):
+        return league
+    key = (league or DEFAULT_LEAGUE).lower()
+    if key not in LEAGUES:
+        raise ValueError(f"Unknown league: {league} (expected one of {', '.join(LEAGUES)})")
+    return LEAGUES[key]
+
+def main_page_url(base_url, league, date_str):
+    return f"{base_url}/betting-odds/{league.path}/?date={date_str}"
+
+def line_history_url(base_url, league, game_id):
+    return f"{base_url}/betting-odds/{league.path}/line-history/{game_id}/"
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from game_frame import MARKETS, TICK_FIELDS
+
+# Append-only store of every line-history tick seen by scrape_odds(). Ticks are
+# unique per (game_id, sportsbook, market, odds_date), so re-scraping the same
+# game only adds the moves that happened since the last scrape.
+
+ODDS_COLUMNS = ["away_odds", "home_odds", "over_odds", "under_odds"]
+
+TICK_COLUMNS = [column for column, _ in TICK_FIELDS.values()]
+
+COLUMNS = ["game_id", "game_date", "sportsbook", "market", "odds_date"] + TICK_COLUMNS
+
+class LineStore:
+    def __init__(self, path=".cache/lines.sqlite"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ticks (
+                game_id INTEGER NOT NULL,
+                game_date TEXT,
+                sportsbook TEXT NOT NULL,
+                market TEXT NOT NULL,
+                odds_date TEXT NOT NULL,
+                away_odds INTEGER,
+                home_odds INTEGER,
+                away_spread REAL,
+                home_spread REAL,
+                total REAL,
+                over_odds INTEGER,
+                under_odds INTEGER,
+                UNIQUE (game_id, sportsbook, market, odds_date)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ticks_game_market_date ON ticks (game_id, market, odds_date)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ticks_game_date ON ticks (game_date)")
+        self._conn.commit()
+
+    def add_view(self, game_id, game_date, view):
+        # Stores every tick of one sportsbook's oddsView; returns how many were new
+        sportsbook = view.get('sportsbook', '').lower()
+        rows = []
+        for market, (history_key, fields) in MARKETS.items():
+            for tick in view.get(history_key) or []:
+                odds_date = tick.get("oddsDate")
+                if not odds_date:
+                    continue
+                values = {TICK_FIELDS[field][0]: tick.get(field) for field in fields}
+                rows.append((game_id, game_date, sportsbook, market, odds_date) + tuple(
+                    values.get(column) for column in TICK_COLUMNS
+                ))
+        if not rows:
+            return 0
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO ticks ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def movement(self, game_id=None, start_date=None, end_date=None, market=None, sportsbook="fanduel"):
+        # Tick series for one game or a game_date range (inclusive, YYYY-MM-DD), oldest first
+        clauses, params = [], []
+        if game_id is not None:
+            clauses.append("game_id = ?")
+            params.append(game_id)
+        if start_date is not None:
+            clauses.append("game_date >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            clauses.append("game_date <= ?")
+            params.append(end_date)
+        if market is not None:
+            clauses.append("market = ?")
+            params.append(market)
+        if sportsbook is not None:
+            clauses.append("sportsbook = ?")
+            params.append(sportsbook.lower())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT {', '.join(COLUMNS)} FROM ticks {where} ORDER BY game_id, market, odds_date"
+        with self._lock:
+            df = pd.read_sql_query(query, self._conn, params=params)
+        df["odds_date"] = pd.to_datetime(df["odds_date"], utc=True, errors="coerce", format="ISO8601")
+        for column in ODDS_COLUMNS:
+            df[column] = df[column].astype("Int64")
+        return df
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
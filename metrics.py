@@ -0,0 +1,338 @@
+import contextvars
+import cProfile
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sinks import JsonLinesSink, build_sink, specs_from_environment
+
+# Per-stage timings and counters for scrape_odds(). Pipeline code wraps each
+# stage in metrics.timer("stage", ...) and bumps metrics.count("name"); every
+# measurement is aggregated into the current run and handed to the configured
+# sinks as an event dict. The outermost metrics.run() logs a one-line summary
+# per stage at INFO when it ends (the CLIs show it with --verbose); stage seconds
+# are summed across worker threads, so they can add up to more than the run's
+# wall time.
+#
+# The current run is a context variable, so concurrent scrapes each get their
+# own. Work handed to another thread records into the submitting run when it is
+# wrapped with metrics.bind(fn); generators use metrics.run_iter(), which makes
+# their run current only while they execute, not in the consumer between items.
+#
+# Sinks (ODDS_METRICS, comma-separated, or configure()):
+#   jsonl:.cache/metrics.jsonl   every event and run summary as a JSON line
+#   prometheus:9108              cumulative totals served as Prometheus text on /metrics
+#   RegistrySink()               cumulative totals kept in-process (registry.snapshot())
+#
+# ODDS_PROFILE=cprofile,tracemalloc profiles each run of the calling thread
+# (worker threads are not traced; use max_workers=1 to see everything) and
+# writes the results under ODDS_PROFILE_DIR (default .cache/profiles).
+
+logger = logging.getLogger(__name__)
+
+class RegistrySink:
+    # Cumulative per-stage and per-counter totals across runs, plus the last run summary
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.runs = 0
+        self.last_run = None
+
+    def emit(self, event):
+        pass
+
+    def finish_run(self, summary):
+        with self._lock:
+            self.runs += 1
+            self.last_run = summary
+            for stage, values in summary["stages"].items():
+                totals = self.stages.setdefault(stage, {"count": 0, "seconds": 0.0, "bytes": 0})
+                for key in totals:
+                    totals[key] += values[key]
+            for name, value in summary["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "stages": {stage: dict(values) for stage, values in self.stages.items()},
+                "counters": dict(self.counters),
+                "last_run": self.last_run,
+            }
+
+    def prometheus_text(self):
+        snapshot = self.snapshot()
+        lines = [
+            "# TYPE odds_runs_total counter",
+            f"odds_runs_total {snapshot['runs']}",
+            "# TYPE odds_stage_seconds_total counter",
+        ]
+        lines += [f'odds_stage_seconds_total{{stage="{stage}"}} {values["seconds"]:.6f}'
+                  for stage, values in sorted(snapshot["stages"].items())]
+        lines.append("# TYPE odds_stage_calls_total counter")
+        lines += [f'odds_stage_calls_total{{stage="{stage}"}} {values["count"]}'
+                  for stage, values in sorted(snapshot["stages"].items())]
+        lines.append("# TYPE odds_stage_bytes_total counter")
+        lines += [f'odds_stage_bytes_total{{stage="{stage}"}} {values["bytes"]}'
+                  for stage, values in sorted(snapshot["stages"].items())]
+        lines.append("# TYPE odds_events_total counter")
+        lines += [f'odds_events_total{{name="{name}"}} {value}'
+                  for name, value in sorted(snapshot["counters"].items())]
+        last_run = snapshot["last_run"]
+        if last_run is not None:
+            lines += ["# TYPE odds_last_run_seconds gauge", f"odds_last_run_seconds {last_run['seconds']:.6f}"]
+        return "\n".join(lines) + "\n"
+
+class PrometheusSink(RegistrySink):
+    # RegistrySink served as Prometheus text on http://host:port/metrics from a daemon thread
+    def __init__(self, port=9108, host="127.0.0.1"):
+        super().__init__()
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = sink.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._httpd.serve_forever, name="odds-metrics", daemon=True).start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+SINKS = {
+    "jsonl": lambda arg: JsonLinesSink(arg or ".cache/metrics.jsonl"),
+    "prometheus": lambda arg: PrometheusSink(int(arg or 9108)),
+    "registry": lambda arg: RegistrySink(),
+}
+
+def sink_from_spec(spec):
+    return build_sink(spec, SINKS, "metrics sink")
+
+class Profiler:
+    def __init__(self, modes, directory):
+        self.modes = modes
+        self.directory = directory
+        self.profile = None
+
+    def start(self):
+        if "cprofile" in self.modes:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        if "tracemalloc" in self.modes and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if self.profile is not None:
+            self.profile.disable()
+            path = os.path.join(self.directory, f"scrape-{stamp}.prof")
+            self.profile.dump_stats(path)
+            print(f"cProfile written to {path}")
+        if "tracemalloc" in self.modes and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:20]
+            tracemalloc.stop()
+            path = os.path.join(self.directory, f"scrape-{stamp}.tracemalloc.txt")
+            with open(path, "w") as f:
+                f.write(f"current {current} bytes, peak {peak} bytes\n")
+                f.writelines(f"{stat}\n" for stat in top)
+            print(f"tracemalloc peak {peak / 2**20:.1f} MB, top allocations written to {path}")
+
+class Run:
+    # Stage and counter totals of one run
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+class Metrics:
+    def __init__(self, sinks=None, profile=None, profile_dir=".cache/profiles"):
+        self.sinks = list(sinks or [])
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self._current = contextvars.ContextVar("odds_metrics_run", default=None)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def current(self):
+        return self._current.get()
+
+    def _begin(self):
+        profiler = None
+        if self.profile:
+            profiler = Profiler(self.profile, self.profile_dir)
+            profiler.start()
+        return Run(), profiler
+
+    def _end(self, run, profiler, fields):
+        if profiler is not None:
+            profiler.stop()
+        self.finish_run(run, **fields)
+
+    @contextmanager
+    def run(self, **fields):
+        # Re-entrant: a run inside another joins it; only the outermost profiles and summarizes
+        current = self._current.get()
+        if current is not None:
+            yield current
+            return
+        run, profiler = self._begin()
+        token = self._current.set(run)
+        try:
+            yield run
+        finally:
+            self._current.reset(token)
+            self._end(run, profiler, fields)
+
+    def run_iter(self, iterable, **fields):
+        # Yields iterable's items inside a run (the caller's, if one is current), setting it only
+        # while the iterable executes so the consumer's own work between items stays outside
+        run = self._current.get()
+        outermost = run is None
+        if outermost:
+            run, profiler = self._begin()
+        iterator = iter(iterable)
+        try:
+            while True:
+                token = self._current.set(run)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self._current.reset(token)
+                yield item
+        finally:
+            token = self._current.set(run)
+            try:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+            finally:
+                self._current.reset(token)
+                if outermost:
+                    self._end(run, profiler, fields)
+
+    def bind(self, fn):
+        # fn recording into the calling thread's current run, for handing to worker threads
+        run = self._current.get()
+
+        def bound(*args, **kwargs):
+            token = self._current.set(run)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._current.reset(token)
+        return bound
+
+    @contextmanager
+    def timer(self, stage, **fields):
+        # Yields the event dict so the caller can attach fields (bytes, status, ...) before it is recorded
+        event = dict(fields)
+        start = time.perf_counter()
+        try:
+            yield event
+        finally:
+            self.record(stage, time.perf_counter() - start, **event)
+
+    def record(self, stage, seconds, **fields):
+        # Outside any run the event still goes to the sinks, but is not aggregated
+        run = self._current.get()
+        if run is not None:
+            size = fields.get("bytes") or 0
+            with run.lock:
+                values = run.stages.get(stage)
+                if values is None:
+                    values = run.stages[stage] = {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0}
+                values["count"] += 1
+                values["seconds"] += seconds
+                values["bytes"] += size
+                if seconds > values["max_seconds"]:
+                    values["max_seconds"] = seconds
+        if self.sinks:
+            event = dict(fields, event="stage", stage=stage, seconds=seconds, at=time.time())
+            for sink in self.sinks:
+                sink.emit(event)
+
+    def count(self, name, amount=1):
+        run = self._current.get()
+        if run is None:
+            return
+        with run.lock:
+            run.counters[name] = run.counters.get(name, 0) + amount
+
+    def summary(self, run, **fields):
+        with run.lock:
+            return dict(
+                fields,
+                seconds=time.perf_counter() - run.started,
+                stages={stage: dict(values) for stage, values in run.stages.items()},
+                counters=dict(run.counters),
+                finished_at=time.time(),
+            )
+
+    def finish_run(self, run, **fields):
+        summary = self.summary(run, **fields)
+        for sink in self.sinks:
+            try:
+                sink.finish_run(summary)
+            except Exception as e:
+                print(f"Error writing metrics: {e}")
+        logger.info(format_summary(summary))
+        return summary
+
+def format_summary(summary):
+    stages = ", ".join(
+        f"{stage} {values['seconds']:.2f}s/{values['count']}"
+        for stage, values in sorted(summary["stages"].items(), key=lambda item: -item[1]["seconds"])
+    )
+    counters = ", ".join(f"{name} {value}" for name, value in sorted(summary["counters"].items()))
+    return f"Run metrics: {summary['seconds']:.2f}s total; {stages or 'no stages'}" + (f"; {counters}" if counters else "")
+
+def from_environment():
+    specs = specs_from_environment("ODDS_METRICS")
+    modes = {mode.strip().lower() for mode in os.environ.get("ODDS_PROFILE", "").split(",") if mode.strip()}
+    return Metrics(
+        [sink_from_spec(spec) for spec in specs],
+        profile=modes or None,
+        profile_dir=os.environ.get("ODDS_PROFILE_DIR", ".cache/profiles"),
+    )
+
+# Process-wide instance used by the scrape pipeline
+METRICS = from_environment()
+
+def configure(sinks=None, profile=None, profile_dir=".cache/profiles"):
+    # Replaces the sinks and profiling modes of the process-wide instance
+    METRICS.sinks = list(sinks or [])
+    METRICS.profile = set(profile) if profile else None
+    METRICS.profile_dir = profile_dir
+    return METRICS
+
+timer = METRICS.timer
+record = METRICS.record
+count = METRICS.count
+run = METRICS.run
+run_iter = METRICS.run_iter
+bind = METRICS.bind
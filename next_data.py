@@ -0,0 +1,146 @@
+import json
+from itertools import repeat
+
+import metrics
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Extraction of the Next.js __NEXT_DATA__ payload from sportsbookreview pages.
+# Works on the raw response bytes: the script body is located with plain byte
+# searches and only that slice is ever decoded, never the surrounding HTML.
+
+SCRIPT_START = b'<script id="__NEXT_DATA__" type="application/json">'
+SCRIPT_END = b'</script>'
+
+_decoder = json.JSONDecoder()
+
+def _as_bytes(content):
+    if isinstance(content, str):
+        return content.encode('utf-8')
+    return content
+
+def script_body(content):
+    with metrics.timer("locate"):
+        return _script_body(content)
+
+def _script_body(content):
+    content = _as_bytes(content)
+    start = content.find(SCRIPT_START)
+    if start < 0:
+        return None
+    start += len(SCRIPT_START)
+    end = content.find(SCRIPT_END, start)
+    if end < 0:
+        return None
+    return content[start:end]
+
+def loads(body):
+    with metrics.timer("decode", bytes=len(body)):
+        if orjson is not None:
+            return orjson.loads(body)
+        return json.loads(body)
+
+def extract(content):
+    # Full __NEXT_DATA__ document, or None when the page has no payload
+    body = script_body(content)
+    if body is None:
+        return None
+    return loads(body)
+
+def extract_subtree(content, key):
+    # Value of the first "key": member in the payload, or None when the key (or
+    # the payload) is absent, so callers can fall back to extract(). With orjson
+    # a full parse is faster than any partial one, so the member is looked up in
+    # the parsed document; the json module instead parses only that member's
+    # value, skipping every sibling subtree.
+    if orjson is not None:
+        return first_member(extract(content), key)
+    body = script_body(content)
+    if body is None:
+        return None
+    marker = b'"' + key.encode('utf-8') + b'":'
+    pos = body.find(marker)
+    while pos > 0 and body[pos - 1:pos] == b'\\':
+        # Escaped quote inside a string value, not a member name
+        pos = body.find(marker, pos + 1)
+    if pos < 0:
+        return None
+    with metrics.timer("decode", bytes=len(body) - pos):
+        text = body[pos + len(marker):].decode('utf-8')
+        try:
+            value, _ = _decoder.raw_decode(text.lstrip())
+        except ValueError:
+            return None
+    return value
+
+def first_member(root, key):
+    # Value of the first member named key in document order, or None. Walks a
+    # stack of (name, value) iterators so a match ends the search at once.
+    stack = [iter([(None, root)])]
+    while stack:
+        for name, value in stack[-1]:
+            if name == key:
+                return value
+            if isinstance(value, dict):
+                stack.append(iter(value.items()))
+                break
+            if isinstance(value, list):
+                stack.append(zip(repeat(None), value))
+                break
+        else:
+            stack.pop()
+    return None
+
+def follow(root, path):
+    obj = root
+    for step in path:
+        try:
+            obj = obj[step]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return obj
+
+def format_path(path):
+    return "".join(f"[{step}]" if isinstance(step, int) else f".{step}" for step in path) or "<root>"
+
+class KeyLocator:
+    # Finds the first non-empty list stored under `key` anywhere in a payload and
+    # remembers the path it was found at. Later lookups try that path first, which
+    # is a handful of dict/list indexing steps; only a miss walks the whole tree.
+    def __init__(self, key):
+        self.key = key
+        self.path = None
+
+    def locate(self, root):
+        path = self.path
+        if path is not None:
+            found = follow(root, path)
+            if isinstance(found, list) and found:
+                return found
+        found_path, found = self.search(root)
+        if found_path is not None and found_path != path:
+            if path is not None:
+                print(f"Schema drift: {self.key} moved from {format_path(path)} to {format_path(found_path)}")
+            else:
+                print(f"{self.key} is not at a known location, using {format_path(found_path)}")
+            self.path = found_path
+        elif found_path is None and path is not None:
+            print(f"Schema drift: {self.key} not found at {format_path(path)} or anywhere else")
+        return found
+
+    def search(self, root):
+        # Iterative depth-first search in document order
+        stack = [((), root)]
+        while stack:
+            path, obj = stack.pop()
+            if isinstance(obj, dict):
+                value = obj.get(self.key)
+                if isinstance(value, list) and value:
+                    return path + (self.key,), value
+                stack.extend((path + (k,), v) for k, v in reversed(list(obj.items())))
+            elif isinstance(obj, list):
+                stack.extend((path + (i,), v) for i, v in reversed(list(enumerate(obj))))
+        return None, None
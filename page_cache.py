@@ -0,0 +1,136 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# Response cache for sportsbookreview pages. Entries remember the validators the
+# server sent (ETag / Last-Modified) so expired pages can be revalidated with a
+# conditional GET instead of downloaded again.
+#
+# Any object with get(url), put(url, entry), touch(url, fetched_at, ttl_class) and
+# is_fresh(entry) can be passed to scrape_odds(cache=...); PageCache persists to
+# SQLite and MemoryPageCache keeps everything in-process.
+
+CacheEntry = namedtuple("CacheEntry", ["body", "etag", "last_modified", "fetched_at", "ttl_class"])
+
+# Seconds an entry is served without revalidation, per URL class. None never expires:
+# line history of a Final game cannot change, so it is never fetched again.
+DEFAULT_TTLS = {
+    "main": 60,
+    "line_history": 120,
+    "final": None,
+}
+
+class BasePageCache:
+    def __init__(self, max_bytes, ttls=None):
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+
+    def is_fresh(self, entry, now=None):
+        ttl = self.ttls.get(entry.ttl_class, 0)
+        if ttl is None:
+            return True
+        now = time.time() if now is None else now
+        return now - entry.fetched_at < ttl
+
+class MemoryPageCache(BasePageCache):
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttls=None):
+        super().__init__(max_bytes, ttls)
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url, entry):
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._size -= len(old.body)
+            self._entries[url] = entry
+            self._size += len(entry.body)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+
+    def touch(self, url, fetched_at, ttl_class):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries[url] = entry._replace(fetched_at=fetched_at, ttl_class=ttl_class)
+                self._entries.move_to_end(url)
+
+class PageCache(BasePageCache):
+    def __init__(self, path=".cache/pages.sqlite", max_bytes=256 * 1024 * 1024, ttls=None):
+        super().__init__(max_bytes, ttls)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                ttl_class TEXT NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+        self._conn.commit()
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at, ttl_class FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return CacheEntry(*row)
+
+    def put(self, url, entry):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, entry.body, entry.etag, entry.last_modified, entry.fetched_at,
+                 time.time(), entry.ttl_class, len(entry.body))
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url, fetched_at, ttl_class):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ?, ttl_class = ? WHERE url = ?",
+                (fetched_at, time.time(), ttl_class, url)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        # Least recently used pages go first until the cache fits in max_bytes
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+        for url, size in rows[:-1]:
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,208 @@
+import argparse
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from scrape_odds import scrape_odds, IncrementalState
+from page_cache import PageCache
+from line_store import LineStore
+from scheduler import PollScheduler
+from transport import Transport
+from alerts import AlertEngine, MoneylineMoveRule, LineMoveRule, sink_from_spec
+from snapshot_history import SnapshotHistory
+
+# Runs scrape_odds() on a schedule away from the Streamlit request path and
+# publishes each result as a versioned snapshot file. Readers only ever load the
+# latest snapshot, so page loads never wait on the network and the number of
+# viewers has no effect on how often sportsbookreview is hit. A new version is
+# only published when the odds changed, so caches keyed by version stay valid
+# across polls that found nothing new.
+#
+#   python refresher.py --interval 30       # standalone daemon
+#   Refresher().start()                     # or one shared background thread
+
+SNAPSHOT_PATH = os.environ.get("ODDS_SNAPSHOT_PATH", ".cache/snapshot.pkl")
+
+Snapshot = namedtuple("Snapshot", ["version", "scraped_at", "frame"])
+
+# A snapshot file is two pickles back to back: a small (version, scraped_at)
+# header, then the frame, so readers can check the version without loading the frame
+
+def publish_snapshot(frame, version, path=SNAPSHOT_PATH):
+    # Written to a temp file in the same directory and renamed over the old one,
+    # so readers see either the previous snapshot or the new one, never a partial file
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    snapshot = Snapshot(version, datetime.now(timezone.utc), frame)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((snapshot.version, snapshot.scraped_at), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return snapshot
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    try:
+        with open(path, "rb") as f:
+            header = pickle.load(f)
+            if len(header) == 3:
+                # Written before the header was split from the frame
+                return Snapshot(*header)
+            return Snapshot(*header, pickle.load(f))
+    except FileNotFoundError:
+        return None
+
+def snapshot_version(path=SNAPSHOT_PATH):
+    # Version of the snapshot on disk from its header alone; None if there is none yet
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)[0]
+    except FileNotFoundError:
+        return None
+
+def wait_for_snapshot(path=SNAPSHOT_PATH, newer_than=0, timeout=180, poll=0.5):
+    # Latest snapshot once its version exceeds newer_than; whatever is on disk after timeout.
+    # Polls the header only and loads the frame once.
+    deadline = time.monotonic() + timeout
+    while True:
+        version = snapshot_version(path)
+        if (version is not None and version > newer_than) or time.monotonic() >= deadline:
+            return load_snapshot(path)
+        time.sleep(poll)
+
+class Refresher:
+    def __init__(self, path=SNAPSHOT_PATH, interval=30, max_workers=4, requests_per_second=5.0,
+                 adaptive=True, requests_per_minute=60, alerts=None, history=None):
+        self.path = path
+        # Optional AlertEngine fed every published frame
+        self.alerts = alerts
+        # Optional SnapshotHistory that keeps every published frame as a delta
+        self.history = history
+        self.interval = interval
+        # Adaptive polling decides per game what is due, so the loop itself can tick often
+        self.scheduler = PollScheduler(requests_per_minute=requests_per_minute) if adaptive else None
+        self.scrape_kwargs = {
+            "max_workers": max_workers,
+            "requests_per_second": requests_per_second,
+            "cache": PageCache(),
+            "incremental": self.scheduler if adaptive else IncrementalState(),
+            "line_store": LineStore(),
+            # Kept across scrapes so the per-host circuit breaker remembers recent failures
+            "transport": Transport(pool_size=max_workers * 2),
+        }
+        previous = load_snapshot(path)
+        self.version = previous.version if previous is not None else 0
+        # Last published frame, compared with each scrape to skip republishing unchanged odds
+        self.frame = previous.frame if previous is not None else None
+        # Polls begun and finished, so request_refresh() callers can wait for theirs
+        self.polls_started = self.polls_finished = 0
+        self._polled = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        frame = scrape_odds(**self.scrape_kwargs)
+        if frame.empty and self.version:
+            print("Scrape returned no games, keeping the previous snapshot")
+            return None
+        if self.frame is not None and frame.equals(self.frame):
+            print(f"Odds unchanged, keeping snapshot v{self.version}")
+            return None
+        self.version += 1
+        snapshot = publish_snapshot(frame, self.version, self.path)
+        self.frame = frame
+        if self.history is not None:
+            try:
+                self.history.append(frame, snapshot.scraped_at)
+            except Exception as e:
+                print(f"Error recording snapshot history: {e}")
+        if self.alerts is not None:
+            try:
+                self.alerts.update(frame)
+            except Exception as e:
+                print(f"Error evaluating alerts: {e}")
+        return snapshot
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            with self._polled:
+                self.polls_started += 1
+            try:
+                snapshot = self.refresh()
+                if snapshot is not None:
+                    print(f"Published snapshot v{snapshot.version} ({len(snapshot.frame)} games) "
+                          f"in {time.monotonic() - started:.1f}s")
+            except Exception as e:
+                print(f"Error refreshing odds snapshot: {e}")
+            with self._polled:
+                self.polls_finished += 1
+                self._polled.notify_all()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def request_refresh(self):
+        # Wakes the loop early instead of scraping on the caller's thread. Returns the number
+        # of the poll that will pick the request up, to pass to wait_for_poll().
+        if self.scheduler is not None:
+            self.scheduler.force_next()
+        with self._polled:
+            poll = self.polls_started + 1
+        self._wake.set()
+        return poll
+
+    def wait_for_poll(self, poll, timeout=None):
+        # Blocks until poll has finished, whether or not it published a new snapshot
+        with self._polled:
+            return self._polled.wait_for(lambda: self.polls_finished >= poll, timeout)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.run_forever, name="odds-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish MLB odds snapshots on a schedule")
+    parser.add_argument("--interval", type=float, default=30, help="seconds between polls")
+    parser.add_argument("--path", default=SNAPSHOT_PATH)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=5.0, help="line-history requests per second")
+    parser.add_argument("--budget", type=int, default=60, help="adaptive poll requests per minute")
+    parser.add_argument("--full", action="store_true", help="refetch every changed game on each scrape")
+    parser.add_argument("--history", metavar="PATH", help="keep every snapshot as a delta in this SQLite file")
+    parser.add_argument("--alert", action="append", metavar="SINK",
+                        help="enable line-move alerts to stdout, jsonl:PATH or webhook:URL; repeatable")
+    parser.add_argument("--alert-cents", type=float, default=10, help="moneyline move that triggers an alert")
+    parser.add_argument("--alert-total-step", type=float, default=0.5, help="total alerts when it crosses a multiple of this")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log per-scrape summaries to stderr")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+    alerts = None
+    if args.alert:
+        rules = [MoneylineMoveRule(cents=args.alert_cents),
+                 LineMoveRule("total_current_line", step=args.alert_total_step, name="total_move")]
+        alerts = AlertEngine(rules, [sink_from_spec(spec) for spec in args.alert])
+    history = SnapshotHistory(args.history) if args.history else None
+    Refresher(args.path, args.interval, args.workers, args.rps, adaptive=not args.full,
+              requests_per_minute=args.budget, alerts=alerts, history=history).run_forever()
+
+if __name__ == "__main__":
+    main()
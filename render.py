@@ -0,0 +1,249 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from game_status import FINAL, IN_PROGRESS, NOT_STARTED, classify_status
+
+# Card rendering for the Streamlit page. Every display value is computed for the
+# whole slate at once with pandas/NumPy column operations (one datetime
+# conversion per column), then the cards are filled from one precompiled
+# template and joined, so a tab is a single st.markdown call. Timestamp labels and
+# status classes are memoized by value in bounded LRU caches, so a slate only
+# formats the timestamps and status texts it has not seen before.
+
+et = pytz.timezone("US/Eastern")
+
+# Standard column widths for all cards
+col_widths = [
+    "180px",  # Team
+    "70px", "70px",  # Money Line
+    "90px", "90px",  # Run Line
+    "110px", "110px" # Total
+]
+
+SCORE_BOX_STYLE = "display:inline-block; min-width:2.5em; text-align:right; margin-left:1em; color:#2176ae; font-weight:600;"
+EMPTY_SCORE = "<span style='min-width:2.5em; display:inline-block;'></span>"
+
+# Entries per memo; a slate has a few dozen distinct timestamps and status texts
+LABEL_CACHE_SIZE = 4096
+
+BADGES = {
+    NOT_STARTED: '<span class="status-badge notstarted">Not Started</span>',
+    FINAL: '<span class="status-badge final">Final</span>',
+    IN_PROGRESS: '<span class="status-badge progress">In Progress</span>',
+}
+
+CARD_TEMPLATE = """
+<div class="odds-card">
+    <div style="padding:1.3em 1.3em 0.8em 1.3em;">
+        <div class="odds-header-main">{away_full} at {home_full}</div>
+        <div class="odds-header-sub">
+            {status_badge}
+            <span>{header_time_or_status}</span>
+            &nbsp;|&nbsp; {venue} | {city}, {state}
+        </div>
+        <div style="overflow-x:auto;">
+        <table class="odds-table">
+            <colgroup>
+                <col style="width:%s;" />
+                <col style="width:%s;" />
+                <col style="width:%s;" />
+                <col style="width:%s;" />
+                <col style="width:%s;" />
+                <col style="width:%s;" />
+                <col style="width:%s;" />
+            </colgroup>
+            <tr>
+                <th rowspan="2" style="text-align:center;">Team</th>
+                <th colspan="2" style="text-align:center;">Money Line</th>
+                <th colspan="2" style="text-align:center;">Run Line</th>
+                <th colspan="2" style="text-align:center;">Total</th>
+            </tr>
+            <tr>
+                <th style="text-align:center;">Open</th>
+                <th style="text-align:center;">{current_label}</th>
+                <th style="text-align:center;">Open</th>
+                <th style="text-align:center;">{current_label}</th>
+                <th style="text-align:center;">Open</th>
+                <th style="text-align:center;">{current_label}</th>
+            </tr>
+            <tr>
+                <td style="text-align:left; white-space:nowrap;">
+                    <span style="display:flex; justify-content:space-between; align-items:center;">
+                        <span>{away_nick}</span>
+                        {away_score_html}
+                    </span>
+                </td>
+                <td style="text-align:center;">{ml_opening_away}</td>
+                <td style="text-align:center;">{ml_current_away}</td>
+                <td style="text-align:center;">{rl_opening_away}</td>
+                <td style="text-align:center;">{rl_current_away}</td>
+                <td style="text-align:center;">{total_opening_over}</td>
+                <td style="text-align:center;">{total_current_over}</td>
+            </tr>
+            <tr>
+                <td style="text-align:left; white-space:nowrap;">
+                    <span style="display:flex; justify-content:space-between; align-items:center;">
+                        <span>{home_nick}</span>
+                        {home_score_html}
+                    </span>
+                </td>
+                <td style="text-align:center;">{ml_opening_home}</td>
+                <td style="text-align:center;">{ml_current_home}</td>
+                <td style="text-align:center;">{rl_opening_home}</td>
+                <td style="text-align:center;">{rl_current_home}</td>
+                <td style="text-align:center;">{total_opening_under}</td>
+                <td style="text-align:center;">{total_current_under}</td>
+            </tr>
+        </table>
+        </div>
+        <div style="font-size:0.92em; color:#888; margin-top:0.7em;">
+            Open: {open_time} &nbsp;|&nbsp; {footer_update_label}: {update_time}
+        </div>
+    </div>
+</div>
+""" % tuple(col_widths)
+
+def compile_template(template):
+    # Drops indentation and blank lines so the joined cards stay one markdown HTML block,
+    # and turns the named fields into positional ones for a plain str.format per card
+    fields = re.findall(r"\{(\w+)\}", template)
+    order = list(dict.fromkeys(fields))
+    compact = " ".join(line.strip() for line in template.splitlines() if line.strip())
+    for index, name in enumerate(order):
+        compact = compact.replace("{" + name + "}", "{" + str(index) + "}")
+    return compact, order
+
+CARD_FORMAT, CARD_FIELDS = compile_template(CARD_TEMPLATE)
+
+def to_float(values):
+    return values.to_numpy(dtype="float64", na_value=np.nan)
+
+def to_text(values):
+    return values.to_numpy(dtype=object, na_value="")
+
+def format_numbers(array):
+    # 8.0 -> "8", 8.5 -> "8.5"; NaN -> "-"
+    missing = np.isnan(array)
+    filled = np.where(missing, 0.0, array)
+    whole = filled == np.floor(filled)
+    text = np.where(whole, filled.astype(np.int64).astype(str), filled.astype(str)).astype(object)
+    text[missing] = "-"
+    return text
+
+def format_odds(array):
+    text = format_numbers(array)
+    return np.where(array > 0, "+" + text, text)
+
+def format_run_line(spread, odds):
+    spread, odds = to_float(spread), to_float(odds)
+    text = format_numbers(spread) + " (" + format_odds(odds) + ")"
+    return np.where(np.isnan(spread) | np.isnan(odds), "-", text)
+
+def format_total_line(overunder, line, odds):
+    line, odds = to_float(line), to_float(odds)
+    text = overunder + " " + format_numbers(line) + " (" + format_odds(odds) + ")"
+    return np.where(np.isnan(line) | np.isnan(odds), "-", text)
+
+def format_times(values, label, *args):
+    # A slate has few distinct timestamps: each one is labelled once, through a memoized label(ns, *args)
+    stamps = pd.to_datetime(values, utc=True, errors="coerce", format="ISO8601")
+    codes, uniques = pd.factorize(stamps)
+    if not len(uniques):
+        return np.full(len(codes), "-", dtype=object)
+    labels = np.array([label(stamp, *args) for stamp in uniques.as_unit("ns").asi8.tolist()] + ["-"], dtype=object)
+    return labels[codes]
+
+def to_eastern(stamp_ns):
+    return datetime.fromtimestamp(stamp_ns / 1e9, et)
+
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def footer_label(stamp_ns, today_ordinal):
+    dt = to_eastern(stamp_ns)
+    days_ago = today_ordinal - dt.date().toordinal()
+    if days_ago == 0:
+        prefix = "Today"
+    elif days_ago == 1:
+        prefix = "Yesterday"
+    else:
+        prefix = dt.strftime("%A")
+    return f"{prefix} {dt.strftime('%-I:%M%p EST')}"
+
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def display_time_label(stamp_ns):
+    # Always display as 12-hour time with AM/PM and EST
+    return to_eastern(stamp_ns).strftime("%-I:%M %p EST")
+
+def format_time_footer(values, now=None):
+    return format_times(values, footer_label, (now or datetime.now(et)).date().toordinal())
+
+def format_display_time(values):
+    return format_times(values, display_time_label)
+
+def format_team_nickname(nickname, full):
+    nickname, full = to_text(nickname), to_text(full)
+    is_athletics = (full == "Athletics Athletics") | (nickname == "Athletics Athletics")
+    return np.where(is_athletics, "Athletics", nickname)
+
+def status_column(status_text):
+    # Stripped status and status class per game, classifying each distinct status text once
+    codes, uniques = pd.factorize(to_text(status_text))
+    classified = [classify_status(value) for value in uniques.tolist()]
+    status = np.array([text for text, _ in classified], dtype=object)
+    kind = np.array([kind for _, kind in classified], dtype=object)
+    return status[codes], kind[codes]
+
+def score_html(score, has_started):
+    values = score.to_numpy(dtype=object, na_value=None)
+    present = has_started & (values != None)
+    text = "<span style='" + SCORE_BOX_STYLE + "'>" + values.astype(str).astype(object) + "</span>"
+    return np.where(present, text, EMPTY_SCORE)
+
+def display_columns(games, now=None):
+    # One array per template field, all computed column-wise over the whole slate
+    # The status class drives the badge, the header and the Current/Close labels
+    status, kind = status_column(games['game_status_text'])
+    has_started = kind != NOT_STARTED
+    start_time_et = format_display_time(games['start_date'])
+    return {
+        "away_full": format_team_nickname(games['away_team_full'], games['away_team_full']),
+        "home_full": format_team_nickname(games['home_team_full'], games['home_team_full']),
+        "status_badge": np.array([BADGES[value] for value in kind.tolist()], dtype=object),
+        # Header: show status if started, else show time
+        "header_time_or_status": np.where(has_started & (status != ""), status, start_time_et),
+        "venue": to_text(games['venue']),
+        "city": to_text(games['venue_city']),
+        "state": to_text(games['venue_state']),
+        # Table "Current" -> "Close" if started/final
+        "current_label": np.where(has_started, "Close", "Current"),
+        "away_nick": format_team_nickname(games['away_team_nickname'], games['away_team_full']),
+        "home_nick": format_team_nickname(games['home_team_nickname'], games['home_team_full']),
+        "away_score_html": score_html(games['score_away'], has_started),
+        "home_score_html": score_html(games['score_home'], has_started),
+        "ml_opening_away": format_odds(to_float(games['ml_opening_away'])),
+        "ml_current_away": format_odds(to_float(games['ml_current_away'])),
+        "ml_opening_home": format_odds(to_float(games['ml_opening_home'])),
+        "ml_current_home": format_odds(to_float(games['ml_current_home'])),
+        "rl_opening_away": format_run_line(games['rl_opening_away_spread'], games['rl_opening_away_odds']),
+        "rl_current_away": format_run_line(games['rl_current_away_spread'], games['rl_current_away_odds']),
+        "rl_opening_home": format_run_line(games['rl_opening_home_spread'], games['rl_opening_home_odds']),
+        "rl_current_home": format_run_line(games['rl_current_home_spread'], games['rl_current_home_odds']),
+        "total_opening_over": format_total_line("Over", games['total_opening_line'], games['total_opening_over_odds']),
+        "total_current_over": format_total_line("Over", games['total_current_line'], games['total_current_over_odds']),
+        "total_opening_under": format_total_line("Under", games['total_opening_line'], games['total_opening_under_odds']),
+        "total_current_under": format_total_line("Under", games['total_current_line'], games['total_current_under_odds']),
+        # Footer: "Current Update" -> "Close" if started/final
+        "footer_update_label": np.where(has_started, "Close", "Current Update"),
+        "open_time": format_time_footer(games['ml_opening_time'], now),
+        "update_time": format_time_footer(games['last_line_update'], now),
+    }
+
+def render_cards(games, now=None):
+    games = games.sort_values('start_date')
+    display = display_columns(games, now)
+    rows = zip(*(display[name].tolist() for name in CARD_FIELDS))
+    return "".join([CARD_FORMAT.format(*row) for row in rows])
@@ -0,0 +1,219 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+from game_status import FINAL, NOT_STARTED, classify_status
+from scrape_odds import IncrementalState
+
+# Adaptive polling for the refresher. Each game gets a refresh interval from its
+# start time and status: live and about-to-start games are polled often, games
+# later today or tomorrow rarely, and Final games once more (for closing lines)
+# and then never; postponed and cancelled games are never polled. Every poll only fetches the pages that are due, capped by a
+# global per-minute request budget, and keeps count of what a naive full
+# refresh would have cost; each poll logs that comparison at INFO.
+
+# Seconds between line-history fetches per game state; None means never again.
+# A due game's page is revalidated even if the page cache still holds it fresh
+# (its fingerprint changed), so intervals below the cache TTLs are real fetches.
+DEFAULT_INTERVALS = {
+    "live": 60,
+    "imminent": 120,   # starts within IMMINENT_WINDOW
+    "today": 900,      # starts within TODAY_WINDOW
+    "later": 3600,
+    "final": None,
+    "off": None,       # postponed or cancelled
+}
+
+logger = logging.getLogger(__name__)
+
+IMMINENT_WINDOW = 60 * 60
+TODAY_WINDOW = 12 * 60 * 60
+
+# Status texts (lowercased prefixes) of games that will not be played on their date
+OFF_STATUSES = ("postponed", "cancelled", "canceled")
+
+def parse_start(start_date):
+    if not start_date:
+        return None
+    try:
+        start = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return start.timestamp()
+
+def game_state(game_view, now):
+    # Same status classes as the rendered cards, with postponed/cancelled split out of "in progress"
+    status_text, kind = classify_status(game_view.get('gameStatusText') or '')
+    if kind == FINAL:
+        return "final"
+    if status_text.lower().startswith(OFF_STATUSES):
+        return "off"
+    if status_text and kind != NOT_STARTED:
+        return "live"
+    start = parse_start(game_view.get('startDate'))
+    if start is None:
+        return "today"
+    until_start = start - now
+    if until_start <= IMMINENT_WINDOW:
+        return "imminent"
+    if until_start <= TODAY_WINDOW:
+        return "today"
+    return "later"
+
+class RequestBudget:
+    # Token bucket refilled continuously at requests_per_minute
+    def __init__(self, requests_per_minute, clock=time.monotonic):
+        self.capacity = float(requests_per_minute)
+        self.rate = requests_per_minute / 60.0
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self):
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def spend(self):
+        # Unconditional spend for pages that cannot be skipped; may go into debt
+        self._refill()
+        self.tokens -= 1
+
+class PollScheduler(IncrementalState):
+    def __init__(self, intervals=None, requests_per_minute=60, clock=time.time):
+        super().__init__()
+        self.intervals = dict(DEFAULT_INTERVALS, **(intervals or {}))
+        self.budget = RequestBudget(requests_per_minute)
+        self.clock = clock
+        self.fetched_at = {}
+        self.final_fetched = set()
+        self.states = {}
+        self.game_dates = {}
+        self.date_rows = {}
+        self.date_fetched_at = {}
+        self._force = threading.Event()
+        self.totals = {"polls": 0, "requests": 0, "naive_requests": 0, "deferred": 0}
+        self._reset_run()
+
+    def _reset_run(self):
+        self.run = {"requests": 0, "naive_requests": 0, "deferred": 0}
+
+    def force_next(self):
+        # Next poll ignores intervals and the budget, e.g. for a manual "Update Data"
+        self._force.set()
+
+    def start_run(self):
+        super().start_run()
+        self._reset_run()
+        self.forced = self._force.is_set()
+        self._force.clear()
+
+    def date_interval(self, date_str):
+        # A date's main page is due as often as its most urgent game; all-Final dates never
+        states = [state for game_id, state in self.states.items() if self.game_dates.get(game_id) == date_str]
+        if not states:
+            return 0
+        intervals = [self.intervals[state] for state in states if self.intervals[state] is not None]
+        return min(intervals) if intervals else None
+
+    def cached_game_rows(self, date_str):
+        self.run["naive_requests"] += 1
+        rows = self.date_rows.get(date_str)
+        if rows is not None and not self.forced:
+            interval = self.date_interval(date_str)
+            last = self.date_fetched_at.get(date_str, 0)
+            if interval is None or self.clock() - last < interval or not self.budget.take():
+                return rows
+        else:
+            self.budget.spend()
+        self.run["requests"] += 1
+        return None
+
+    def remember_game_rows(self, date_str, game_rows):
+        self.date_rows[date_str] = game_rows
+        self.date_fetched_at[date_str] = self.clock()
+        for game in game_rows:
+            game_id = (game.get('gameView') or {}).get('gameId')
+            if game_id:
+                self.game_dates[game_id] = date_str
+
+    def select(self, candidates):
+        now = self.clock()
+        reused = {}
+        due = []
+        self.run["naive_requests"] += len(candidates)
+        for i, game_id, fingerprint, game in candidates:
+            self._seen.add(game_id)
+            state = self.states[game_id] = game_state(game.get('gameView', {}), now)
+            known = self.games.get(game_id)
+            if known is None:
+                # Never fetched: always fetched now, budget or not
+                self.budget.spend()
+                continue
+            previous_fingerprint, odds = known
+            if previous_fingerprint == fingerprint:
+                reused[i] = odds
+                continue
+            interval = self.intervals[state]
+            elapsed = now - self.fetched_at.get(game_id, 0)
+            if interval is None:
+                # Final (or off): one last fetch for the closing lines, then never again
+                if game_id in self.final_fetched:
+                    reused[i] = odds
+                    continue
+                due.append((float("inf"), i, odds))
+            elif self.forced or elapsed >= interval:
+                due.append((elapsed / interval, i, odds))
+            else:
+                reused[i] = odds
+
+        # Most overdue first; what does not fit in the budget waits for the next poll
+        for _, i, odds in sorted(due, key=lambda item: item[0], reverse=True):
+            if self.forced or self.budget.take():
+                continue
+            reused[i] = odds
+            self.run["deferred"] += 1
+        self.skipped += len(reused)
+        return reused
+
+    def remember(self, game_id, fingerprint, odds):
+        super().remember(game_id, fingerprint, odds)
+        self.run["requests"] += 1
+        now = self.clock()
+        self.fetched_at[game_id] = now
+        if self.intervals[self.states.get(game_id, "live")] is None and odds is not None:
+            self.final_fetched.add(game_id)
+
+    def finish_run(self, prune=True):
+        super().finish_run(prune)
+        for mapping in (self.fetched_at, self.states, self.game_dates):
+            for game_id in list(mapping):
+                if game_id not in self.games:
+                    del mapping[game_id]
+        self.final_fetched &= set(self.games)
+        for date_str in list(self.date_rows):
+            if date_str not in self.game_dates.values():
+                del self.date_rows[date_str]
+                self.date_fetched_at.pop(date_str, None)
+        self.totals["polls"] += 1
+        for key, value in self.run.items():
+            self.totals[key] += value
+        saved = self.run["naive_requests"] - self.run["requests"]
+        total_saved = self.totals["naive_requests"] - self.totals["requests"]
+        logger.info(f"Adaptive poll: {self.run['requests']} of {self.run['naive_requests']} pages fetched "
+                    f"({saved} saved, {self.run['deferred']} deferred by budget); "
+                    f"{total_saved} saved over {self.totals['polls']} polls")
+
+    def metrics(self):
+        saved = self.totals["naive_requests"] - self.totals["requests"]
+        return dict(self.totals, saved=saved)
@@ -1,11 +1,27 @@
-import requests
-import re
 import json
-import pandas as pd
+import hashlib
+import logging
+import os
+import sys
 from datetime import datetime, timedelta
-from pytz import timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import queue
 import time
 import random
+from page_cache import CacheEntry
+from transport import Transport
+import metrics
+import next_data
+from game_frame import GameFrameBuilder, GAME_COLUMNS, LINE_COLUMNS, LINE_SCHEMA, MARKETS, TICK_FIELDS, row_record
+from leagues import LEAGUES, get_league, line_history_url, main_page_url
+
+# Overridable for mirrors and local replays
+BASE_URL = os.environ.get("ODDS_BASE_URL", "https://www.sportsbookreview.com")
+ALL_SPORTSBOOKS = "all"
+
+# Per-scrape summaries go here at INFO; the CLI shows them with --verbose
+logger = logging.getLogger(__name__)
 
 def extract_team_info(team):
     return {
@@ -20,187 +36,740 @@ def get_first_last(history):
         return history[0], history[-1]
     return {}, {}
 
-def scrape_odds():
-    session = requests.Session()
-    session.headers.update({
-        'Accept-Encoding': 'identity',
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Cache-Control': 'no-cache',
-        'Pragma': 'no-cache'
-    })
-
-    et = timezone('US/Eastern')
-    now_et = datetime.now(et)
-    today = now_et.strftime("%Y-%m-%d")
-    tomorrow = (now_et + timedelta(days=1)).strftime("%Y-%m-%d")
-    all_games = []
-
-    for date_str in [today, tomorrow]:
-        main_url = f"https://www.sportsbookreview.com/betting-odds/mlb-baseball/?date={date_str}"
-        try:
-            response = session.get(main_url, timeout=15)
-            if response.status_code != 200:
-                print(f"Failed to fetch {main_url}")
-                continue
+class RateLimiter:
+    # Spaces request starts at least min_interval seconds apart across all threads
+    def __init__(self, requests_per_second):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
 
-            pattern = r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>'
-            match = re.search(pattern, response.text, re.DOTALL)
-            if not match:
-                print(f"No JSON found on {main_url}")
-                continue
+    def wait(self, delay=0.0):
+        # delay is the earliest start from now (a retry's backoff); the slot wait overlaps it rather than adding to it
+        if not self.min_interval:
+            if delay:
+                time.sleep(delay)
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now + delay, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
 
-            json_data = json.loads(match.group(1))
-            odds_tables = json_data['props']['pageProps'].get('oddsTables', [])
-            if not odds_tables:
-                print(f"No odds tables for {date_str}")
-                continue
-            odds_table_model = odds_tables[0]['oddsTableModel']
-            game_rows = odds_table_model.get('gameRows', [])
-            if not game_rows:
-                print(f"No games for {date_str}")
+def empty_line_odds():
+    return {
+        "ml_opening": {}, "ml_current": {},
+        "spread_opening": {}, "spread_current": {},
+        "total_opening": {}, "total_current": {},
+        "last_line_update": None,
+        "views": {}
+    }
+
+# Learned location of oddsViews for pages where it is not at a known spot; shared by all games and runs
+odds_views_locator = next_data.KeyLocator('oddsViews')
+
+def known_odds_views(line_history_model):
+    top_level_odds_views = line_history_model.get('oddsViews', [])
+    line_history = line_history_model.get('lineHistory', {})
+    line_history_odds_views = line_history.get('oddsViews', []) if line_history else []
+    if top_level_odds_views:
+        return top_level_odds_views
+    return line_history_odds_views
+
+def parse_line_history(line_json):
+    page_props = line_json['props']['pageProps']
+    line_history_model = page_props.get('lineHistoryModel', {})
+    odds_views = known_odds_views(line_history_model)
+    if not odds_views:
+        odds_views = odds_views_locator.locate(line_json) or []
+    return fanduel_line_odds(odds_views)
+
+def index_odds_views(odds_views):
+    # One pass over oddsViews: {sportsbook: view}, first view wins for each book
+    views = {}
+    for view in odds_views:
+        book = view.get('sportsbook', '').lower()
+        if book and book not in views:
+            views[book] = view
+    return views
+
+def select_sportsbooks(sportsbooks):
+    # None -> None (FanDuel wide frame), "all" -> ALL_SPORTSBOOKS, otherwise a lowercase set
+    if sportsbooks is None:
+        return None
+    if isinstance(sportsbooks, str):
+        if sportsbooks.lower() == ALL_SPORTSBOOKS:
+            return ALL_SPORTSBOOKS
+        sportsbooks = [sportsbooks]
+    return {book.lower() for book in sportsbooks}
+
+def selected_views(views, sportsbooks):
+    if sportsbooks == ALL_SPORTSBOOKS:
+        return views
+    return {book: view for book, view in views.items() if book in sportsbooks}
+
+def book_line_rows(date_str, game_id, views):
+    # Long-format rows in game_frame.LINE_COLUMNS order, one per (sportsbook, market)
+    rows = []
+    for book, view in views.items():
+        for market, (history_key, _) in MARKETS.items():
+            opening, current = get_first_last(view.get(history_key, []))
+            if not opening and not current:
                 continue
-        except Exception as e:
-            print(f"Error loading main page for {date_str}: {e}")
+            rows.append(
+                (date_str, game_id, book, market, opening.get("oddsDate"), current.get("oddsDate"))
+                + tuple(opening.get(field) for field in TICK_FIELDS)
+                + tuple(current.get(field) for field in TICK_FIELDS)
+            )
+    return rows
+
+def fanduel_line_odds(odds_views):
+    odds = empty_line_odds()
+    odds["views"] = index_odds_views(odds_views)
+    fanduel_data = odds["views"].get('fanduel')
+    if fanduel_data:
+        odds["ml_opening"], odds["ml_current"] = get_first_last(fanduel_data.get('moneyLineHistory', []))
+        odds["spread_opening"], odds["spread_current"] = get_first_last(fanduel_data.get('spreadHistory', []))
+        odds["total_opening"], odds["total_current"] = get_first_last(fanduel_data.get('totalHistory', []))
+        odds_dates = [
+            odds["ml_current"].get("oddsDate"),
+            odds["spread_current"].get("oddsDate"),
+            odds["total_current"].get("oddsDate")
+        ]
+        odds["last_line_update"] = max([d for d in odds_dates if d], default="")
+    return odds
+
+def load_line_history(content):
+    # Takes the lineHistoryModel subtree (see next_data.extract_subtree); falls back
+    # to the whole payload when oddsViews is not at one of its known locations.
+    line_history_model = next_data.extract_subtree(content, 'lineHistoryModel')
+    if isinstance(line_history_model, dict):
+        odds_views = known_odds_views(line_history_model)
+        if odds_views:
+            with metrics.timer("odds"):
+                return fanduel_line_odds(odds_views)
+    metrics.count("full_payload_fallbacks")
+    line_json = next_data.extract(content)
+    if line_json is None:
+        return None
+    with metrics.timer("odds"):
+        return parse_line_history(line_json)
+
+class CachedResponse:
+    status_code = 200
+    from_cache = True
+
+    def __init__(self, content):
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+class Fetcher:
+    # Shared by every request in a run: the transport, the politeness limiter, an optional page cache
+    # and the league whose pages are fetched
+    def __init__(self, transport, cache=None, limiter=None, league=None):
+        self.transport = transport
+        self.cache = cache
+        self.limiter = limiter
+        self.league = get_league(league)
+
+    def wait(self):
+        if self.limiter is None:
+            time.sleep(random.uniform(0.2, 0.5))
+        else:
+            self.limiter.wait()
+
+    def get(self, url, timeout, url_class, polite=False, revalidate=False):
+        # revalidate skips the freshness check: a cached page is only reused after the server answers 304
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and not revalidate and self.cache.is_fresh(entry):
+            metrics.count("cache_hits")
+            return CachedResponse(entry.body)
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        if polite:
+            with metrics.timer("wait"):
+                self.wait()
+        with metrics.timer("fetch", url=url, url_class=url_class) as event:
+            pace = self.limiter.wait if polite and self.limiter is not None else None
+            response = self.transport.get(url, timeout=timeout, headers=headers or None, pace=pace)
+            event["status"] = response.status_code
+            event["bytes"] = len(response.content)
+            event["cache"] = "revalidate" if entry is not None else "miss"
+
+        if entry is not None and response.status_code == 304:
+            metrics.count("cache_revalidated")
+            self.cache.touch(url, time.time(), url_class)
+            return CachedResponse(entry.body)
+        if response.status_code == 200 and self.cache is not None:
+            self.cache.put(url, CacheEntry(
+                body=response.content,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                fetched_at=time.time(),
+                ttl_class=url_class
+            ))
+        return response
+
+def fetch_line_history(fetcher, game_id, final=False, revalidate=False):
+    # Try to get FanDuel odds if available; None means the page could not be fetched or parsed
+    if not game_id:
+        return empty_line_odds()
+    try:
+        url = line_history_url(BASE_URL, fetcher.league, game_id)
+        url_class = "final" if final else "line_history"
+        line_response = fetcher.get(url, 10, url_class, polite=True, revalidate=revalidate)
+        if line_response.status_code == 200:
+            return load_line_history(line_response.content)
+    except Exception as e:
+        metrics.count("line_history_errors")
+        print(f"Error extracting FanDuel odds for game {game_id}: {e}")
+    return None
+
+def iter_line_histories(fetcher, game_ids, final_flags, executor=None, revalidate_flags=None):
+    # Yields (position, odds) as each request finishes, position indexing into game_ids
+    if revalidate_flags is None:
+        revalidate_flags = [False] * len(game_ids)
+    if executor is None:
+        for position, (game_id, final, revalidate) in enumerate(zip(game_ids, final_flags, revalidate_flags)):
+            yield position, fetch_line_history(fetcher, game_id, final, revalidate)
+        return
+    futures = {
+        executor.submit(metrics.bind(fetch_line_history), fetcher, game_id, final, revalidate): position
+        for position, (game_id, final, revalidate) in enumerate(zip(game_ids, final_flags, revalidate_flags))
+    }
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+def game_fingerprint(game):
+    # Cheap digest of the main-page fields that change whenever a game's lines or state move
+    game_view = game.get('gameView', {})
+    fields = [
+        game_view.get('gameStatusText'),
+        game_view.get('status'),
+        game_view.get('startDate'),
+        game_view.get('awayTeamScore'),
+        game_view.get('homeTeamScore'),
+        game_view.get('consensus'),
+        game.get('oddsViews'),
+    ]
+    payload = json.dumps(fields, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+class IncrementalState:
+    # Line odds from the previous run keyed by game_id, reused while the game's
+    # main-page fingerprint is unchanged. Keep one instance alive between scrapes.
+    def __init__(self):
+        self.games = {}
+        self.skipped = 0
+        self.refetched = 0
+        self._seen = set()
+        # Held by iter_scrape_date() around every call, since dates may be scraped concurrently
+        self.lock = threading.RLock()
+
+    def start_run(self):
+        self.skipped = 0
+        self.refetched = 0
+        self._seen = set()
+
+    def cached_game_rows(self, date_str):
+        # Main-page gameRows to reuse instead of fetching the date again; None fetches it
+        return None
+
+    def remember_game_rows(self, date_str, game_rows):
+        pass
+
+    def pending_games(self, date_str, game_rows):
+        # Main-page games of a date to scrape this run; a subclass may drop some (e.g. a backfill's finished games)
+        return game_rows
+
+    def select(self, candidates):
+        # candidates: (index, game_id, fingerprint, game) for every game on a date.
+        # Returns {index: odds} for the games whose previous odds are reused.
+        reused = {}
+        for i, game_id, fingerprint, game in candidates:
+            odds = self.lookup(game_id, fingerprint)
+            if odds is not None:
+                reused[i] = odds
+        return reused
+
+    def lookup(self, game_id, fingerprint):
+        self._seen.add(game_id)
+        known = self.games.get(game_id)
+        if known is not None and known[0] == fingerprint:
+            self.skipped += 1
+            return known[1]
+        return None
+
+    def changed(self, game_id, fingerprint):
+        # True if the game's odds are held under another fingerprint: its line history moved since
+        # they were fetched, so a cached copy of the page may be stale even within its TTL
+        known = self.games.get(game_id)
+        return known is not None and known[0] != fingerprint
+
+    def remember(self, game_id, fingerprint, odds):
+        self.refetched += 1
+        if odds is not None:
+            self.games[game_id] = (fingerprint, odds)
+        else:
+            self.games.pop(game_id, None)
+
+    def finish_run(self, prune=True):
+        # Games that fell off the board (dates rolled over) are forgotten; partial
+        # scrapes (other dates, a subset of games) keep everything they did not see
+        if prune:
+            for game_id in list(self.games):
+                if game_id not in self._seen:
+                    del self.games[game_id]
+        logger.info(f"Incremental refresh: skipped {self.skipped} games, refetched {self.refetched}")
+
+def default_dates():
+    # Today and tomorrow on the US/Eastern calendar
+    from pytz import timezone
+    now_et = datetime.now(timezone('US/Eastern'))
+    return [now_et.strftime("%Y-%m-%d"), (now_et + timedelta(days=1)).strftime("%Y-%m-%d")]
+
+def scrape_odds(max_workers=1, requests_per_second=5.0, cache=None, incremental=None, line_store=None,
+                sportsbooks=None, dates=None, game_ids=None, transport=None, league=None, limiter=None):
+    # max_workers > 1 fetches line history (and the dates themselves) concurrently, paced by
+    # a shared rate limit instead of the per-request sleep; the resulting DataFrame is the same either way.
+    # cache is a page_cache.PageCache (or compatible) used to skip or revalidate fetches.
+    # incremental is an IncrementalState carried between calls; line history is then
+    # only fetched for games that are new or whose main-page fingerprint changed.
+    # line_store is a line_store.LineStore that receives every tick fetched for the selected books.
+    # sportsbooks=None returns the wide FanDuel frame; a collection of books or "all" returns
+    # the long game_frame.LINE_COLUMNS frame keyed by (game_id, sportsbook, market) instead.
+    # dates is a list of YYYY-MM-DD strings (default today and tomorrow); game_ids limits
+    # the scrape to those games. Rows come out in dates order whatever order dates finish in.
+    # transport is a transport.Transport to keep between calls (its circuit breaker state
+    # carries over); by default each call gets a fresh one sized to max_workers.
+    # league is a leagues.LEAGUES key (default "mlb") choosing which pages are scraped.
+    # limiter replaces the per-call rate limit with a shared one (anything with wait(), e.g.
+    # farm.SharedRateLimiter across processes) and paces every line-history request.
+    selected = select_sportsbooks(sportsbooks)
+    dates = list(dates) if dates is not None else default_dates()
+    builder = GameFrameBuilder() if selected is None else GameFrameBuilder(LINE_SCHEMA)
+    with metrics.run():
+        results = dict(iter_date_games(dates, game_ids, max_workers, requests_per_second, cache,
+                                       incremental, line_store, selected, transport, league, limiter))
+        for date_str in dates:
+            add_date_games(builder, date_str, results.get(date_str, []), selected)
+        with metrics.timer("frame", rows=builder.n_rows):
+            return builder.to_frame()
+
+def scrape_dates(dates, game_ids=None, max_workers=1, requests_per_second=5.0, cache=None, incremental=None,
+                 line_store=None, sportsbooks=None, transport=None, league=None, limiter=None):
+    # Yields (date_str, DataFrame) for each date as soon as it is scraped, in completion order;
+    # takes the same arguments as scrape_odds()
+    selected = select_sportsbooks(sportsbooks)
+    for date_str, games in iter_date_games(dates, game_ids, max_workers, requests_per_second, cache,
+                                           incremental, line_store, selected, transport, league, limiter):
+        builder = GameFrameBuilder() if selected is None else GameFrameBuilder(LINE_SCHEMA)
+        add_date_games(builder, date_str, games, selected)
+        with metrics.timer("frame", rows=builder.n_rows):
+            frame = builder.to_frame()
+        yield date_str, frame
+
+def add_date_games(builder, date_str, games, selected):
+    for row, views in games:
+        if selected is None:
+            builder.append(row)
+        else:
+            builder.extend(book_line_rows(date_str, row[1], selected_views(views, selected)))
+
+def iter_date_games(dates, game_ids=None, max_workers=1, requests_per_second=5.0, cache=None, incremental=None,
+                    line_store=None, selected=None, transport=None, league=None, limiter=None):
+    # Yields (date_str, scrape_date() result) per date in completion order
+    pending = {}
+    for date_str, index, row, views in iter_game_rows(dates, game_ids, max_workers, requests_per_second, cache,
+                                                      incremental, line_store, selected, transport, league, limiter):
+        games = pending.setdefault(date_str, [])
+        if index is not None:
+            games.append((index, row, views))
+        else:
+            yield date_str, [(row, views) for _, row, views in sorted(pending.pop(date_str), key=lambda game: game[0])]
+
+def iter_games(dates=None, game_ids=None, max_workers=1, requests_per_second=5.0, cache=None, incremental=None,
+               line_store=None, sportsbooks=None, transport=None, league=None, limiter=None):
+    # Yields plain dict records as soon as each game's line history is parsed, in completion
+    # order: one per game in game_frame.GAME_COLUMNS, or with sportsbooks one per
+    # (game, sportsbook, market) in game_frame.LINE_COLUMNS. Same arguments as scrape_odds().
+    selected = select_sportsbooks(sportsbooks)
+    for date_str, index, row, views in iter_game_rows(dates, game_ids, max_workers, requests_per_second, cache,
+                                                      incremental, line_store, selected, transport, league, limiter):
+        if index is None:
             continue
+        if selected is None:
+            yield row_record(row, GAME_COLUMNS)
+        else:
+            for line_row in book_line_rows(date_str, row[1], selected_views(views, selected)):
+                yield row_record(line_row, LINE_COLUMNS)
 
-        for game in game_rows:
-            try:
-                game_view = game.get('gameView', {})
-                away_team = extract_team_info(game_view.get('awayTeam', {}))
-                home_team = extract_team_info(game_view.get('homeTeam', {}))
-                game_id = game_view.get('gameId')
-                start_date = game_view.get('startDate', '')
-                venue = game_view.get('venueName', '')
-                venue_city = game_view.get('city', '')
-                venue_state = game_view.get('state', '')
-                consensus = game_view.get('consensus', {})
-
-                # Extract game status and scores
-                game_status_text = game_view.get('gameStatusText', '')
-                game_status_code = game_view.get('status', '')  # <-- FIXED: extract status code
-                score = {
-                    "away": game_view.get("awayTeamScore"),
-                    "home": game_view.get("homeTeamScore")
-                }
-
-                # Default: all odds fields None
-                ml_opening = ml_current = {}
-                spread_opening = spread_current = {}
-                total_opening = total_current = {}
-                last_line_update = None
-
-                # Try to get FanDuel odds if available
-                fanduel_data = None
+def iter_game_rows(dates=None, game_ids=None, max_workers=1, requests_per_second=5.0, cache=None, incremental=None,
+                   line_store=None, selected=None, transport=None, league=None, limiter=None):
+    # Yields (date_str, index, row, views) per game in completion order, index being the game's
+    # position on its date, then (date_str, None, None, None) once that date is complete.
+    # The stream is one metrics run, current only while it executes: whatever the consumer
+    # does between rows (even another scrape) is measured separately.
+    return metrics.run_iter(stream_game_rows(dates, game_ids, max_workers, requests_per_second, cache, incremental,
+                                             line_store, selected, transport, league, limiter))
+
+def stream_game_rows(dates, game_ids, max_workers, requests_per_second, cache, incremental, line_store, selected,
+                     transport, league, limiter):
+    # iter_game_rows() without the metrics run. Dates get their own pool so a date waiting
+    # on line history never holds a line-history worker.
+    dates = list(dates) if dates is not None else default_dates()
+    wanted = set(game_ids) if game_ids is not None else None
+    executor = date_executor = None
+    pool_size = 1
+    if max_workers and max_workers > 1:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_second)
+        pool_size = max_workers
+        if len(dates) > 1:
+            date_executor = ThreadPoolExecutor(max_workers=min(len(dates), max_workers))
+            pool_size += min(len(dates), max_workers)
+    if transport is None:
+        transport = Transport(pool_size=pool_size)
+    elif transport.pool_size < pool_size:
+        transport.resize(pool_size)
+    transport.start_run()
+    fetcher = Fetcher(transport, cache, limiter, league)
+    if incremental is not None:
+        incremental.start_run()
+
+    stop = threading.Event()
+    try:
+        if date_executor is None:
+            for date_str in dates:
+                for index, row, views in iter_scrape_date(fetcher, date_str, executor, incremental, line_store,
+                                                          selected, wanted):
+                    yield date_str, index, row, views
+                yield date_str, None, None, None
+        else:
+            results = queue.Queue()
+
+            # Each worker puts (date_str, game, error): game is (index, row, views), or None
+            # once the date is done, with error set if scraping it raised
+            def run_date(date_str):
+                error = None
                 try:
-                    if game_id:
-                        line_history_url = f"https://www.sportsbookreview.com/betting-odds/mlb-baseball/line-history/{game_id}/"
-                        time.sleep(random.uniform(0.2, 0.5))
-                        line_response = session.get(line_history_url, timeout=10)
-                        if line_response.status_code == 200:
-                            line_match = re.search(pattern, line_response.text, re.DOTALL)
-                            if line_match:
-                                line_json = json.loads(line_match.group(1))
-                                page_props = line_json['props']['pageProps']
-                                line_history_model = page_props.get('lineHistoryModel', {})
-                                odds_views = []
-                                top_level_odds_views = line_history_model.get('oddsViews', [])
-                                line_history = line_history_model.get('lineHistory', {})
-                                line_history_odds_views = line_history.get('oddsViews', []) if line_history else []
-                                if top_level_odds_views:
-                                    odds_views = top_level_odds_views
-                                elif line_history_odds_views:
-                                    odds_views = line_history_odds_views
-                                else:
-                                    # Recursive search for oddsViews
-                                    def find_odds_views_recursive(obj):
-                                        if isinstance(obj, dict):
-                                            if 'oddsViews' in obj and isinstance(obj['oddsViews'], list):
-                                                return obj['oddsViews']
-                                            for value in obj.values():
-                                                found = find_odds_views_recursive(value)
-                                                if found:
-                                                    return found
-                                        elif isinstance(obj, list):
-                                            for item in obj:
-                                                found = find_odds_views_recursive(item)
-                                                if found:
-                                                    return found
-                                        return None
-                                    found_odds_views = find_odds_views_recursive(line_json)
-                                    if found_odds_views:
-                                        odds_views = found_odds_views
-                                for view in odds_views:
-                                    if view.get('sportsbook', '').lower() == 'fanduel':
-                                        fanduel_data = view
-                                        break
-                                if fanduel_data:
-                                    ml_opening, ml_current = get_first_last(fanduel_data.get('moneyLineHistory', []))
-                                    spread_opening, spread_current = get_first_last(fanduel_data.get('spreadHistory', []))
-                                    total_opening, total_current = get_first_last(fanduel_data.get('totalHistory', []))
-                                    odds_dates = [
-                                        ml_current.get("oddsDate"),
-                                        spread_current.get("oddsDate"),
-                                        total_current.get("oddsDate")
-                                    ]
-                                    last_line_update = max([d for d in odds_dates if d], default="")
+                    for game in iter_scrape_date(fetcher, date_str, executor, incremental, line_store,
+                                                 selected, wanted):
+                        if stop.is_set():
+                            return
+                        results.put((date_str, game, None))
                 except Exception as e:
-                    print(f"Error extracting FanDuel odds for game {game_id}: {e}")
-
-                game_info = {
-                    "date": date_str,
-                    "game_id": game_id,
-                    "start_date": start_date,
-                    "venue": venue,
-                    "venue_city": venue_city,
-                    "venue_state": venue_state,
-                    "away_team_full": away_team["fullName"],
-                    "away_team_short": away_team["shortName"],
-                    "away_team_nickname": away_team["nickname"],
-                    "away_team_name": away_team["name"],
-                    "home_team_full": home_team["fullName"],
-                    "home_team_short": home_team["shortName"],
-                    "home_team_nickname": home_team["nickname"],
-                    "home_team_name": home_team["name"],
-                    # New fields
-                    "game_status_text": game_status_text,
-                    "game_status_code": game_status_code,  # <-- FIXED: add to output
-                    "score_away": score["away"],
-                    "score_home": score["home"],
-                    "consensus": consensus if consensus else None,
-                    "last_line_update": last_line_update,
-                    # Moneyline
-                    "ml_opening_away": ml_opening.get("awayOdds"),
-                    "ml_opening_home": ml_opening.get("homeOdds"),
-                    "ml_opening_time": ml_opening.get("oddsDate"),
-                    "ml_current_away": ml_current.get("awayOdds"),
-                    "ml_current_home": ml_current.get("homeOdds"),
-                    "ml_current_time": ml_current.get("oddsDate"),
-                    # Run Line
-                    "rl_opening_away_spread": spread_opening.get("awaySpread"),
-                    "rl_opening_away_odds": spread_opening.get("awayOdds"),
-                    "rl_opening_home_spread": spread_opening.get("homeSpread"),
-                    "rl_opening_home_odds": spread_opening.get("homeOdds"),
-                    "rl_opening_time": spread_opening.get("oddsDate"),
-                    "rl_current_away_spread": spread_current.get("awaySpread"),
-                    "rl_current_away_odds": spread_current.get("awayOdds"),
-                    "rl_current_home_spread": spread_current.get("homeSpread"),
-                    "rl_current_home_odds": spread_current.get("homeOdds"),
-                    "rl_current_time": spread_current.get("oddsDate"),
-                    # Total
-                    "total_opening_line": total_opening.get("total"),
-                    "total_opening_over_odds": total_opening.get("overOdds"),
-                    "total_opening_under_odds": total_opening.get("underOdds"),
-                    "total_opening_time": total_opening.get("oddsDate"),
-                    "total_current_line": total_current.get("total"),
-                    "total_current_over_odds": total_current.get("overOdds"),
-                    "total_current_under_odds": total_current.get("underOdds"),
-                    "total_current_time": total_current.get("oddsDate"),
-                }
-                all_games.append(game_info)
+                    error = e
+                finally:
+                    results.put((date_str, None, error))
+
+            for date_str in dates:
+                date_executor.submit(metrics.bind(run_date), date_str)
+            remaining = len(dates)
+            while remaining:
+                date_str, game, error = results.get()
+                if game is None:
+                    remaining -= 1
+                    if error is not None:
+                        raise error
+                    yield date_str, None, None, None
+                else:
+                    yield (date_str,) + game
+    finally:
+        stop.set()
+        if date_executor is not None:
+            date_executor.shutdown(cancel_futures=True)
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    if incremental is not None:
+        incremental.finish_run(prune=game_ids is None)
+    for key, value in transport.stats.items():
+        metrics.count(f"http_{key}", value)
+    logger.info(transport.summary())
+
+def load_game_rows(fetcher, date_str):
+    main_url = main_page_url(BASE_URL, fetcher.league, date_str)
+    try:
+        # Paced like line history when a rate limit is configured, so concurrent dates share it too
+        response = fetcher.get(main_url, 15, "main", polite=fetcher.limiter is not None)
+        if response.status_code != 200:
+            metrics.count("main_page_errors")
+            print(f"Failed to fetch {main_url}")
+            return None
+
+        odds_tables = next_data.extract_subtree(response.content, 'oddsTables')
+        if not isinstance(odds_tables, list):
+            metrics.count("full_payload_fallbacks")
+            json_data = next_data.extract(response.content)
+            if json_data is None:
+                print(f"No JSON found on {main_url}")
+                return None
+            odds_tables = json_data['props']['pageProps'].get('oddsTables', [])
+        if not odds_tables:
+            print(f"No odds tables for {date_str}")
+            return None
+        odds_table_model = odds_tables[0]['oddsTableModel']
+        game_rows = odds_table_model.get('gameRows', [])
+        if not game_rows:
+            print(f"No games for {date_str}")
+            return None
+        return game_rows
+    except Exception as e:
+        metrics.count("main_page_errors")
+        print(f"Error loading main page for {date_str}: {e}")
+        return None
+
+def scrape_date(fetcher, date_str, executor=None, incremental=None, line_store=None, sportsbooks=None,
+                wanted=None):
+    # Returns (row, views) per game in main-page order: row is a tuple in game_frame.GAME_COLUMNS
+    # order and views maps each sportsbook on the line-history page to its oddsView.
+    # wanted, if given, is a set of game ids; other games on the date are skipped.
+    games = sorted(iter_scrape_date(fetcher, date_str, executor, incremental, line_store, sportsbooks, wanted),
+                   key=lambda game: game[0])
+    return [(row, views) for _, row, views in games]
+
+def iter_scrape_date(fetcher, date_str, executor=None, incremental=None, line_store=None, sportsbooks=None,
+                     wanted=None):
+    # Yields (index, row, views) for each game of scrape_date() as soon as it is ready:
+    # reused games first, then fetched ones as their line history comes in
+    game_rows = None
+    if incremental is not None:
+        with incremental.lock:
+            game_rows = incremental.cached_game_rows(date_str)
+    if game_rows is None:
+        game_rows = load_game_rows(fetcher, date_str)
+        if not game_rows:
+            return
+        if incremental is not None:
+            with incremental.lock:
+                incremental.remember_game_rows(date_str, game_rows)
+    if wanted is not None:
+        game_rows = [game for game in game_rows if (game.get('gameView') or {}).get('gameId') in wanted]
+    if incremental is not None:
+        with incremental.lock:
+            game_rows = incremental.pending_games(date_str, game_rows)
+
+    game_ids = []
+    final_flags = []
+    fingerprints = []
+    for game in game_rows:
+        try:
+            game_view = game.get('gameView', {})
+            game_ids.append(game_view.get('gameId'))
+            final_flags.append(game_view.get('gameStatusText', '') == "Final")
+            fingerprints.append(game_fingerprint(game) if incremental is not None else None)
+        except Exception:
+            game_ids.append(None)
+            final_flags.append(False)
+            fingerprints.append(None)
+
+    reused = {}
+    changed = set()
+    if incremental is not None:
+        candidates = [
+            (i, game_ids[i], fingerprints[i], game_rows[i])
+            for i in range(len(game_rows)) if game_ids[i] and fingerprints[i]
+        ]
+        with incremental.lock:
+            reused = incremental.select(candidates)
+            changed = {i for i, game_id, fingerprint, _ in candidates
+                       if i not in reused and incremental.changed(game_id, fingerprint)}
+    metrics.count("games_reused", len(reused))
+    for i, odds in reused.items():
+        row = game_row(date_str, game_rows[i], odds)
+        if row is not None:
+            yield i, row, odds["views"]
+    pending = [i for i in range(len(game_rows)) if i not in reused]
+
+    fetched = iter_line_histories(
+        fetcher, [game_ids[i] for i in pending], [final_flags[i] for i in pending], executor,
+        [i in changed for i in pending]
+    )
+    for position, odds in fetched:
+        i = pending[position]
+        metrics.count("games_fetched")
+        if incremental is not None and game_ids[i] and fingerprints[i]:
+            with incremental.lock:
+                incremental.remember(game_ids[i], fingerprints[i], odds)
+        if odds is None:
+            odds = empty_line_odds()
+        if line_store is not None and game_ids[i]:
+            try:
+                with metrics.timer("store", game_id=game_ids[i]):
+                    for view in selected_views(odds["views"], sportsbooks or {'fanduel'}).values():
+                        line_store.add_view(game_ids[i], date_str, view)
             except Exception as e:
-                print(f"Error processing game row: {e}")
-                continue
+                metrics.count("store_errors")
+                print(f"Error storing line history for game {game_ids[i]}: {e}")
+        row = game_row(date_str, game_rows[i], odds)
+        if row is not None:
+            yield i, row, odds["views"]
+
+def game_row(date_str, game, odds):
+    # One game as a tuple in game_frame.GAME_COLUMNS order; None if the main-page entry is malformed
+    try:
+        game_view = game.get('gameView', {})
+        away_team = extract_team_info(game_view.get('awayTeam', {}))
+        home_team = extract_team_info(game_view.get('homeTeam', {}))
+        game_id = game_view.get('gameId')
+        start_date = game_view.get('startDate', '')
+        venue = game_view.get('venueName', '')
+        venue_city = game_view.get('city', '')
+        venue_state = game_view.get('state', '')
+        consensus = game_view.get('consensus', {})
+
+        # Extract game status and scores
+        game_status_text = game_view.get('gameStatusText', '')
+        game_status_code = game_view.get('status', '')  # <-- FIXED: extract status code
+        score = {
+            "away": game_view.get("awayTeamScore"),
+            "home": game_view.get("homeTeamScore")
+        }
+
+        ml_opening, ml_current = odds["ml_opening"], odds["ml_current"]
+        spread_opening, spread_current = odds["spread_opening"], odds["spread_current"]
+        total_opening, total_current = odds["total_opening"], odds["total_current"]
+        last_line_update = odds["last_line_update"]
+
+        return (
+            date_str,
+            game_id,
+            start_date,
+            venue,
+            venue_city,
+            venue_state,
+            away_team["fullName"],
+            away_team["shortName"],
+            away_team["nickname"],
+            away_team["name"],
+            home_team["fullName"],
+            home_team["shortName"],
+            home_team["nickname"],
+            home_team["name"],
+            # New fields
+            game_status_text,
+            game_status_code,  # <-- FIXED: add to output
+            score["away"],
+            score["home"],
+            consensus if consensus else None,
+            last_line_update,
+            # Moneyline
+            ml_opening.get("awayOdds"),
+            ml_opening.get("homeOdds"),
+            ml_opening.get("oddsDate"),
+            ml_current.get("awayOdds"),
+            ml_current.get("homeOdds"),
+            ml_current.get("oddsDate"),
+            # Run Line
+            spread_opening.get("awaySpread"),
+            spread_opening.get("awayOdds"),
+            spread_opening.get("homeSpread"),
+            spread_opening.get("homeOdds"),
+            spread_opening.get("oddsDate"),
+            spread_current.get("awaySpread"),
+            spread_current.get("awayOdds"),
+            spread_current.get("homeSpread"),
+            spread_current.get("homeOdds"),
+            spread_current.get("oddsDate"),
+            # Total
+            total_opening.get("total"),
+            total_opening.get("overOdds"),
+            total_opening.get("underOdds"),
+            total_opening.get("oddsDate"),
+            total_current.get("total"),
+            total_current.get("overOdds"),
+            total_current.get("underOdds"),
+            total_current.get("oddsDate"),
+        )
+    except Exception as e:
+        metrics.count("row_errors")
+        print(f"Error processing game row: {e}")
+        return None
+
+# Command line: plain records streamed as they are scraped, without importing pandas
+# unless the output needs a DataFrame (parquet). The pipeline's own progress lines
+# go to stderr whenever the records go to stdout.
+#   python -m scrape_odds --dates 2025-06-01 2025-06-02 --format jsonl > odds.jsonl
+#   python -m scrape_odds --books all --format csv -o lines.csv
+#   python -m scrape_odds --format parquet -o odds.parquet
+
+def csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        return json.dumps(value, sort_keys=True)
+    return value
+
+def write_records(records, output_format, out, columns):
+    count = 0
+    if output_format == "jsonl":
+        for record in records:
+            out.write(json.dumps(record, default=str) + "\n")
+            count += 1
+    else:
+        import csv
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(columns)
+        for record in records:
+            writer.writerow([csv_value(record.get(column)) for column in columns])
+            count += 1
+    return count
+
+def main(argv=None):
+    import argparse
+    import contextlib
+    parser = argparse.ArgumentParser(prog="python -m scrape_odds", description="Scrape MLB odds from sportsbookreview")
+    parser.add_argument("--league", choices=sorted(LEAGUES), default="mlb")
+    parser.add_argument("--dates", nargs="+", help="YYYY-MM-DD (default today and tomorrow, US/Eastern)")
+    parser.add_argument("--game-ids", nargs="+", type=int, help="only these games")
+    parser.add_argument("--books", nargs="+", help="sportsbooks for one row per (game, book, market), or 'all'")
+    parser.add_argument("--format", choices=["jsonl", "csv", "parquet"], default="jsonl")
+    parser.add_argument("-o", "--output", default="-", help="file to write (default stdout; required for parquet)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=5.0, help="line-history requests per second")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log per-scrape summaries to stderr")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+
+    books = args.books[0] if args.books == [ALL_SPORTSBOOKS] else args.books
+    if args.format == "parquet":
+        if args.output == "-":
+            parser.error("--format parquet needs --output")
+        frame = scrape_odds(args.workers, args.rps, sportsbooks=books, dates=args.dates, game_ids=args.game_ids,
+                            league=args.league)
+        try:
+            frame.to_parquet(args.output, index=False)
+        except ImportError as e:
+            print(f"Error writing parquet: {e}", file=sys.stderr)
+            return 1
+        print(f"Wrote {len(frame)} rows to {args.output}", file=sys.stderr)
+        return 0
+
+    columns = GAME_COLUMNS if books is None else LINE_COLUMNS
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            records = iter_games(args.dates, args.game_ids, args.workers, args.rps, sportsbooks=books,
+                                 league=args.league)
+            count = write_records(records, args.format, out, columns)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Wrote {count} records to {'stdout' if args.output == '-' else args.output}", file=sys.stderr)
+    return 0
 
-    return pd.DataFrame(all_games)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import json
+import os
+import threading
+
+# Pieces shared by the metrics and alert sinks: a JSON-lines file writer and
+# the "kind:arg" spec syntax used by ODDS_METRICS, ODDS_ALERTS and the CLIs.
+
+class JsonLinesSink:
+    # Appends one JSON object per line to a file kept open (line-buffered) for the sink's lifetime
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", buffering=1)
+
+    def write(self, records):
+        # All records in one locked write, so concurrent writers never interleave lines
+        lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        with self._lock:
+            self._file.write(lines)
+
+    def emit(self, event):
+        self.write([event])
+
+    def finish_run(self, summary):
+        self.emit(dict(summary, event="run"))
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def build_sink(spec, factories, label="sink"):
+    # factories maps each kind to a callable taking the text after the colon ('' if none)
+    kind, _, arg = spec.strip().partition(":")
+    factory = factories.get(kind)
+    if factory is None:
+        raise ValueError(f"Unknown {label}: {spec}")
+    return factory(arg)
+
+def specs_from_environment(name):
+    # Comma-separated specs from an environment variable
+    return [spec for spec in os.environ.get(name, "").split(",") if spec.strip()]
@@ -0,0 +1,278 @@
+import argparse
+import csv
+import gzip
+import hashlib
+import io
+import json
+import logging
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from refresher import SNAPSHOT_PATH, Refresher, load_snapshot, snapshot_version
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Read-only HTTP API over the refresher's latest snapshot, for services that
+# want the odds without the Streamlit page:
+#
+#   GET /games?format=json|csv|arrow&date=YYYY-MM-DD&team=NYY&game_id=123
+#   GET /health
+#
+# date, team (short name, nickname or full name, any case) and game_id may be
+# repeated; different filters narrow each other. Each snapshot version is
+# serialized once: every game becomes a JSON line and a CSV line in one pass
+# over the frame, and a response is those pre-serialized rows joined. Finished
+# bodies (gzipped when the client accepts it) are kept in a small LRU, and
+# every response carries an ETag so polling clients get 304s until the next
+# snapshot. Arrow IPC streams need pyarrow.
+#
+#   python snapshot_api.py --port 8080             # serve what refresher.py publishes
+#   python snapshot_api.py --port 8080 --refresh   # and run the refresher in-process
+
+FORMATS = {
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+TEAM_COLUMNS = [
+    "away_team_short", "away_team_nickname", "away_team_full",
+    "home_team_short", "home_team_nickname", "home_team_full",
+]
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+class BadRequest(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+class SerializedSnapshot:
+    # One snapshot version with every game serialized once, plus lookups for the filters
+    def __init__(self, snapshot):
+        self.version = snapshot.version
+        self.scraped_at = snapshot.scraped_at.isoformat()
+        self.frame = frame = snapshot.frame.reset_index(drop=True)
+        self.json_rows = [line.encode("utf-8") for line in
+                          frame.to_json(orient="records", lines=True, date_format="iso").splitlines()] if len(frame) else []
+        self.csv_header, self.csv_rows = self.csv_records(frame)
+        self.by_date = self.positions(frame["date"].astype(str).tolist()) if len(frame) else {}
+        self.by_game = self.positions(frame["game_id"].astype(str).tolist()) if len(frame) else {}
+        self.by_team = {}
+        for column in TEAM_COLUMNS:
+            if column in frame.columns:
+                for key, positions in self.positions(frame[column].astype(str).str.lower().tolist()).items():
+                    self.by_team.setdefault(key, set()).update(positions)
+
+    @staticmethod
+    def csv_records(frame):
+        # Header and one entry per game, each exactly one CSV record even when a quoted field holds
+        # a newline. Missing values are written empty, as to_csv does.
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="")
+
+        def record(values):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(values)
+            return buffer.getvalue().encode("utf-8")
+
+        values = frame.astype(object).where(frame.notna(), None)
+        return record(frame.columns), [record(row) for row in values.itertuples(index=False, name=None)]
+
+    @staticmethod
+    def positions(values):
+        index = {}
+        for position, value in enumerate(values):
+            index.setdefault(value, set()).add(position)
+        return index
+
+    def select(self, filters):
+        # Sorted row positions matching every filter; all rows if there are none
+        selected = None
+        for name, lookup in (("date", self.by_date), ("game_id", self.by_game), ("team", self.by_team)):
+            values = filters.get(name)
+            if not values:
+                continue
+            matched = set()
+            for value in values:
+                matched |= lookup.get(value.lower() if name == "team" else value, set())
+            selected = matched if selected is None else selected & matched
+        if selected is None:
+            return list(range(len(self.frame)))
+        return sorted(selected)
+
+    def body(self, format, positions):
+        if format == "json":
+            header = json.dumps({"version": self.version, "scraped_at": self.scraped_at, "count": len(positions)})
+            return b"".join([header[:-1].encode("utf-8"), b', "games": [',
+                             b",".join([self.json_rows[i] for i in positions]), b"]}"])
+        if format == "csv":
+            return b"\n".join([self.csv_header] + [self.csv_rows[i] for i in positions]) + b"\n"
+        if pyarrow is None:
+            raise BadRequest("Arrow output needs pyarrow", status=501)
+        table = pyarrow.Table.from_pandas(self.frame.iloc[np.asarray(positions, dtype=np.int64)], preserve_index=False)
+        sink = io.BytesIO()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+
+class SnapshotCatalog:
+    # Latest snapshot on disk, reloaded only when its header version changes
+    def __init__(self, path=SNAPSHOT_PATH, cache_size=128):
+        self.path = path
+        self.cache_size = cache_size
+        self.current = None
+        self.bodies = OrderedDict()
+        self._lock = threading.Lock()
+
+    def latest(self):
+        version = snapshot_version(self.path)
+        with self._lock:
+            if version is not None and (self.current is None or self.current.version != version):
+                snapshot = load_snapshot(self.path)
+                if snapshot is not None:
+                    self.current = SerializedSnapshot(snapshot)
+                    self.bodies.clear()
+            return self.current
+
+    def response(self, format, filters, gzipped):
+        # (etag, body, gzipped) for a query, serialized once per snapshot version
+        snapshot = self.latest()
+        if snapshot is None:
+            return None
+        canonical = json.dumps({name: sorted(values) for name, values in sorted(filters.items())})
+        digest = hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).hexdigest()
+        tag = f"{snapshot.version}-{format}-{digest}"
+        key = (tag, gzipped)
+        with self._lock:
+            cached = self.bodies.get(key)
+            if cached is not None:
+                self.bodies.move_to_end(key)
+                return cached
+        body = snapshot.body(format, snapshot.select(filters))
+        compress = gzipped and len(body) >= GZIP_MIN_BYTES
+        # Gzip and identity bodies are different representations, so their strong ETags differ
+        if compress:
+            result = (f'"{tag}-gzip"', gzip.compress(body, compresslevel=6), True)
+        else:
+            result = (f'"{tag}"', body, False)
+        with self._lock:
+            self.bodies[key] = result
+            while len(self.bodies) > self.cache_size:
+                self.bodies.popitem(last=False)
+        return result
+
+def parse_query(query):
+    params = parse_qs(query)
+    format = (params.pop("format", ["json"])[0] or "json").lower()
+    if format not in FORMATS:
+        raise BadRequest(f"Unknown format {format}; expected one of {', '.join(FORMATS)}")
+    filters = {name: [value for raw in params.get(name, []) for value in raw.split(",") if value]
+               for name in ("date", "team", "game_id")}
+    return format, {name: values for name, values in filters.items() if values}
+
+def etag_matches(if_none_match, etag):
+    # If-None-Match is "*" or a comma-separated list of entity tags; the weak
+    # comparison used for GET ignores a W/ prefix on either side
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def make_handler(catalog):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, with headers and body not held back by Nagle waiting on a delayed ACK
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def send_body(self, status, body, content_type, headers=()):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def send_error_json(self, status, message):
+            self.send_body(status, json.dumps({"error": message}).encode("utf-8"), FORMATS["json"])
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            route = parts.path.rstrip("/") or "/games"
+            if route == "/health":
+                snapshot = catalog.latest()
+                status = {"version": None, "scraped_at": None, "games": 0} if snapshot is None else {
+                    "version": snapshot.version, "scraped_at": snapshot.scraped_at, "games": len(snapshot.frame)}
+                self.send_body(200, json.dumps(status).encode("utf-8"), FORMATS["json"])
+                return
+            if route != "/games":
+                self.send_error_json(404, f"No route {parts.path}")
+                return
+            try:
+                format, filters = parse_query(parts.query)
+                accepts_gzip = "gzip" in (self.headers.get("Accept-Encoding") or "")
+                result = catalog.response(format, filters, accepts_gzip)
+            except BadRequest as e:
+                self.send_error_json(e.status, str(e))
+                return
+            except Exception as e:
+                print(f"Error serving {self.path}: {e}")
+                self.send_error_json(500, "Internal error")
+                return
+            if result is None:
+                self.send_error_json(503, "No snapshot published yet")
+                return
+            etag, body, gzipped = result
+            headers = [("ETag", etag), ("Vary", "Accept-Encoding"), ("Cache-Control", "no-cache")]
+            if etag_matches(self.headers.get("If-None-Match"), etag):
+                self.send_response(304)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+            if gzipped:
+                headers.append(("Content-Encoding", "gzip"))
+            self.send_body(200, body, FORMATS[format], headers)
+
+        do_HEAD = do_GET
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def serve(port=8080, host="127.0.0.1", path=SNAPSHOT_PATH):
+    # Returns the server; call serve_forever() on it (or run it in a thread)
+    return ThreadingHTTPServer((host, port), make_handler(SnapshotCatalog(path)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the latest odds snapshot as JSON, CSV or Arrow")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--path", default=SNAPSHOT_PATH)
+    parser.add_argument("--refresh", action="store_true", help="also run the refresher in this process")
+    parser.add_argument("--interval", type=float, default=30, help="refresher seconds between polls")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log per-scrape summaries to stderr")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+    if args.refresh:
+        Refresher(args.path, args.interval).start()
+    server = serve(args.port, args.host, args.path)
+    print(f"Serving odds snapshots from {args.path} on http://{args.host}:{args.port}/games")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import os
+import pickle
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# Versioned history of scrape_odds() results. Each appended frame is stored as a
+# delta against the previous version: only the cells that changed (grouped by
+# column, keyed by game_id), the games that appeared or dropped off and, if it
+# changed, the row order. Every keyframe_every versions, and whenever the
+# columns or dtypes change, the whole frame is stored instead, so rebuilding
+# any version applies at most keyframe_every - 1 deltas to a keyframe. Storage
+# grows with line movement; an unchanged refresh costs one small row.
+#
+#   history = SnapshotHistory()
+#   history.append(scrape_odds())                 # or Refresher(history=history)
+#   history.board_at("2025-06-01T21:00:00Z")      # the board as it was at 5pm ET
+#
+# Frames are keyed by game_id, or by (game_id, sportsbook, market) for the long
+# sportsbooks= frame.
+
+def key_columns(frame):
+    if "sportsbook" in frame.columns and "market" in frame.columns:
+        return ["game_id", "sportsbook", "market"]
+    return ["game_id"]
+
+def to_utc_text(when):
+    # ISO UTC text, which sorts in time order
+    if when is None:
+        when = datetime.now(timezone.utc)
+    stamp = pd.Timestamp(when)
+    stamp = stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
+    return stamp.isoformat()
+
+def working_frame(frame):
+    # Indexed by key with categoricals as plain objects, so cells can be set to any value
+    working = frame.set_index(key_columns(frame), drop=False)
+    for column in categorical_columns(frame):
+        working[column] = working[column].astype(object)
+    return working
+
+def categorical_columns(frame):
+    return [column for column in frame.columns if isinstance(frame[column].dtype, pd.CategoricalDtype)]
+
+def output_frame(working, categories):
+    frame = working.reset_index(drop=True)
+    # Sorted unique categories, as game_frame builds them
+    for column in categories:
+        frame[column] = frame[column].astype("category")
+    return frame
+
+def schema_of(frame):
+    return [(column, str(dtype)) for column, dtype in frame.dtypes.items()]
+
+def frame_delta(before, after):
+    # before/after are working frames with the same schema. Parts that did not change are
+    # None, so a delta of a few moved lines pickles to a few hundred bytes.
+    present = after.index.isin(before.index)
+    common = after.index[present]
+    previous, current = before.loc[common], after.loc[common]
+    cells = {}
+    for column in after.columns:
+        old, new = previous[column], current[column]
+        same = old.eq(new).fillna(False).astype(bool) | (old.isna() & new.isna())
+        if not same.all():
+            changed = ~same.to_numpy()
+            cells[column] = (common[changed].tolist(), new.array[changed])
+    added = after[~present] if not present.all() else None
+    gone = ~before.index.isin(after.index)
+    removed = before.index[gone].tolist() if gone.any() else None
+    order = None if before.index.equals(after.index) else after.index.tolist()
+    return {"cells": cells, "added": added, "removed": removed, "order": order}
+
+def apply_delta(working, delta):
+    if delta["removed"]:
+        working = working.drop(index=delta["removed"])
+    for column, (keys, values) in delta["cells"].items():
+        working.loc[keys, column] = values
+    if delta["added"] is not None:
+        working = pd.concat([working, delta["added"]])
+    if delta["order"] is not None:
+        working = working.loc[delta["order"]]
+    return working
+
+def delta_size(delta):
+    return (sum(len(keys) for keys, _ in delta["cells"].values())
+            + (len(delta["added"]) * len(delta["added"].columns) if delta["added"] is not None else 0)
+            + len(delta["removed"] or ()))
+
+def encode(value):
+    return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+def decode(blob):
+    return pickle.loads(zlib.decompress(blob))
+
+class SnapshotHistory:
+    def __init__(self, path=".cache/history.sqlite", keyframe_every=100):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.keyframe_every = keyframe_every
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS versions (
+                version INTEGER PRIMARY KEY,
+                scraped_at TEXT NOT NULL,
+                keyframe INTEGER NOT NULL,
+                changed_cells INTEGER NOT NULL,
+                data BLOB
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS versions_scraped_at ON versions (scraped_at)")
+        self._conn.commit()
+        # Latest version as a working frame, the base of the next delta
+        self._last = None
+        # Most recently rebuilt version, rolled forward when the next query is later on the same keyframe
+        self._cursor = None
+
+    def latest_version(self):
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(version) FROM versions").fetchone()
+        return row[0]
+
+    def append(self, frame, scraped_at=None):
+        # Stores frame as the next version; returns (version, changed cell count or None for a keyframe)
+        scraped_at = to_utc_text(scraped_at)
+        working = working_frame(frame)
+        with self._lock:
+            if self._last is None:
+                latest = self._conn.execute("SELECT MAX(version) FROM versions").fetchone()[0]
+                if latest is not None:
+                    self._last = (latest, self._rebuild(latest))
+            previous_version, previous = self._last if self._last is not None else (0, None)
+            version = previous_version + 1
+            since_keyframe = self._conn.execute(
+                "SELECT COUNT(*) FROM versions WHERE version > "
+                "(SELECT COALESCE(MAX(version), 0) FROM versions WHERE keyframe = 1)"
+            ).fetchone()[0]
+            keyframe = (previous is None
+                        or since_keyframe + 1 >= self.keyframe_every
+                        or schema_of(previous[2]) != schema_of(frame)
+                        or not working.index.is_unique)
+            if keyframe:
+                row = (version, scraped_at, 1, len(frame) * len(frame.columns),
+                       encode({"frame": frame, "categories": categorical_columns(frame)}))
+                changed = None
+            else:
+                delta = frame_delta(previous[0], working)
+                changed = delta_size(delta)
+                row = (version, scraped_at, 0, changed, encode(delta) if changed or delta["order"] is not None else None)
+            with self._conn:
+                self._conn.execute("INSERT INTO versions VALUES (?, ?, ?, ?, ?)", row)
+            self._last = (version, (working, categorical_columns(frame), frame.head(0)))
+        return version, changed
+
+    def _rebuild(self, version):
+        # (working frame, categorical columns, empty frame with the schema) for a version
+        keyframe = self._conn.execute(
+            "SELECT MAX(version) FROM versions WHERE keyframe = 1 AND version <= ?", (version,)
+        ).fetchone()[0]
+        if keyframe is None:
+            return None
+        start = keyframe
+        cursor = self._cursor
+        if cursor is not None and keyframe <= cursor[0] <= version:
+            start, (working, categories, empty) = cursor[0], cursor[1]
+            # apply_delta sets cells in place; the cursor's frame may also be the base of the next append
+            working = working.copy()
+        else:
+            stored = decode(self._conn.execute("SELECT data FROM versions WHERE version = ?", (keyframe,)).fetchone()[0])
+            working, categories, empty = working_frame(stored["frame"]), stored["categories"], stored["frame"].head(0)
+        for (data,) in self._conn.execute(
+            "SELECT data FROM versions WHERE version > ? AND version <= ? ORDER BY version", (start, version)
+        ):
+            if data is not None:
+                working = apply_delta(working, decode(data))
+        self._cursor = (version, (working, categories, empty))
+        return working, categories, empty
+
+    def version_at(self, when):
+        # Latest version scraped at or before when; None if history starts later
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM versions WHERE scraped_at <= ? ORDER BY scraped_at DESC, version DESC LIMIT 1",
+                (to_utc_text(when),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def board(self, version):
+        with self._lock:
+            rebuilt = self._rebuild(version)
+        if rebuilt is None:
+            return None
+        working, categories, _ = rebuilt
+        return output_frame(working.copy(), categories)
+
+    def board_at(self, when):
+        # The frame as it was at when (datetime, Timestamp or ISO text; naive means UTC)
+        version = self.version_at(when)
+        return None if version is None else self.board(version)
+
+    def versions(self):
+        # One row per stored version: when it was scraped, whether it is a keyframe, cells changed, bytes stored
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT version, scraped_at, keyframe, changed_cells, LENGTH(data) AS bytes FROM versions ORDER BY version",
+                self._conn,
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
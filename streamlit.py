@@ -1,9 +1,10 @@
 import streamlit as st
-from scrape_odds import scrape_odds
+from refresher import Refresher, load_snapshot, snapshot_version, wait_for_snapshot
+from render import render_cards
 import pandas as pd
 from datetime import datetime, timedelta
 import pytz
-import re
+import os
 
 st.set_page_config(page_title="MLB FanDuel Odds Tracker", layout="wide")
 
@@ -188,18 +189,67 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-@st.cache_data(show_spinner=True)
+# Scraping happens in a background refresher; this script only reads its latest snapshot.
+# Set ODDS_REFRESHER=external when `python refresher.py` runs as its own process.
+@st.cache_resource
+def get_refresher():
+    if os.environ.get("ODDS_REFRESHER") == "external":
+        return None
+    return Refresher().start()
+
+refresher = get_refresher()
+
+# Seconds a loaded snapshot stays cached; entries are keyed by snapshot version,
+# so a new snapshot is picked up on the next rerun regardless of the TTL
+CACHE_TTL = float(os.environ.get("ODDS_CACHE_TTL", 600))
+
+class SnapshotReplaced(Exception):
+    pass
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=4, show_spinner=False)
+def load_cached_snapshot(version):
+    # The file may have been replaced since its header was read; raising keeps a
+    # different version from being cached under this one
+    snapshot = load_snapshot()
+    if snapshot is None or snapshot.version != version:
+        raise SnapshotReplaced(version)
+    return snapshot
+
 def get_data():
-    return scrape_odds()
+    # Reruns (tab switches, widgets) only read the snapshot header; the frame comes from the cache
+    for _ in range(3):
+        version = snapshot_version()
+        if version is None:
+            with st.spinner("Fetching the first odds snapshot..."):
+                snapshot = wait_for_snapshot()
+            if snapshot is None:
+                return None
+            version = snapshot.version
+        try:
+            return load_cached_snapshot(version)
+        except SnapshotReplaced:
+            continue
+    return load_snapshot()
 
-# --- Always clear cache on page load for fresh data ---
-st.cache_data.clear()
+@st.cache_data(ttl=CACHE_TTL, max_entries=8, show_spinner=False)
+def cached_cards(version, date_str, today_str, _frame, _now):
+    # A tab's cards rendered once per snapshot and calendar day (footers say Today/Yesterday);
+    # reruns on an unchanged snapshot reuse the HTML. None if the date has no games.
+    games = _frame[_frame['date'] == date_str]
+    if games.empty:
+        return None
+    return render_cards(games, _now)
 
 if st.button("Update Data", type="primary"):
-    st.cache_data.clear()
+    if refresher is not None:
+        poll = refresher.request_refresh()
+        with st.spinner("Updating odds..."):
+            refresher.wait_for_poll(poll, timeout=120)
+    load_cached_snapshot.clear()
     st.rerun()
 
-df = get_data()
+snapshot = get_data()
+df = snapshot.frame if snapshot is not None else pd.DataFrame()
 
 if df.empty:
     st.warning("No data available. Please try again later.")
@@ -215,211 +265,14 @@ tab_labels = [
 ]
 tab_dates = [today.strftime("%Y-%m-%d"), tomorrow.strftime("%Y-%m-%d")]
 
-def format_team_nickname(nickname, full):
-    if full == "Athletics Athletics" or nickname == "Athletics Athletics":
-        return "Athletics"
-    return nickname
-
-def format_odds(val, highlight=False):
-    if val is None or pd.isna(val):
-        return "-"
-    val = int(val) if float(val).is_integer() else val
-    if isinstance(val, (int, float)):
-        if val > 0:
-            val_str = f"+{val}"
-        else:
-            val_str = f"{val}"
-    else:
-        val_str = str(val)
-    return val_str
-
-def format_line(val):
-    if val is None or pd.isna(val):
-        return "-"
-    val = float(val)
-    if val.is_integer():
-        return str(int(val))
-    return str(val)
-
-def format_run_line(spread, odds, highlight=False):
-    if spread is None or pd.isna(spread) or odds is None or pd.isna(odds):
-        return "-"
-    odds_str = format_odds(odds)
-    return f"{format_line(spread)} ({odds_str})"
-
-def format_total_line(overunder, line, odds, highlight=False):
-    if line is None or pd.isna(line) or odds is None or pd.isna(odds):
-        return "-"
-    odds_str = format_odds(odds)
-    return f"{overunder} {format_line(line)} ({odds_str})"
-
-def format_time_footer(dt_str):
-    if not dt_str or pd.isna(dt_str):
-        return "-"
-    try:
-        dt = pd.to_datetime(dt_str).tz_convert('US/Eastern')
-        now = datetime.now(et)
-        date_only = dt.date()
-        now_date = now.date()
-        if date_only == now_date:
-            prefix = "Today"
-        elif date_only == now_date - timedelta(days=1):
-            prefix = "Yesterday"
-        else:
-            prefix = dt.strftime("%A")
-        return f"{prefix} {dt.strftime('%-I:%M%p EST').replace('est', 'EST')}"
-    except Exception:
-        return dt_str
-
-def is_time_status(status_text):
-    # Matches times like '18:10 ET', '7:05 PM EST', '12:30 PM', etc.
-    return bool(re.match(r"^\d{1,2}:\d{2}(\s*[AP]M)?(\s*ET|EST)?$", status_text.strip(), re.IGNORECASE))
-
-def format_display_time(dt_str):
-    # Always display as 12-hour time with AM/PM and EST
-    try:
-        dt = pd.to_datetime(dt_str).tz_convert('US/Eastern')
-        return dt.strftime("%-I:%M %p EST")
-    except Exception:
-        return dt_str
-
-def get_status_badge(status_text):
-    if is_time_status(status_text):
-        return '<span class="status-badge notstarted">Not Started</span>'
-    elif status_text.lower() == "final":
-        return '<span class="status-badge final">Final</span>'
-    else:
-        return '<span class="status-badge progress">In Progress</span>'
-
 tab1, tab2 = st.tabs(tab_labels)
 tabs = [tab1, tab2]
 
-# Standard column widths for all cards
-col_widths = [
-    "180px",  # Team
-    "70px", "70px",  # Money Line
-    "90px", "90px",  # Run Line
-    "110px", "110px" # Total
-]
-
+# Cards for a whole tab are formatted column-wise and sent as one markdown block
 for tab, date_str in zip(tabs, tab_dates):
     with tab:
-        games = df[df['date'] == date_str].copy()
-        if games.empty:
+        cards = cached_cards(snapshot.version, date_str, tab_dates[0], df, now_et)
+        if cards is None:
             st.info("No games found for this day.")
         else:
-            games['start_time_et'] = games['start_date'].apply(format_display_time)
-            games = games.sort_values('start_date')
-            for _, row in games.iterrows():
-                away_nick = format_team_nickname(row['away_team_nickname'], row['away_team_full'])
-                home_nick = format_team_nickname(row['home_team_nickname'], row['home_team_full'])
-                away_full = format_team_nickname(row['away_team_full'], row['away_team_full'])
-                home_full = format_team_nickname(row['home_team_full'], row['home_team_full'])
-                venue = row['venue']
-                city = row['venue_city']
-                state = row['venue_state']
-
-                status_text = str(row.get('game_status_text', "")).strip()
-                score_home = row.get('score_home', None)
-                score_away = row.get('score_away', None)
-
-                # --- LOGIC: Only use status_text ---
-                if is_time_status(status_text):
-                    has_started = False
-                    is_final = False
-                elif status_text.lower() == "final":
-                    has_started = True
-                    is_final = True
-                else:
-                    has_started = True
-                    is_final = False
-
-                status_badge = get_status_badge(status_text)
-
-                # Header: show status if started, else show time
-                header_time_or_status = status_text if has_started and status_text else row['start_time_et']
-
-                # Table "Current" -> "Close" if started/final
-                current_label = "Close" if has_started else "Current"
-
-                # Team column: add score if started, else blank, right-aligned in fixed-width box
-                score_box_style = "display:inline-block; min-width:2.5em; text-align:right; margin-left:1em; color:#2176ae; font-weight:600;"
-                away_score_html = f"<span style='{score_box_style}'>{score_away}</span>" if has_started and score_away is not None else "<span style='min-width:2.5em; display:inline-block;'></span>"
-                home_score_html = f"<span style='{score_box_style}'>{score_home}</span>" if has_started and score_home is not None else "<span style='min-width:2.5em; display:inline-block;'></span>"
-
-                # Footer: "Current Update" -> "Close" if started/final
-                footer_update_label = "Close" if has_started else "Current Update"
-
-                st.markdown(
-                    f"""
-                    <div class="odds-card">
-                        <div style="padding:1.3em 1.3em 0.8em 1.3em;">
-                            <div class="odds-header-main">{away_full} at {home_full}</div>
-                            <div class="odds-header-sub">
-                                {status_badge}
-                                <span>{header_time_or_status}</span>
-                                &nbsp;|&nbsp; {venue} | {city}, {state}
-                            </div>
-                            <div style="overflow-x:auto;">
-                            <table class="odds-table">
-                                <colgroup>
-                                    <col style="width:{col_widths[0]};" />
-                                    <col style="width:{col_widths[1]};" />
-                                    <col style="width:{col_widths[2]};" />
-                                    <col style="width:{col_widths[3]};" />
-                                    <col style="width:{col_widths[4]};" />
-                                    <col style="width:{col_widths[5]};" />
-                                    <col style="width:{col_widths[6]};" />
-                                </colgroup>
-                                <tr>
-                                    <th rowspan="2" style="text-align:center;">Team</th>
-                                    <th colspan="2" style="text-align:center;">Money Line</th>
-                                    <th colspan="2" style="text-align:center;">Run Line</th>
-                                    <th colspan="2" style="text-align:center;">Total</th>
-                                </tr>
-                                <tr>
-                                    <th style="text-align:center;">Open</th>
-                                    <th style="text-align:center;">{current_label}</th>
-                                    <th style="text-align:center;">Open</th>
-                                    <th style="text-align:center;">{current_label}</th>
-                                    <th style="text-align:center;">Open</th>
-                                    <th style="text-align:center;">{current_label}</th>
-                                </tr>
-                                <tr>
-                                    <td style="text-align:left; white-space:nowrap;">
-                                        <span style="display:flex; justify-content:space-between; align-items:center;">
-                                            <span>{away_nick}</span>
-                                            {away_score_html}
-                                        </span>
-                                    </td>
-                                    <td style="text-align:center;">{format_odds(row['ml_opening_away'])}</td>
-                                    <td style="text-align:center;">{format_odds(row['ml_current_away'])}</td>
-                                    <td style="text-align:center;">{format_run_line(row['rl_opening_away_spread'], row['rl_opening_away_odds'])}</td>
-                                    <td style="text-align:center;">{format_run_line(row['rl_current_away_spread'], row['rl_current_away_odds'])}</td>
-                                    <td style="text-align:center;">{format_total_line("Over", row['total_opening_line'], row['total_opening_over_odds'])}</td>
-                                    <td style="text-align:center;">{format_total_line("Over", row['total_current_line'], row['total_current_over_odds'])}</td>
-                                </tr>
-                                <tr>
-                                    <td style="text-align:left; white-space:nowrap;">
-                                        <span style="display:flex; justify-content:space-between; align-items:center;">
-                                            <span>{home_nick}</span>
-                                            {home_score_html}
-                                        </span>
-                                    </td>
-                                    <td style="text-align:center;">{format_odds(row['ml_opening_home'])}</td>
-                                    <td style="text-align:center;">{format_odds(row['ml_current_home'])}</td>
-                                    <td style="text-align:center;">{format_run_line(row['rl_opening_home_spread'], row['rl_opening_home_odds'])}</td>
-                                    <td style="text-align:center;">{format_run_line(row['rl_current_home_spread'], row['rl_current_home_odds'])}</td>
-                                    <td style="text-align:center;">{format_total_line("Under", row['total_opening_line'], row['total_opening_under_odds'])}</td>
-                                    <td style="text-align:center;">{format_total_line("Under", row['total_current_line'], row['total_current_under_odds'])}</td>
-                                </tr>
-                            </table>
-                            </div>
-                            <div style="font-size:0.92em; color:#888; margin-top:0.7em;">
-                                Open: {format_time_footer(row['ml_opening_time'])} &nbsp;|&nbsp; {footer_update_label}: {format_time_footer(row['last_line_update'])}
-                            </div>
-                        </div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
+            st.markdown(cards, unsafe_allow_html=True)
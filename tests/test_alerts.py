@@ -0,0 +1,75 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from alerts import AlertEngine, LineMoveRule, MoneylineMoveRule
+
+class ListSink:
+    def __init__(self):
+        self.alerts = []
+
+    def emit(self, alerts):
+        self.alerts += alerts
+
+def board(away, home=-110, total=8.5, game_ids=(1, 2)):
+    # Game 1 carries the moving prices; game 2 never changes
+    rows = len(game_ids)
+    return pd.DataFrame({
+        "game_id": list(game_ids),
+        "date": ["2025-06-01"] * rows,
+        "away_team_short": ["NYY", "LAD"][:rows],
+        "home_team_short": ["BOS", "SF"][:rows],
+        "ml_current_away": pd.array([away, 150][:rows], dtype="Int64"),
+        "ml_current_home": pd.array([home, -170][:rows], dtype="Int64"),
+        "total_current_line": [total, 7.5][:rows],
+    })
+
+def engine():
+    sink = ListSink()
+    rules = [MoneylineMoveRule(cents=10), LineMoveRule("total_current_line", step=0.5, name="total_move")]
+    return AlertEngine(rules, sinks=[sink], clock=lambda: 0.0), sink
+
+def test_small_moves_alert_once_the_line_drifts_past_the_threshold_from_its_anchor():
+    alerts, sink = engine()
+    assert alerts.update(board(-110)) == []  # baseline
+    # 5 cents at a time: 5 and 10 cents from the anchor are not more than 10
+    assert alerts.update(board(-115)) == []
+    assert alerts.update(board(-120)) == []
+    fired = alerts.update(board(-125))
+    assert [(a["rule"], a["game_id"], a["magnitude"]) for a in fired] == [("moneyline_move", 1, 15.0)]
+    assert fired[0]["changes"]["ml_current_away"] == [-110.0, -125.0]
+    assert sink.alerts == fired
+    # The anchor moved to -125, so the next 5-cent step is measured from there
+    assert alerts.update(board(-130)) == []
+    assert [a["magnitude"] for a in alerts.update(board(-140))] == [15.0]
+
+def test_moves_across_even_money_are_measured_in_cents():
+    alerts, _ = engine()
+    alerts.update(board(-105))
+    assert alerts.update(board(105)) == []  # 10 cents across the +/-100 gap
+    assert [a["magnitude"] for a in alerts.update(board(110))] == [15.0]
+
+def test_pulled_and_reposted_lines_keep_their_anchor():
+    alerts, _ = engine()
+    alerts.update(board(-110))
+    assert alerts.update(board(None)) == []  # line pulled
+    fired = alerts.update(board(-125))
+    assert fired[0]["changes"]["ml_current_away"] == [-110.0, -125.0]
+
+def test_totals_alert_when_crossing_a_half_run():
+    alerts, _ = engine()
+    alerts.update(board(-110, total=8.5))
+    assert alerts.update(board(-110, total=8.75)) == []
+    fired = alerts.update(board(-110, total=9.0))
+    assert [(a["rule"], a["changes"]["total_current_line"]) for a in fired] == [("total_move", [8.5, 9.0])]
+
+def test_games_missing_from_a_snapshot_are_pruned():
+    alerts, _ = engine()
+    alerts.update(board(-110))
+    alerts.update(board(-110, game_ids=(1,)))
+    assert set(alerts.anchors) == {1}
+    assert np.isnan(alerts.anchors[1]).sum() == 0
@@ -0,0 +1,80 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+import pandas as pd
+import pytest
+
+import backfill
+import fixtures
+import scrape_odds
+from stub_server import StubServer
+
+DATES = ["2025-06-01", "2025-06-02", "2025-06-03"]
+GAMES = 4
+
+@pytest.fixture
+def server(monkeypatch):
+    with StubServer(games_per_date=GAMES, latency=0.0) as server:
+        monkeypatch.setattr(scrape_odds, "BASE_URL", server.base_url)
+        yield server
+
+def run(root, **kwargs):
+    return backfill.backfill(DATES[0], DATES[-1], str(root), max_workers=1, requests_per_second=0,
+                             batch_size=2, format="pickle", **kwargs)
+
+def interrupt_after(games, monkeypatch):
+    # Stops the scrape with a KeyboardInterrupt once `games` game rows have been handed out
+    iter_game_rows = backfill.iter_game_rows
+
+    def interrupted(*args):
+        seen = 0
+        for item in iter_game_rows(*args):
+            if item[1] is not None:
+                if seen == games:
+                    raise KeyboardInterrupt
+                seen += 1
+            yield item
+
+    monkeypatch.setattr(backfill, "iter_game_rows", interrupted)
+
+def test_interrupted_run_resumes_without_refetching_finished_work(tmp_path, server, monkeypatch):
+    expected = run(tmp_path / "reference").read()
+    assert len(expected) == len(DATES) * GAMES
+
+    root = tmp_path / "resumed"
+    with monkeypatch.context() as patch:
+        interrupt_after(GAMES + 1, patch)
+        with pytest.raises(KeyboardInterrupt):
+            run(root)
+    # Every game handed out before the interruption was written and checkpointed
+    checkpoint = backfill.Checkpoint(str(root / "checkpoint.sqlite"))
+    assert sum(len(games) for games in checkpoint.finished.values()) == GAMES + 1
+    assert checkpoint.finished_dates == {DATES[0]}
+    checkpoint.close()
+
+    before = server.requests
+    run(root)
+    # Date 1 is skipped outright; date 2 skips its finished game before line history
+    assert server.requests - before == 2 + (GAMES - 1) + GAMES
+    pd.testing.assert_frame_equal(backfill.load_backfill(str(root)), expected)
+
+def test_failed_line_history_is_retried_on_the_next_run(tmp_path, server):
+    game_id = fixtures.game_id_for(DATES[1], 0)
+    path = f"/betting-odds/mlb-baseball/line-history/{game_id}/"
+    server.set_page(path, None)
+    store = run(tmp_path)
+    assert game_id not in store.read()["game_id"].tolist()
+    checkpoint = backfill.Checkpoint(str(tmp_path / "checkpoint.sqlite"))
+    assert checkpoint.finished_dates == {DATES[0], DATES[2]}
+    checkpoint.close()
+
+    server.set_page(path, fixtures.line_history_page(game_id))
+    before = server.requests
+    frame = run(tmp_path).read()
+    # Only the failed date's main page and the failed game's line history
+    assert server.requests - before == 2
+    assert len(frame) == len(DATES) * GAMES
+    assert game_id in frame["game_id"].tolist()
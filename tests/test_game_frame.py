@@ -0,0 +1,19 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from game_frame import to_category_array
+
+def test_missing_categories_are_nan():
+    values = pd.Series(to_category_array(["NYY", None, "BOS"]))
+    assert isinstance(values.dtype, pd.CategoricalDtype)
+    assert values.isna().tolist() == [False, True, False]
+    assert list(values.cat.categories) == ["BOS", "NYY"]
+
+def test_numeric_codes_stay_numeric():
+    values = pd.Series(to_category_array([2, None, 3, ""]))
+    assert values.dtype == "Int64"
+    assert values.isna().tolist() == [False, True, False, True]
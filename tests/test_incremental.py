@@ -0,0 +1,49 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+import pandas as pd
+
+import fixtures
+import scrape_odds
+from page_cache import MemoryPageCache
+from stub_server import StubServer
+
+DATE = "2025-06-01"
+GAMES = 3
+
+def scrape(**kwargs):
+    return scrape_odds.scrape_odds(max_workers=2, requests_per_second=0, dates=[DATE], **kwargs)
+
+def test_changed_fingerprint_refetches_cached_line_history(monkeypatch):
+    # The Refresher's setup: a page cache whose line-history TTL outlives the poll interval,
+    # and an IncrementalState. Main pages always revalidate so the changed board is seen.
+    with StubServer(games_per_date=GAMES, latency=0.0) as server:
+        monkeypatch.setattr(scrape_odds, "BASE_URL", server.base_url)
+        cache = MemoryPageCache(ttls={"main": 0})
+        state = scrape_odds.IncrementalState()
+        scrape(cache=cache, incremental=state)
+
+        # Game 0's line moves: its main-page entry and its line-history page both change
+        data = fixtures.main_page_data(DATE, GAMES)
+        data["props"]["pageProps"]["oddsTables"][0]["oddsTableModel"]["gameRows"][0]["oddsViews"][0]["currentLine"]["awayOdds"] = 120
+        server.set_page("/betting-odds/mlb-baseball/", fixtures.wrap_page(data), DATE)
+        game_id = fixtures.game_id_for(DATE, 0)
+        server.set_page(f"/betting-odds/mlb-baseball/line-history/{game_id}/", fixtures.line_history_page(game_id, seed=1))
+
+        before = server.requests
+        refreshed = scrape(cache=cache, incremental=state)
+        # The main page and game 0's line history, which was still fresh in the cache
+        assert server.requests - before == 2
+        assert (state.skipped, state.refetched) == (GAMES - 1, 1)
+        upstream = scrape()
+        pd.testing.assert_frame_equal(refreshed, upstream)
+
+        # The new odds were remembered under the new fingerprint, not the stale ones
+        before = server.requests
+        again = scrape(cache=cache, incremental=state)
+        assert server.requests - before == 1
+        assert state.skipped == GAMES
+        pd.testing.assert_frame_equal(again, upstream)
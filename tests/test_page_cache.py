@@ -0,0 +1,97 @@
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import page_cache
+from page_cache import CacheEntry, MemoryPageCache, PageCache
+
+class Clock:
+    def __init__(self, now=1_750_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    # PageCache stamps accesses with time.time(); a fake clock keeps LRU order exact
+    clock = Clock()
+    monkeypatch.setattr(page_cache, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    caches = []
+
+    def make(**kwargs):
+        if request.param == "memory":
+            cache = MemoryPageCache(**kwargs)
+        else:
+            cache = PageCache(str(tmp_path / f"pages-{len(caches)}.sqlite"), **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        if isinstance(cache, PageCache):
+            cache.close()
+
+def entry(clock, ttl_class, body=b"page", etag='"v1"'):
+    return CacheEntry(body, etag, None, clock.now, ttl_class)
+
+def test_entries_expire_after_their_class_ttl(make_cache, clock):
+    cache = make_cache(ttls={"main": 60})
+    cache.put("main", entry(clock, "main"))
+    cache.put("history", entry(clock, "line_history"))
+    clock.now += 59
+    assert cache.is_fresh(cache.get("main"))
+    clock.now += 1
+    assert not cache.is_fresh(cache.get("main"))
+    assert cache.is_fresh(cache.get("history"))
+    clock.now += 60
+    assert not cache.is_fresh(cache.get("history"))
+    # An expired entry keeps its validators for a conditional GET
+    assert cache.get("main").etag == '"v1"'
+
+def test_revalidation_renews_an_entry(make_cache, clock):
+    cache = make_cache()
+    cache.put("main", entry(clock, "main"))
+    clock.now += 300
+    assert not cache.is_fresh(cache.get("main"))
+    cache.touch("main", clock.now, "main")
+    assert cache.is_fresh(cache.get("main"))
+    assert cache.get("main").body == b"page"
+
+def test_final_pages_never_expire(make_cache, clock):
+    cache = make_cache()
+    cache.put("history", entry(clock, "line_history"))
+    # The game went final: the 304 moves the page into the final class
+    cache.touch("history", clock.now, "final")
+    clock.now += 10 * 365 * 86400
+    assert cache.is_fresh(cache.get("history"))
+    # Unknown classes are never fresh
+    assert not cache.is_fresh(entry(clock, "unknown"))
+
+def test_least_recently_used_pages_are_evicted_first(make_cache, clock):
+    cache = make_cache(max_bytes=30)
+    for url in ("a", "b", "c"):
+        clock.now += 1
+        cache.put(url, entry(clock, "main", body=b"x" * 10))
+    clock.now += 1
+    assert cache.get("a") is not None  # a is now more recent than b
+    clock.now += 1
+    cache.put("d", entry(clock, "main", body=b"x" * 10))
+    assert cache.get("b") is None
+    assert [url for url in ("a", "c", "d") if cache.get(url) is not None] == ["a", "c", "d"]
+
+def test_a_page_larger_than_the_cache_is_still_kept(make_cache, clock):
+    cache = make_cache(max_bytes=10)
+    cache.put("a", entry(clock, "main", body=b"x" * 5))
+    clock.now += 1
+    cache.put("big", entry(clock, "main", body=b"x" * 50))
+    assert cache.get("a") is None
+    assert cache.get("big").body == b"x" * 50
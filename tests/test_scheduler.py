@@ -0,0 +1,90 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import PollScheduler, RequestBudget, game_state
+
+NOW = 1_750_000_000.0
+
+class Clock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def game(status, starts_in=3 * 3600):
+    start = datetime.fromtimestamp(NOW + starts_in, timezone.utc)
+    return {"gameView": {"gameStatusText": status, "startDate": start.strftime("%Y-%m-%dT%H:%M:%SZ")}}
+
+def scheduler_with(clock, requests_per_minute=600):
+    scheduler = PollScheduler(requests_per_minute=requests_per_minute, clock=clock)
+    scheduler.budget = RequestBudget(requests_per_minute, clock=clock)
+    scheduler.start_run()
+    return scheduler
+
+def test_game_state_classes():
+    assert game_state(game("7:05 PM EST", starts_in=30 * 60)["gameView"], NOW) == "imminent"
+    assert game_state(game("7:05 PM ET", starts_in=3 * 3600)["gameView"], NOW) == "today"
+    assert game_state(game("18:10 ET", starts_in=30 * 3600)["gameView"], NOW) == "later"
+    assert game_state(game("Top 5th")["gameView"], NOW) == "live"
+    assert game_state(game("Final")["gameView"], NOW) == "final"
+    assert game_state(game("Postponed")["gameView"], NOW) == "off"
+    assert game_state(game("Cancelled")["gameView"], NOW) == "off"
+
+def test_budget_caps_requests_and_refills_over_time():
+    clock = Clock()
+    budget = RequestBudget(3, clock=clock)
+    assert [budget.take() for _ in range(4)] == [True, True, True, False]
+    clock.now += 20  # one token per 20 s at 3 per minute
+    assert budget.take()
+    assert not budget.take()
+    budget.spend()  # unconditional spends go into debt
+    clock.now += 20
+    assert not budget.take()
+    clock.now += 20
+    assert budget.take()
+
+def test_select_fetches_new_and_due_games_and_reuses_the_rest():
+    clock = Clock()
+    scheduler = scheduler_with(clock)
+    live, later = game("Top 5th"), game("7:05 PM ET", starts_in=30 * 3600)
+    # First poll: nothing known, everything is fetched
+    assert scheduler.select([(0, 1, "a", live), (1, 2, "b", later)]) == {}
+    scheduler.remember(1, "a", {"odds": 1})
+    scheduler.remember(2, "b", {"odds": 2})
+
+    # Unchanged fingerprints are reused; changed ones wait for their state's interval
+    clock.now += 30
+    assert scheduler.select([(0, 1, "a", live), (1, 2, "b2", later)]) == {0: {"odds": 1}, 1: {"odds": 2}}
+    clock.now += 60
+    assert scheduler.select([(0, 1, "a2", live), (1, 2, "b2", later)]) == {1: {"odds": 2}}
+
+def test_final_games_are_fetched_once_more_then_never():
+    clock = Clock()
+    scheduler = scheduler_with(clock)
+    scheduler.select([(0, 1, "a", game("Top 9th"))])
+    scheduler.remember(1, "a", {"odds": 1})
+    final = game("Final")
+    assert scheduler.select([(0, 1, "final", final)]) == {}
+    scheduler.remember(1, "final", {"odds": "closing"})
+    clock.now += 3600
+    assert scheduler.select([(0, 1, "final-2", final)]) == {0: {"odds": "closing"}}
+
+def test_budget_defers_the_least_overdue_games():
+    clock = Clock()
+    scheduler = scheduler_with(clock, requests_per_minute=60)
+    games = [(i, i + 1, "a", game("Top 5th")) for i in range(3)]
+    scheduler.select(games)
+    for i in range(3):
+        scheduler.remember(i + 1, "a", {"odds": i})
+    # Game 3 was fetched longest ago, so it is the most overdue
+    scheduler.fetched_at.update({1: NOW - 120, 2: NOW - 90, 3: NOW - 600})
+    scheduler.budget = RequestBudget(60, clock=clock)
+    scheduler.budget.tokens = 1
+    scheduler.start_run()
+    reused = scheduler.select([(i, i + 1, "b", game("Top 5th")) for i in range(3)])
+    assert sorted(reused) == [0, 1]
+    assert scheduler.run["deferred"] == 2
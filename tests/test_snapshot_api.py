@@ -0,0 +1,50 @@
+import os
+import sys
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+import pytest
+import requests
+
+import scrape_odds
+import snapshot_api
+from refresher import publish_snapshot
+from stub_server import StubServer
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    with StubServer(games_per_date=10, latency=0.0) as upstream:
+        monkeypatch.setattr(scrape_odds, "BASE_URL", upstream.base_url)
+        frame = scrape_odds.scrape_odds(max_workers=2, requests_per_second=0, dates=["2025-06-01"])
+    path = str(tmp_path / "snapshot.pkl")
+    publish_snapshot(frame, 1, path)
+    server = snapshot_api.serve(port=0, path=path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/games"
+    server.shutdown()
+    server.server_close()
+
+def get(url, **headers):
+    return requests.get(url, headers=headers, timeout=5)
+
+def test_gzip_and_identity_bodies_have_different_etags(api):
+    identity = get(api, **{"Accept-Encoding": "identity"})
+    gzipped = get(api, **{"Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in identity.headers
+    assert identity.headers["ETag"] != gzipped.headers["ETag"]
+    # The identity ETag does not revalidate the gzip representation
+    assert get(api, **{"Accept-Encoding": "gzip", "If-None-Match": identity.headers["ETag"]}).status_code == 200
+
+def test_if_none_match_compares_whole_entity_tags(api):
+    etag = get(api, **{"Accept-Encoding": "identity"}).headers["ETag"]
+    def status(if_none_match):
+        return get(api, **{"Accept-Encoding": "identity", "If-None-Match": if_none_match}).status_code
+    assert status(etag) == 304
+    assert status(f'"other", W/{etag}') == 304
+    assert status("*") == 304
+    # A tag that merely contains the current one is a different tag
+    assert status(f'"x{etag[1:-1]}x"') == 200
+    assert status('"other"') == 200
@@ -0,0 +1,73 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scrape_odds
+from snapshot_history import SnapshotHistory
+from stub_server import StubServer
+
+@pytest.fixture(scope="module")
+def board():
+    with StubServer(games_per_date=6, latency=0.0) as server:
+        original = scrape_odds.BASE_URL
+        scrape_odds.BASE_URL = server.base_url
+        try:
+            return scrape_odds.scrape_odds(max_workers=2, requests_per_second=0, dates=["2025-06-01"])
+        finally:
+            scrape_odds.BASE_URL = original
+
+def boards(first):
+    # A refresh sequence covering every kind of delta: moved lines, a game dropping
+    # off and one appearing, an unchanged refresh, a reorder and a line coming off the board
+    frames = [first]
+    moved = first.copy()
+    moved.loc[0, "ml_current_away"] = 125
+    moved.loc[3, "total_current_line"] = 9.5
+    frames.append(moved)
+    added = moved.iloc[[2]].copy()
+    added["game_id"] = pd.array([999], dtype="Int64")
+    added["game_status_text"] = "Top 1st"
+    frames.append(pd.concat([moved.drop(index=1), added], ignore_index=True))
+    frames.append(frames[-1].copy())
+    reordered = frames[-1].iloc[::-1].reset_index(drop=True)
+    reordered.loc[0, "total_current_line"] = np.nan
+    frames.append(reordered)
+    final = reordered.copy()
+    final.loc[2, "game_status_text"] = "Final"
+    final.loc[2, "score_home"] = 7
+    frames.append(final)
+    return frames
+
+def assert_same_board(rebuilt, expected):
+    # Categories are rebuilt from the stored values, so unused ones are not kept
+    pd.testing.assert_frame_equal(rebuilt, expected.reset_index(drop=True), check_categorical=False)
+
+def test_every_version_rebuilds_from_keyframe_and_deltas(tmp_path, board):
+    path = str(tmp_path / "history.sqlite")
+    frames = boards(board)
+    history = SnapshotHistory(path, keyframe_every=4)
+    changes = [history.append(frame, f"2025-06-01T18:{minute:02d}:00Z")[1] for minute, frame in enumerate(frames)]
+    history.close()
+    # Keyframes at 1 and 5; the unchanged refresh stores no cells
+    assert changes[0] is None and changes[4] is None
+    assert changes[1] == 2 and changes[3] == 0
+
+    # A fresh instance has no cached state: everything comes back from SQLite
+    history = SnapshotHistory(path, keyframe_every=4)
+    for version in [6, 2, 5, 3, 1, 4]:
+        assert_same_board(history.board(version), frames[version - 1])
+    assert_same_board(history.board_at("2025-06-01T18:02:30Z"), frames[2])
+    assert history.board_at("2025-06-01T17:00:00Z") is None
+
+    # Appending after a reopen deltas against the rebuilt latest version
+    latest = frames[-1].copy()
+    latest.loc[4, "ml_current_home"] = -140
+    assert history.append(latest, "2025-06-01T18:10:00Z") == (7, 1)
+    assert_same_board(history.board(7), latest)
+    history.close()
@@ -0,0 +1,73 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from transport import CircuitBreaker, RetryAfterTooLong, Transport
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b"ok" if status_code == 200 else b""
+
+class FlakySession:
+    # Fails the first `failures` attempts at every URL with 503 (and optional Retry-After)
+    def __init__(self, failures=1, retry_after=None):
+        self.failures = failures
+        self.retry_after = retry_after
+        self.attempts = {}
+        self.adapters = {}
+        self._lock = threading.Lock()
+
+    def mount(self, prefix, adapter):
+        self.adapters[prefix] = adapter
+
+    def get(self, url, timeout=None, headers=None):
+        with self._lock:
+            attempt = self.attempts[url] = self.attempts.get(url, 0) + 1
+        if attempt <= self.failures:
+            return FakeResponse(503, {"Retry-After": str(self.retry_after)} if self.retry_after is not None else {})
+        return FakeResponse(200)
+
+def test_transient_failures_on_many_urls_recover_without_opening_the_circuit():
+    session = FlakySession(failures=1)
+    transport = Transport(session, breaker=CircuitBreaker(threshold=5), sleep=lambda seconds: None)
+    urls = [f"http://odds.test/line-history/{i}/" for i in range(20)]
+    with ThreadPoolExecutor(8) as pool:
+        statuses = list(pool.map(lambda url: transport.get(url).status_code, urls))
+    assert statuses == [200] * len(urls)
+    assert not transport.breaker.is_open("odds.test")
+    assert transport.stats["retries"] == len(urls)
+    assert transport.stats["failures"] == 0
+    assert transport.stats["circuit_open"] == 0
+
+def test_requests_that_exhaust_their_retries_open_the_circuit():
+    session = FlakySession(failures=10)
+    transport = Transport(session, max_retries=2, breaker=CircuitBreaker(threshold=3), sleep=lambda seconds: None)
+    for i in range(3):
+        assert transport.get(f"http://odds.test/{i}/").status_code == 503
+    assert transport.breaker.is_open("odds.test")
+    # One failed request is one failure, however many attempts it made
+    assert transport.stats["requests"] == 9
+
+def test_retry_after_beyond_max_backoff_raises_without_counting_against_the_host():
+    session = FlakySession(failures=1, retry_after=120)
+    slept = []
+    transport = Transport(session, max_backoff=30, breaker=CircuitBreaker(threshold=1), sleep=slept.append)
+    with pytest.raises(RetryAfterTooLong) as raised:
+        transport.get("http://odds.test/main/")
+    assert raised.value.retry_after == 120
+    assert slept == []
+    assert not transport.breaker.is_open("odds.test")
+
+def test_retry_after_within_max_backoff_is_waited_out_in_full():
+    session = FlakySession(failures=1, retry_after=20)
+    slept = []
+    transport = Transport(session, max_backoff=30, sleep=slept.append)
+    assert transport.get("http://odds.test/main/").status_code == 200
+    assert slept == [20.0]
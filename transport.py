@@ -0,0 +1,199 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+# HTTP layer shared by every request of a scrape. Responses come compressed
+# (gzip/deflate, plus brotli when the brotli package is installed), the
+# connection pool is sized to the number of threads using it, and 429/5xx
+# responses and connection errors are retried with exponential backoff and
+# jitter, honouring Retry-After (a server asking for longer than max_backoff
+# raises RetryAfterTooLong, rather than a retry sent early). A per-host circuit
+# breaker stops hammering a host that keeps failing: it counts requests that
+# failed after all their retries, not individual attempts. Requests, retries and bytes on the wire are counted
+# per run so bandwidth and reliability can be compared between runs.
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def new_session():
+    session = requests.Session()
+    session.headers.update({
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Cache-Control': 'no-cache',
+        'Pragma': 'no-cache'
+    })
+    return session
+
+def retry_after(response):
+    # Seconds the server asked us to wait, from either form of Retry-After; None if absent
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class CircuitOpenError(requests.ConnectionError):
+    pass
+
+class RetryAfterTooLong(requests.RequestException):
+    # The server asked us to come back later than max_backoff; not a failure of the host
+    def __init__(self, message, retry_after, response=None):
+        super().__init__(message, response=response)
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    # Opens for a host after `threshold` consecutive failures; after `cooldown` seconds
+    # one trial request is let through, and its outcome closes or re-opens the circuit
+    def __init__(self, threshold=5, cooldown=60.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._failures = {}
+        self._opened_at = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host):
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if self.clock() - opened_at >= self.cooldown:
+                # Half-open: the next failure re-opens immediately
+                self._opened_at[host] = self.clock()
+                self._failures[host] = self.threshold - 1
+                return True
+            return False
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.threshold:
+                if host not in self._opened_at:
+                    print(f"Circuit open for {host} after {failures} consecutive failures")
+                self._opened_at[host] = self.clock()
+
+    def is_open(self, host):
+        with self._lock:
+            return host in self._opened_at
+
+class Transport:
+    def __init__(self, session=None, pool_size=10, max_retries=3, backoff=0.5, max_backoff=30.0,
+                 breaker=None, sleep=time.sleep):
+        self.session = session or new_session()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self.resize(pool_size)
+        self.start_run()
+
+    def resize(self, pool_size):
+        # One pool per host, each holding as many connections as there are threads.
+        # Custom adapters mounted by the caller (recording, replay) are left in place.
+        self.pool_size = pool_size
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        for prefix in ("https://", "http://"):
+            if type(self.session.adapters.get(prefix)) in (HTTPAdapter, type(None)):
+                self.session.mount(prefix, adapter)
+
+    def start_run(self):
+        with self._lock:
+            self.stats = {"requests": 0, "retries": 0, "failures": 0, "circuit_open": 0,
+                          "wire_bytes": 0, "body_bytes": 0}
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _count_bytes(self, response):
+        body = len(response.content)
+        try:
+            # Bytes read off the socket, before gzip/brotli decoding
+            wire = response.raw.tell()
+        except Exception:
+            wire = 0
+        with self._lock:
+            self.stats["wire_bytes"] += wire or body
+            self.stats["body_bytes"] += body
+
+    def delay(self, attempt, response=None):
+        # Seconds before the next attempt; None if the server's Retry-After exceeds max_backoff
+        requested = retry_after(response)
+        if requested is not None:
+            return requested if requested <= self.max_backoff else None
+        # Exponential backoff with equal jitter: half fixed, half random
+        base = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return base / 2 + random.uniform(0, base / 2)
+
+    def get(self, url, timeout=None, headers=None, pace=None):
+        # pace, if given, replaces the sleep before every retry: pace(delay) must wait at least delay
+        # seconds, e.g. a rate limiter's wait, so a retry takes a slot without waiting for one on top of its backoff.
+        # The breaker is asked once per request and told its final outcome once, so transient
+        # failures that a retry recovers never count toward opening the circuit.
+        host = urlsplit(url).netloc
+        if not self.breaker.allow(host):
+            self._count("circuit_open")
+            raise CircuitOpenError(f"Circuit open for {host}, not requesting {url}")
+        response = error = None
+        for attempt in range(self.max_retries + 1):
+            self._count("requests")
+            try:
+                response = self.session.get(url, timeout=timeout, headers=headers)
+                error = None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response, error = None, e
+            if response is not None:
+                self._count_bytes(response)
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success(host)
+                    return response
+            if attempt == self.max_retries:
+                break
+            delay = self.delay(attempt, response)
+            if delay is None:
+                # The server is pacing us, not failing: report it without counting against the host
+                self._count("failures")
+                requested = retry_after(response)
+                raise RetryAfterTooLong(f"{url} asked to retry after {requested:.0f}s, more than "
+                                        f"max_backoff {self.max_backoff:.0f}s", requested, response)
+            self._count("retries")
+            if pace is not None:
+                pace(delay)
+            else:
+                self.sleep(delay)
+        self.breaker.record_failure(host)
+        self._count("failures")
+        if error is not None:
+            raise error
+        return response
+
+    def summary(self):
+        stats = dict(self.stats)
+        saved = stats["body_bytes"] - stats["wire_bytes"]
+        ratio = stats["wire_bytes"] / stats["body_bytes"] if stats["body_bytes"] else 1.0
+        return (f"Transport: {stats['requests']} requests, {stats['retries']} retries, "
+                f"{stats['failures']} failed, {stats['circuit_open']} refused by an open circuit; "
+                f"{stats['wire_bytes'] / 2**20:.2f} MB on the wire for "
+                f"{stats['body_bytes'] / 2**20:.2f} MB of pages ({ratio:.0%}, {saved / 2**20:.2f} MB saved)")